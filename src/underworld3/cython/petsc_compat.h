@@ -107,6 +107,18 @@ PetscErrorCode UW_PetscDSSetBdJacobianPreconditioner(PetscDS ds, DMLabel label,
     return 1;
 }
 
+// Remove the boundary terms (so they can be replaced without rebuilding the DS)
+
+PetscErrorCode UW_PetscDSClearBdWF(PetscDS ds, PetscInt bd)
+{
+    PetscWeakForm wf;
+
+    PetscCall(PetscDSGetBoundary(ds, bd, &wf, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL));
+    PetscCall(PetscWeakFormClear(wf));
+
+    return 1;
+}
+
 PetscErrorCode UW_PetscDSViewWF(PetscDS ds)
 {
 
@@ -40,6 +40,7 @@ cdef extern from "petsc_compat.h":
     PetscErrorCode UW_PetscDSSetBdJacobian(PetscDS, PetscDMLabel, PetscInt, PetscInt, PetscInt, PetscInt, PetscInt, void*, void*, void*, void*)
     PetscErrorCode UW_PetscDSSetBdJacobianPreconditioner(PetscDS, PetscDMLabel, PetscInt, PetscInt, PetscInt, PetscInt, PetscInt, void*, void*, void*, void*)
     PetscErrorCode UW_PetscDSSetBdTerms   (PetscDS, PetscDMLabel, PetscInt, PetscInt, PetscInt, PetscInt, PetscInt, void*, void*, void*, void*, void*, void* )
+    PetscErrorCode UW_PetscDSClearBdWF(PetscDS, PetscInt)
     PetscErrorCode UW_PetscDSViewWF(PetscDS)     
     PetscErrorCode UW_PetscDSViewBdWF(PetscDS, PetscInt)     
     PetscErrorCode UW_DMPlexSetSNESLocalFEM( PetscDM, PetscBool, void *)
@@ -64,6 +65,8 @@ cdef extern from "petsc.h" nogil:
     PetscErrorCode PetscDSAddBdJacobianPreconditioner( PetscDS, PetscInt, PetscInt, PetscDSBdJacobianFn, PetscDSBdJacobianFn, PetscDSBdJacobianFn, PetscDSBdJacobianFn)
     PetscErrorCode PetscDSAddBdResidual( PetscDS, PetscInt, PetscDSBdResidualFn, PetscDSBdResidualFn )
 
+    PetscErrorCode PetscDSSetConstants( PetscDS, PetscInt, PetscScalar[] )
+
     PetscErrorCode DMPlexCreateSubmesh(PetscDM, PetscDMLabel label, PetscInt value, PetscBool markedFaces, PetscDM *subdm)
     PetscErrorCode DMGetLabel(PetscDM dm, const char name[], PetscDMLabel *label)
 
@@ -78,4 +81,16 @@ cdef extern from "petsc.h" nogil:
     PetscErrorCode DMLocalizeCoordinates(PetscDM dm)
 
     # Not wrapped at this point
-    PetscErrorCode VecConcatenate(PetscInt nx, const PetscVec X[], PetscVec *, PetscIS *)
\ No newline at end of file
+    PetscErrorCode VecConcatenate(PetscInt nx, const PetscVec X[], PetscVec *, PetscIS *)
+
+cdef set_ds_constants(DS ds, values):
+    # Values for the `constants[]` array that is passed to the pointwise
+    # functions (see underworld3.utilities._jitextension.getext)
+    import numpy
+    cdef PetscScalar[::1] c_values
+
+    if len(values) == 0:
+        return
+
+    c_values = numpy.ascontiguousarray(values, dtype=numpy.float64)
+    CHKERRQ( PetscDSSetConstants(ds.ds, c_values.shape[0], &c_values[0]) )
@@ -8,7 +8,7 @@ from petsc4py import PETSc
 
 import underworld3
 import underworld3 as uw
-from   underworld3.utilities._jitextension import getext
+from   underworld3.utilities._jitextension import getext, constant_values, _unwrap_for_jit
 import underworld3.timing as timing
 from underworld3.utilities._api_tools import uw_object
 from underworld3.utilities._api_tools import class_or_instance_method
@@ -32,6 +32,9 @@ class SolverBaseClass(uw_object):
         self.mesh = mesh
         self.mesh_dm_coordinate_hash = None
         self.compiled_extensions = None
+        self.ext_dict = None
+        self.snes = None
+        self._discretisation_state = None
 
         self.Unknowns = self._Unknowns(self)
 
@@ -156,6 +159,105 @@ class SolverBaseClass(uw_object):
 
         return
 
+    def _get_discretisation_state(self):
+        """
+        The inputs of the solver DM / FE / DS: the mesh coordinates, the
+        boundary condition sets and the compiled essential boundary condition
+        functions (and the layout of the constants array that these read).
+        The pointwise functions of the weak form are not included, they can be
+        replaced on the existing DS.
+        """
+
+        import xxhash
+        import numpy as np
+
+        xxh = xxhash.xxh64()
+        xxh.update(np.ascontiguousarray(self.mesh.data))
+        mesh_dm_coord_hash = xxh.intdigest()
+
+        bcs = tuple(
+            (bc.type, bc.f_id, tuple(bc.components), bc.boundary)
+            for bc in self.natural_bcs
+        )
+        bcs += tuple(
+            (bc.type, bc.f_id, tuple(bc.components), bc.boundary, _unwrap_for_jit(bc.fn))
+            for bc in self.essential_bcs
+        )
+
+        constants = None if self.ext_dict is None else self.ext_dict.constants
+
+        return (mesh_dm_coord_hash, bcs, constants)
+
+    def _discretisation_is_current(self, verbose=False):
+        """
+        Returns `True` if the existing solver DM can be re-used. Otherwise the
+        existing DM hierarchy and SNES are destroyed and the new state is
+        recorded, ready for the discretisation to be rebuilt.
+        """
+
+        state = self._get_discretisation_state()
+
+        if self.dm is not None and state == self._discretisation_state:
+            if verbose and uw.mpi.rank == 0:
+                print(f"{type(self).__name__} ({self.name}): Discretisation does not need to be rebuilt", flush=True)
+            return True
+
+        if verbose and uw.mpi.rank == 0:
+            print(f"{type(self).__name__} ({self.name}): Rebuild discretisation", flush=True)
+
+        if self.snes is not None:
+            self.snes.destroy()
+            self.snes = None
+
+        if self.dm is not None:
+            for coarse_dm in self.dm_hierarchy:
+                coarse_dm.destroy()
+
+            self.dm = None
+            self.dm_hierarchy = [None]
+
+        # Keep a note of the coordinates / bcs that we use for this setup
+        self.mesh_dm_coordinate_hash = state[0]
+        self._discretisation_state = state
+
+        return False
+
+    def _set_constant_expression(self, expression, value):
+        """
+        Set the value of a constant expression that appears in the solver's
+        functions. Numerical values are passed to the compiled functions through
+        the PetscDS constants array, so the solver only needs to be rebuilt if
+        the expression becomes (or was) symbolic.
+        """
+
+        value = sympify(value)
+
+        if not (isinstance(value, sympy.Number) and isinstance(expression.sym, sympy.Number)):
+            self.is_setup = False
+
+        expression.sym = value
+
+        return
+
+    def _update_constants(self):
+        """
+        Copy the current values of the numerical constants in the compiled
+        pointwise functions to the PetscDS (of the solver DM and any coarse
+        DMs) so that changes are picked up without recompiling.
+        """
+
+        cdef DM cdm
+
+        values = constant_values(self.ext_dict.constants)
+
+        for dm in [self.dm] + list(self.dm_hierarchy):
+            if dm is None:
+                continue
+            cdm = dm
+            set_ds_constants(cdm.getDS(), values)
+
+        return
+
     @timing.routine_timer_decorator
     def _build(self,
                     verbose: bool = False,
@@ -163,15 +265,10 @@ class SolverBaseClass(uw_object):
                     debug_name: str = None,
                     ):
 
-        if (not self.is_setup):
-            if self.dm is not None:
-                if verbose and uw.mpi.rank == 0:
-                    print(f"Destroy solver DM", flush=True)
-
-                self.dm.destroy()
-                self.dm = None  # Should be able to avoid nuking this if we
-                            # can insert new functions in template (surface integrals problematic in
-                            # the current implementation )
+        # A constant that has become symbolic has to be compiled in
+        if self.is_setup and self.ext_dict is not None:
+            if constant_values(self.ext_dict.constants) is None:
+                self.is_setup = False
 
         # This is a workaround for some problem in the PETSc machinery
         # where we need a surface integral term somewhere on every process
@@ -180,13 +277,14 @@ class SolverBaseClass(uw_object):
         # to let the rest of the machinery work.
 
         if len(self.natural_bcs) > 0:
-            if not "Null_Boundary" in self.natural_bcs:
+            if not any(bc.boundary == "Null_Boundary" for bc in self.natural_bcs):
                 bc = (0,)*self.Unknowns.u.shape[1]
                 self.add_natural_bc(bc, "Null_Boundary")
 
         self._setup_pointwise_functions(verbose, debug=debug, debug_name=debug_name)
         self._setup_discretisation(verbose)
         self._setup_solver(verbose)
+        self._update_constants()
 
         self.is_setup = True
 
@@ -499,25 +597,12 @@ class SNES_Scalar(SolverBaseClass):
         # Grab the mesh
         mesh = self.mesh
 
-        import xxhash
-        import numpy as np
-
-        xxh = xxhash.xxh64()
-        xxh.update(np.ascontiguousarray(mesh.data))
-        mesh_dm_coord_hash = xxh.intdigest()
+        # if we already set up the dm and the coordinates in the mesh dm (and the
+        # boundary conditions) have not changed then we do not need to do everything here
 
-        # if we already set up the dm and the coordinates in the mesh dm have not
-        # changed then we do not need to do everything here
-
-        if self.dm is not None and self.mesh_dm_coordinate_hash == mesh_dm_coord_hash:
-            if verbose and uw.mpi.rank == 0:
-                print("SNES_Scalar: Discretisation does not need to be rebuilt", flush=True)
+        if self._discretisation_is_current(verbose):
             return
 
-        # Keep a note of the coordinates that we use for this setup
-        self.mesh_dm_coordinate_hash == mesh_dm_coord_hash
-
-
         degree = self.u.degree
         mesh = self.mesh
 
@@ -670,8 +755,8 @@ class SNES_Scalar(SolverBaseClass):
         # f0  = sympy.Array(uw.function.fn_substitute_expressions(self.F0.sym)).reshape(1).as_immutable()
         # F1  = sympy.Array(uw.function.fn_substitute_expressions(self.F1.sym)).reshape(dim).as_immutable()
 
-        f0  = sympy.Array(uw.function.expressions.unwrap(self.F0.sym, keep_constants=False, return_self=False)).reshape(1).as_immutable()
-        F1  = sympy.Array(uw.function.expressions.unwrap(self.F1.sym, keep_constants=False, return_self=False)).reshape(dim).as_immutable()
+        f0  = sympy.Array(_unwrap_for_jit(self.F0.sym)).reshape(1).as_immutable()
+        F1  = sympy.Array(_unwrap_for_jit(self.F1.sym)).reshape(dim).as_immutable()
 
         self._u_f0 = f0
         self._u_F1 = F1
@@ -817,21 +902,25 @@ class SNES_Scalar(SolverBaseClass):
             self.dm.copyFields(coarse_dm)
             self.dm.copyDS(coarse_dm)
 
-        # self.dm.createClosureIndex(None)
+        # The SNES is rebuilt with the discretisation, otherwise
+        # it picks up the new functions from the DS
 
-        for coarse_dm in self.dm_hierarchy:
-            coarse_dm.createClosureIndex(None)
+        cdef DM dm = self.dm
 
-        self.dm.setUp()
+        if self.snes is None:
+            for coarse_dm in self.dm_hierarchy:
+                coarse_dm.createClosureIndex(None)
 
-        self.snes = PETSc.SNES().create(PETSc.COMM_WORLD)
-        self.snes.setDM(self.dm)
-        self.snes.setOptionsPrefix(self.petsc_options_prefix)
-        self.snes.setFromOptions()
+            self.dm.setUp()
 
+            self.snes = PETSc.SNES().create(PETSc.COMM_WORLD)
+            self.snes.setDM(self.dm)
+            self.snes.setOptionsPrefix(self.petsc_options_prefix)
+            self.snes.setFromOptions()
 
-        cdef DM dm = self.dm
-        UW_DMPlexSetSNESLocalFEM(dm.dm, PETSC_FALSE, NULL)
+            UW_DMPlexSetSNESLocalFEM(dm.dm, PETSC_FALSE, NULL)
+        else:
+            self.snes.setFromOptions()
 
         self.is_setup = True
         self.constitutive_model._solver_is_setup = True
@@ -860,6 +949,10 @@ class SNES_Scalar(SolverBaseClass):
         if _force_setup or not self.constitutive_model._solver_is_setup:
             self.is_setup = False
 
+        # rebuild everything, including the discretisation
+        if _force_setup:
+            self._discretisation_state = None
+
         self._build(verbose, debug, debug_name)
 
         gvec = self.dm.getGlobalVec()
@@ -1082,25 +1175,12 @@ class SNES_Vector(SolverBaseClass):
         # Grab the mesh
         mesh = self.mesh
 
-        import xxhash
-        import numpy as np
-
-        xxh = xxhash.xxh64()
-        xxh.update(np.ascontiguousarray(mesh.data))
-        mesh_dm_coord_hash = xxh.intdigest()
+        # if we already set up the dm and the coordinates in the mesh dm (and the
+        # boundary conditions) have not changed then we do not need to do everything here
 
-        # if we already set up the dm and the coordinates in the mesh dm have not
-        # changed then we do not need to do everything here
-
-
-        if self.dm is not None and self.mesh_dm_coordinate_hash == mesh_dm_coord_hash:
-            if verbose and uw.mpi.rank == 0:
-                print(f"SNES_Vector ({self.name}): Discretisation does not need to be rebuilt", flush=True)
+        if self._discretisation_is_current(verbose):
             return
 
-        # Keep a note of the coordinates that we use for this setup
-        self.mesh_dm_coordinate_hash == mesh_dm_coord_hash
-
         cdef PtrContainer ext = self.compiled_extensions
 
         mesh = self.mesh
@@ -1255,8 +1335,8 @@ class SNES_Vector(SolverBaseClass):
         # f0  = sympy.Array(uw.function.fn_substitute_expressions(self.F0.sym)).reshape(dim).as_immutable()
         # F1  = sympy.Array(uw.function.fn_substitute_expressions(self.F1.sym)).reshape(dim,dim).as_immutable()
 
-        f0  = sympy.Array(uw.function.expressions.unwrap(self.F0.sym, keep_constants=False, return_self=False)).reshape(dim).as_immutable()
-        F1  = sympy.Array(uw.function.expressions.unwrap(self.F1.sym, keep_constants=False, return_self=False)).reshape(dim,dim).as_immutable()
+        f0  = sympy.Array(_unwrap_for_jit(self.F0.sym)).reshape(dim).as_immutable()
+        F1  = sympy.Array(_unwrap_for_jit(self.F1.sym)).reshape(dim,dim).as_immutable()
 
 
         self._u_f0 = f0
@@ -1418,6 +1498,9 @@ class SNES_Vector(SolverBaseClass):
 
             c_label = bc_label
 
+            # Replace (rather than add to) any existing boundary terms
+            UW_PetscDSClearBdWF(ds.ds, boundary_id)
+
             if True: #  c_label and label_val != -1:
                 if bc.fn_f is not None:
 
@@ -1459,19 +1542,25 @@ class SNES_Vector(SolverBaseClass):
             self.dm.copyFields(coarse_dm)
             self.dm.copyDS(coarse_dm)
 
-        for coarse_dm in self.dm_hierarchy:
-            coarse_dm.createClosureIndex(None)
+        # The SNES is rebuilt with the discretisation, otherwise
+        # it picks up the new functions from the DS
 
-        self.dm.setUp()
+        cdef DM dm = self.dm
 
-        self.snes = PETSc.SNES().create(PETSc.COMM_WORLD)
-        self.snes.setDM(self.dm)
-        self.snes.setOptionsPrefix(self.petsc_options_prefix)
-        self.snes.setFromOptions()
+        if self.snes is None:
+            for coarse_dm in self.dm_hierarchy:
+                coarse_dm.createClosureIndex(None)
 
-        cdef DM dm = self.dm
-        UW_DMPlexSetSNESLocalFEM(dm.dm, PETSC_FALSE, NULL)
+            self.dm.setUp()
 
+            self.snes = PETSc.SNES().create(PETSc.COMM_WORLD)
+            self.snes.setDM(self.dm)
+            self.snes.setOptionsPrefix(self.petsc_options_prefix)
+            self.snes.setFromOptions()
+
+            UW_DMPlexSetSNESLocalFEM(dm.dm, PETSC_FALSE, NULL)
+        else:
+            self.snes.setFromOptions()
 
         self.is_setup = True
         self.constitutive_model._solver_is_setup = True
@@ -1501,6 +1590,10 @@ class SNES_Vector(SolverBaseClass):
         if _force_setup or not self.constitutive_model._solver_is_setup:
             self.is_setup = False
 
+        # rebuild everything, including the discretisation
+        if _force_setup:
+            self._discretisation_state = None
+
         self._build(verbose, debug, debug_name)
 
         # if (not self.is_setup):
@@ -2065,9 +2158,9 @@ class SNES_Stokes_SaddlePt(SolverBaseClass):
         ## and do these one by one as required by PETSc. However, at the moment, this
         ## is working .. so be careful !!
 
-        F0  = sympy.Array(uw.function.expressions.unwrap(self.F0.sym, keep_constants=False, return_self=False))
-        F1  = sympy.Array(uw.function.expressions.unwrap(self.F1.sym, keep_constants=False, return_self=False))
-        PF0  = sympy.Array(uw.function.expressions.unwrap(self.PF0.sym, keep_constants=False, return_self=False))
+        F0  = sympy.Array(_unwrap_for_jit(self.F0.sym))
+        F1  = sympy.Array(_unwrap_for_jit(self.F1.sym))
+        PF0  = sympy.Array(_unwrap_for_jit(self.PF0.sym))
 
         # JIT compilation needs immutable, matrix input (not arrays)
         self._u_F0 = sympy.ImmutableDenseMatrix(F0)
@@ -2253,26 +2346,15 @@ class SNES_Stokes_SaddlePt(SolverBaseClass):
         # Grab the mesh
         mesh = self.mesh
 
-        import xxhash
-        import numpy as np
-
-        xxh = xxhash.xxh64()
-        xxh.update(np.ascontiguousarray(mesh.data))
-        mesh_dm_coord_hash = xxh.intdigest()
-
-        # if we already set up the dm and the coordinates in the mesh dm have not
-        # changed then we do not need to do everything here
+        # if we already set up the dm and the coordinates in the mesh dm (and the
+        # boundary conditions) have not changed then we do not need to do everything here
 
-        if self.dm is not None and self.mesh_dm_coordinate_hash == mesh_dm_coord_hash:
-            if verbose and uw.mpi.rank == 0:
-                print(f"SNES_Stokes_SaddlePt ({self.name}): Discretisation does not need to be rebuilt", flush=True)
+        if self._discretisation_is_current(verbose):
             return
 
         if self.verbose:
             print(f"{uw.mpi.rank}: Building dm for {self.name}")
 
-        # Keep a note of the coordinates that we use for this setup
-        self.mesh_dm_coordinate_hash == mesh_dm_coord_hash
 
         cdef PtrContainer ext = self.compiled_extensions
 
@@ -2453,6 +2535,9 @@ class SNES_Stokes_SaddlePt(SolverBaseClass):
 
             c_label = bc_label
 
+            # Replace (rather than add to) any existing boundary terms
+            UW_PetscDSClearBdWF(ds.ds, boundary_id)
+
             if True: #  c_label and label_val != -1:
 
                 if bc.fn_f is not None:
@@ -2539,25 +2624,32 @@ class SNES_Stokes_SaddlePt(SolverBaseClass):
             self.dm.copyDS(coarse_dm)
             # coarse_dm.createDS()
 
-        for coarse_dm in self.dm_hierarchy:
-            coarse_dm.createClosureIndex(None)
-
-        self.snes = PETSc.SNES().create(PETSc.COMM_WORLD)
-        self.snes.setDM(self.dm)
-        self.snes.setOptionsPrefix(self.petsc_options_prefix)
-        self.snes.setFromOptions()
+        # The SNES is rebuilt with the discretisation, otherwise
+        # it picks up the new functions from the DS
 
         cdef DM c_dm = self.dm
-        UW_DMPlexSetSNESLocalFEM(c_dm.dm, PETSC_FALSE, NULL)
 
-        # Setup subdms here too.
-        # These will be used to copy back/forth SNES solutions
-        # into user facing variables.
+        if self.snes is None:
+            for coarse_dm in self.dm_hierarchy:
+                coarse_dm.createClosureIndex(None)
 
-        names, isets, dms = self.dm.createFieldDecomposition()
-        self._subdict = {}
-        for index,name in enumerate(names):
-            self._subdict[name] = (isets[index],dms[index])
+            self.snes = PETSc.SNES().create(PETSc.COMM_WORLD)
+            self.snes.setDM(self.dm)
+            self.snes.setOptionsPrefix(self.petsc_options_prefix)
+            self.snes.setFromOptions()
+
+            UW_DMPlexSetSNESLocalFEM(c_dm.dm, PETSC_FALSE, NULL)
+
+            # Setup subdms here too.
+            # These will be used to copy back/forth SNES solutions
+            # into user facing variables.
+
+            names, isets, dms = self.dm.createFieldDecomposition()
+            self._subdict = {}
+            for index,name in enumerate(names):
+                self._subdict[name] = (isets[index],dms[index])
+        else:
+            self.snes.setFromOptions()
 
         self.is_setup = True
         self.constitutive_model._solver_is_setup = True
@@ -2585,6 +2677,10 @@ class SNES_Stokes_SaddlePt(SolverBaseClass):
         if _force_setup or not self.constitutive_model._solver_is_setup:
             self.is_setup = False
 
+        # rebuild everything, including the discretisation
+        if _force_setup:
+            self._discretisation_state = None
+
         self._build(verbose, debug, debug_name)
 
         # Keep a record of these set-up parameters
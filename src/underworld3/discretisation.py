@@ -35,23 +35,53 @@ def extend_enum(inherited):
    return wrapper
 
 
+def _gmsh_source_hash(filename, *options):
+    """Hash of the gmsh file `filename` (contents) and the options used to convert it"""
+
+    import xxhash
+
+    xxh = xxhash.xxh64()
+    xxh.update(repr(options).encode())
+
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 24), b""):
+            xxh.update(block)
+
+    return xxh.hexdigest()
+
+
+def _plexh5_attribute(filename, attribute):
+    """An attribute (e.g. the source hash) stored in a dmplex .h5 file (or `None`)"""
+
+    import h5py
+
+    if not os.path.isfile(filename):
+        return None
+
+    try:
+        with h5py.File(filename, "r") as f:
+            return f.attrs.get(attribute, None)
+    except OSError:
+        return None
+
+
 @timing.routine_timer_decorator
 def _from_gmsh(
     filename, comm=None, markVertices=False, useRegions=True, useMultipleTags=True
 ):
     """Read a Gmsh .msh file from `filename`.
 
+    The .msh file is converted to a dmplex .h5 file (`filename.h5`) on the
+    root process and every process then reads its part of the .h5 file in
+    parallel (see `_from_plexh5`). The conversion is skipped if the existing
+    .h5 file was made from the same .msh file (and options).
+
     :kwarg comm: Optional communicator to build the mesh on (defaults to
         COMM_WORLD).
     """
 
-    ## NOTE: - this should be smart enough to serialise the msh conversion
-    ## and then read back in parallel via h5.  This is currently done
-    ## by every gmesh mesh
-
     comm = comm or PETSc.COMM_WORLD
     options = PETSc.Options()
-    options["dm_plex_hash_location"] = None
 
     # This option allows objects to be in multiple physical groups
     # Rather than just the first one found.
@@ -78,21 +108,38 @@ def _from_gmsh(
     # this process is more efficient done on the root process and then distributed
     # we do this by saving the mesh as h5 which is more flexible to re-use later
 
-    if uw.mpi.rank == 0:
-        plex_0 = PETSc.DMPlex().createFromFile(
-            filename, interpolate=True, comm=PETSc.COMM_SELF
+    h5_filename = filename + ".h5"
+
+    if comm.getRank() == 0:
+        source_hash = _gmsh_source_hash(
+            filename, bool(markVertices), bool(useRegions), bool(useMultipleTags)
         )
 
-        plex_0.setName("uw_mesh")
-        plex_0.markBoundaryFaces("All_Boundaries", 1001)
+        if _plexh5_attribute(h5_filename, "uw_source_hash") != source_hash:
+            import h5py
 
-        viewer = PETSc.ViewerHDF5().create(filename + ".h5", "w", comm=PETSc.COMM_SELF)
-        viewer(plex_0)
-        viewer.destroy()
+            plex_0 = PETSc.DMPlex().createFromFile(
+                filename, interpolate=True, comm=PETSc.COMM_SELF
+            )
+
+            plex_0.setName("uw_mesh")
+            plex_0.markBoundaryFaces("All_Boundaries", 1001)
+
+            viewer = PETSc.ViewerHDF5().create(h5_filename, "w", comm=PETSc.COMM_SELF)
+            viewer(plex_0)
+            viewer.destroy()
+            plex_0.destroy()
+
+            with h5py.File(h5_filename, "a") as f:
+                f.attrs["uw_source_hash"] = source_hash
+
+    # Everyone waits for the h5 file to be written
+
+    comm.barrier()
 
     # Now we have an h5 file and we can hand this to _from_plexh5
 
-    return _from_plexh5(filename + ".h5", comm, return_sf=True)
+    return _from_plexh5(h5_filename, comm, return_sf=True)
 
 
 @timing.routine_timer_decorator
@@ -100,9 +147,17 @@ def _from_plexh5(
     filename,
     comm=None,
     return_sf=False,
+    partition=True,
 ):
     """Read a dmplex .h5 file from `filename` provided.
 
+    Each process reads a contiguous chunk of the mesh from the file. If
+    `partition` is `True` (and there is more than one process), the chunks
+    are then redistributed with the mesh partitioner (`-petscpartitioner_type`,
+    e.g. parmetis / ptscotch) so the mesh is not read or partitioned on a
+    single process. The returned star forest maps the points in the file to
+    the (partitioned) local points.
+
     comm: Optional communicator to build the mesh on (defaults to
     COMM_WORLD).
     """
@@ -117,6 +172,14 @@ def _from_plexh5(
     sf0 = h5plex.topologyLoad(viewer)
     h5plex.coordinatesLoad(viewer, sf0)
     h5plex.labelsLoad(viewer, sf0)
+    viewer.destroy()
+
+    if partition and comm.getSize() > 1:
+        partitioner = h5plex.getPartitioner()
+        partitioner.setFromOptions()
+        sf_distribute = h5plex.distribute()
+        if sf_distribute is not None:
+            sf0 = sf0.compose(sf_distribute)
 
     # Do this as well
     h5plex.setName("uw_mesh")
@@ -230,6 +293,12 @@ class Mesh(Stateful, uw_object):
         # options.delValue("dm_plex_gmsh_mark_vertices")
         # options.delValue("dm_plex_gmsh_multiple_tags")
         # options.delValue("dm_plex_gmsh_use_regions")
+
+        # Hash based point location (for every mesh source, including the
+        # cached .h5 files used by the mesh generators)
+        options = PETSc.Options()
+        options["dm_plex_hash_location"] = None
+
         self.dm.setFromOptions()
 
         # uw.adaptivity._dm_stack_bcs(self.dm, self.boundaries, "UW_Boundaries")
@@ -402,6 +471,21 @@ class Mesh(Stateful, uw_object):
         self._lvec = None
         self.petsc_fe = None
 
+        # per-field sub-DMs / index sets (valid until the DM layout changes)
+        self._field_subdms = {}
+        self._field_decomposition = None
+        self._field_cache_key = None
+
+        # aggregate global vector behind lvec and the variable states packed into it
+        self._lvec_global = None
+        self._lvec_var_states = {}
+
+        # swarms with proxy variables that need rebuilding (after migration)
+        self._stale_proxy_swarms = {}
+
+        # coordinates files shared by the variables of an output series
+        self._coordinates_files = {}
+
         self.degree = degree
         self.qdegree = qdegree
 
@@ -664,6 +748,7 @@ class Mesh(Stateful, uw_object):
 
         self.dm.clearDS()
         self.dm.createDS()
+        self._invalidate_field_cache()
 
         self._coord_array = {}
 
@@ -727,39 +812,137 @@ class Mesh(Stateful, uw_object):
         """
         This method creates and/or updates the mesh variable local vector.
         If the local vector is already up to date, this method will do nothing.
+
+        Only the variables that have changed (according to their state) since the
+        last update are packed into the aggregate vector.
         """
 
+        self._update_stale_proxies()
+
         if self._stale_lvec:
             if not self._lvec:
                 self.dm.clearDS()
                 self.dm.createDS()
+                self._invalidate_field_cache()
                 # create the local vector (memory chunk) and attach to original dm
                 self._lvec = self.dm.createLocalVec()
 
-            # push avar arrays into the parent dm array
-            a_global = self.dm.getGlobalVec()
-
             # The field decomposition seems to fail if coarse DMs are present
-            names, isets, dms = self.dm.createFieldDecomposition()
+            names, isets, dms = self._get_field_decomposition()
+
+            # push avar arrays into the parent dm array (this persists
+            # between updates, so only modified variables need to be pushed)
+            if self._lvec_global is None:
+                self._lvec_global = self.dm.createGlobalVec()
+                self._lvec_var_states = {}
+
+            a_global = self._lvec_global
 
-            with self.access():
+            modified_vars = [
+                var
+                for var in self.vars.values()
+                if self._lvec_var_states.get(var.field_id) != var._get_state()
+            ]
+
+            with self.access(readable_vars=modified_vars):
                 # traverse subdms, taking user generated data in the subdm
                 # local vec, pushing it into a global sub vec
                 for var, subiset, subdm in zip(self.vars.values(), isets, dms):
+                    state = var._get_state()
+                    if self._lvec_var_states.get(var.field_id) == state:
+                        continue
+
                     lvec = var.vec
                     subvec = a_global.getSubVector(subiset)
                     subdm.localToGlobal(lvec, subvec, addv=False)
                     a_global.restoreSubVector(subiset, subvec)
 
+                    self._lvec_var_states[var.field_id] = state
+
+            self.dm.globalToLocal(a_global, self._lvec)
+            self._stale_lvec = False
+
+    def _register_stale_proxies(self, swarm):
+        """
+        Record that the proxy variables of `swarm` are out of date (the particles
+        have moved). They are rebuilt by `_update_stale_proxies` when the mesh
+        variable data is next needed.
+        """
 
+        self._stale_proxy_swarms[id(swarm)] = swarm
+
+        # results cached from the old proxy values are no longer valid
+        self._evaluation_hash = None
+        self._evaluation_interpolated_results = None
+
+    def _update_stale_proxies(self):
+        """
+        Rebuild any proxy variables that were invalidated by swarm migration.
+        """
+
+        while self._stale_proxy_swarms:
+            # remove first: the update itself accesses the mesh
+            _, swarm = self._stale_proxy_swarms.popitem()
+            swarm._update_stale_proxies()
+
+    def _check_field_cache(self):
+        # The cached sub-DMs belong to the current DM and its field layout
+        key = (id(self.dm), self.dm.getNumFields())
+        if key != self._field_cache_key:
+            self._invalidate_field_cache()
+
+    def _invalidate_field_cache(self):
+        """
+        Release the cached per-field sub-DMs and index sets. This is needed
+        whenever the layout of the mesh DM changes (fields added, DS rebuilt).
+        """
+
+        for iset, subdm in self._field_subdms.values():
+            iset.destroy()
+            subdm.destroy()
+
+        if self._field_decomposition is not None:
+            _, isets, dms = self._field_decomposition
             for iset in isets:
                 iset.destroy()
             for dm in dms:
                 dm.destroy()
 
-            self.dm.globalToLocal(a_global, self._lvec)
-            self.dm.restoreGlobalVec(a_global)
-            self._stale_lvec = False
+        self._field_subdms = {}
+        self._field_decomposition = None
+        self._field_cache_key = (id(self.dm), self.dm.getNumFields())
+
+        # The aggregate vector has the same layout
+        if self._lvec_global is not None:
+            self._lvec_global.destroy()
+        self._lvec_global = None
+        self._lvec_var_states = {}
+
+    def _get_field_subdm(self, field_id):
+        """
+        The index set and sub-DM for a single field of the mesh DM. These are
+        built once and cached until the DM layout changes.
+        """
+
+        self._check_field_cache()
+
+        if field_id not in self._field_subdms:
+            self._field_subdms[field_id] = self.dm.createSubDM(field_id)
+
+        return self._field_subdms[field_id]
+
+    def _get_field_decomposition(self):
+        """
+        The field names, index sets and sub-DMs of all the fields of the mesh DM
+        (cached until the DM layout changes).
+        """
+
+        self._check_field_cache()
+
+        if self._field_decomposition is None:
+            self._field_decomposition = self.dm.createFieldDecomposition()
+
+        return self._field_decomposition
 
     @property
     def lvec(self) -> PETSc.Vec:
@@ -792,6 +975,10 @@ class Mesh(Stateful, uw_object):
         self.dm.setCoordinatesLocal(coord_vec)
         self.nuke_coords_and_rebuild()
 
+        # Anything that depends on the point locations (e.g. interpolation plans)
+        # checks the mesh state to see if it needs to be rebuilt
+        self._increment()
+
         # This should not be necessary any more as we now check the
         # coordinates on the DM to see if they have changed (and we rebuild the
         # discretisation as needed)
@@ -801,7 +988,7 @@ class Mesh(Stateful, uw_object):
 
         return
 
-    def access(self, *writeable_vars: "MeshVariable"):
+    def access(self, *writeable_vars: "MeshVariable", readable_vars=None):
         """
         This context manager makes the underlying mesh variables data available to
         the user. The data should be accessed via the variables `data` handle.
@@ -813,6 +1000,10 @@ class Mesh(Stateful, uw_object):
         ----------
         writeable_vars
             The variables for which data write access is required.
+        readable_vars
+            If provided, only these variables (and the `writeable_vars`) are
+            made available, which makes short-lived accesses cheaper when the
+            mesh has many variables. See also `MeshVariable.read_only_view`.
 
         Example
         -------
@@ -826,6 +1017,8 @@ class Mesh(Stateful, uw_object):
 
         import time
 
+        self._update_stale_proxies()
+
         timing._incrementDepth()
         stime = time.time()
 
@@ -840,6 +1033,14 @@ class Mesh(Stateful, uw_object):
             if var._is_accessed == True:
                 continue
 
+            # lightweight access: only the named variables
+            if (
+                readable_vars is not None
+                and not var in writeable_vars
+                and not var in readable_vars
+            ):
+                continue
+
             # set flag so variable status can be known elsewhere
             var._is_accessed = True
             # add to de-access list to rewind this later
@@ -885,14 +1086,15 @@ class Mesh(Stateful, uw_object):
                     # perform sync for any modified vars.
 
                     if var in writeable_vars:
-                        indexset, subdm = self.mesh.dm.createSubDM(var.field_id)
+                        indexset, subdm = self.mesh._get_field_subdm(var.field_id)
 
                         # sync ghost values
                         subdm.localToGlobal(var.vec, var._gvec, addv=False)
                         subdm.globalToLocal(var._gvec, var.vec, addv=False)
 
-                        indexset.destroy()
-                        subdm.destroy()
+                        # the data may have changed after the state was incremented
+                        # on entry (e.g. if the lvec was updated within the context)
+                        var._increment()
                         self.mesh._stale_lvec = True
 
                     var._data = None
@@ -973,6 +1175,31 @@ class Mesh(Stateful, uw_object):
         arr = self.dm.getCoordinatesLocal().array
         return arr.reshape(-1, self.cdim)
 
+    def _series_coordinates_file(self, output_base_name, var, index):
+        """
+        The file holding the nodal coordinates for variables of the type of `var`
+        in the output series `output_base_name`. This is written the first time
+        it is needed (and again if the mesh is deformed). Existing coordinates files
+        are never over-written so that the earlier outputs remain valid.
+        """
+
+        continuity = "" if var.continuous else "d"
+        key = (os.path.abspath(output_base_name), var.degree, var.continuous)
+        state = self._get_state()
+
+        if key in self._coordinates_files and self._coordinates_files[key][0] == state:
+            return self._coordinates_files[key][1]
+
+        coordinates_file = (
+            output_base_name
+            + f".mesh.coordinates.P{var.degree}{continuity}.{index:05}.h5"
+        )
+        var.write_coordinates(coordinates_file)
+
+        self._coordinates_files[key] = (state, coordinates_file)
+
+        return coordinates_file
+
     @timing.routine_timer_decorator
     def write_timestep(
         self,
@@ -982,11 +1209,17 @@ class Mesh(Stateful, uw_object):
         meshVars: Optional[list] = [],
         swarmVars: Optional[list] = [],
         meshUpdates: bool = False,
+        linkCoordinates: bool = False,
     ):
         """
         Write the selected mesh, variables and swarm variables (as proxies) for later visualisation.
         An xdmf file is generated and the overall package can then be read by paraview or pyvista.
         Vertex values (on the mesh points) are stored for all variables regardless of their interpolation order
+
+        If `linkCoordinates` is set (and the mesh is not updated) the nodal coordinates of
+        each (degree, continuity) type of variable are written once for the output series
+        (`<filename>.mesh.coordinates.P<degree>.<index>.h5`) and the variable files link
+        to them. A new coordinates file is written if the mesh is deformed.
         """
 
         options = PETSc.Options()
@@ -1028,7 +1261,14 @@ class Mesh(Stateful, uw_object):
                 save_location = (
                     output_base_name + f".mesh.{var.clean_name}.{index:05}.h5"
                 )
-                var.write(save_location)
+
+                if linkCoordinates and not meshUpdates:
+                    coordinates_file = self._series_coordinates_file(
+                        output_base_name, var, index
+                    )
+                    var.write(save_location, coordinates_file=coordinates_file)
+                else:
+                    var.write(save_location)
 
         if swarmVars is not None:
             for svar in swarmVars:
@@ -1086,6 +1326,7 @@ class Mesh(Stateful, uw_object):
 
         ### Empty meshVars will save just the mesh
         if meshVars != None:
+            self._update_stale_proxies()
             for var in meshVars:
                 viewer(var._gvec)
 
@@ -1431,29 +1672,37 @@ class Mesh(Stateful, uw_object):
         Obtain the (local) mesh radii and centroids using
         This routine is called when the mesh is built / rebuilt
 
+        The cell sizes are taken from the distances between each cell's vertices
+        and the closest centroids. These distances only depend on the vertex so
+        they are computed once for all vertices and gathered for the cells.
+
         """
 
+        from underworld3.cython.petsc_discretisation import (
+            petsc_dm_get_cell_closure_tails,
+        )
+
         centroids = self._get_coords_for_basis(0, False)
         centroids_kd_tree = uw.kdtree.KDTree(centroids)
 
         import numpy as np
 
-        cStart, cEnd = self.dm.getHeightStratum(0)
         pStart, pEnd = self.dm.getDepthStratum(0)
-        cell_length = np.empty(centroids.shape[0])
-        cell_min_r = np.empty(centroids.shape[0])
-        cell_r = np.empty(centroids.shape[0])
 
-        for cell in range(cEnd - cStart):
-            cell_num_points = self.dm.getConeSize(cell)
-            cell_points = self.dm.getTransitiveClosure(cell)[0][-cell_num_points:]
-            cell_coords = self.data[cell_points - pStart]
+        if centroids.shape[0] == 0:
+            empty = np.empty(0)
+            return empty, empty.copy(), centroids, empty.copy()
+
+        cell_points = petsc_dm_get_cell_closure_tails(self.dm)
 
-            _, distsq, _ = centroids_kd_tree.find_closest_point(cell_coords)
+        _, vertex_distsq, _ = centroids_kd_tree.find_closest_point(
+            np.ascontiguousarray(self.data)
+        )
+        distsq = vertex_distsq[cell_points - pStart]
 
-            cell_length[cell] = np.sqrt(distsq.max())
-            cell_r[cell] = np.sqrt(distsq.mean())
-            cell_min_r[cell] = np.sqrt(distsq.min())
+        cell_length = np.sqrt(distsq.max(axis=1))
+        cell_r = np.sqrt(distsq.mean(axis=1))
+        cell_min_r = np.sqrt(distsq.min(axis=1))
 
         return cell_min_r, cell_r, centroids, cell_length
 
@@ -1799,6 +2048,7 @@ class _MeshVariable(Stateful, uw_object):
         self._lvec = None
         self._gvec = None
         self._data = None
+        self._read_only_view = None
 
         self._is_accessed = False
         self._available = False
@@ -2075,6 +2325,7 @@ class _MeshVariable(Stateful, uw_object):
             might correspond to the timestep (for example).
         """
 
+        self.mesh._update_stale_proxies()
         self._set_vec(available=False)
 
         viewer = PETSc.ViewerHDF5().create(filename, "a", comm=PETSc.COMM_WORLD)
@@ -2095,27 +2346,14 @@ class _MeshVariable(Stateful, uw_object):
 
         lvec = self.mesh.dm.getCoordinates()
 
-    # ToDo: rename to vertex_checkpoint (or similar)
-    @timing.routine_timer_decorator
-    def write(
-        self,
-        filename: str,
-    ):
+    def _coordinates_gvec(self):
         """
-        Write variable data to the specified mesh hdf5
-        data file. The file will be over-written.
-
-        Parameters
-        ----------
-        filename :
-            The filename of the mesh checkpoint file
+        The coordinates of the variable's nodes as a global vector (named
+        "coordinates") on a clone of the coordinate DM, i.e. with the same
+        layout / ownership as the variable's global vector. The caller should
+        restore the vector to the returned DM and destroy the returned FE.
         """
 
-        self._set_vec(available=False)
-
-        # Variable coordinates - let's put those in the file to
-        # make it a standalone "swarm"
-
         dmold = self.mesh.dm.getCoordinateDM()
         dmold.createDS()
         dmnew = dmold.clone()
@@ -2144,15 +2382,117 @@ class _MeshVariable(Stateful, uw_object):
         dmnew.localToGlobal(lvec, gvec, addv=False)
         gvec.setName("coordinates")
 
+        dmnew.restoreLocalVec(lvec)
+
+        return dmnew, dmfe, gvec
+
+    def _snapshot(self):
+        """
+        Copies of the locally owned values of the variable and of the matching
+        nodal coordinates (global vector layout). Used to stage checkpoint data
+        so that it can be written while the model continues to run.
+        """
+
+        self.mesh._update_stale_proxies()
+        self._set_vec(available=False)
+
+        values = self._gvec.array.copy().reshape(-1, self.num_components)
+
+        dmnew, dmfe, gvec = self._coordinates_gvec()
+        coords = gvec.array.copy().reshape(-1, self.mesh.cdim)
+        dmnew.restoreGlobalVec(gvec)
+        dmfe.destroy()
+
+        return values, coords
+
+    # ToDo: rename to vertex_checkpoint (or similar)
+    @timing.routine_timer_decorator
+    def write(
+        self,
+        filename: str,
+        coordinates_file: Optional[str] = None,
+    ):
+        """
+        Write variable data to the specified mesh hdf5
+        data file. The file will be over-written.
+
+        Parameters
+        ----------
+        filename :
+            The filename of the mesh checkpoint file
+        coordinates_file :
+            If provided, the variable coordinates are not written to the file.
+            Instead, `/fields/coordinates` is an external link to the coordinates in
+            this file (written by `write_coordinates` for a variable with the same
+            degree / continuity on the same mesh and decomposition).
+        """
+
+        self.mesh._update_stale_proxies()
+        self._set_vec(available=False)
+
         # Check that this is also synchronised
         # self.mesh.dm.localToGlobal(self._lvec, self._gvec, addv=False)
 
+        if coordinates_file is None:
+            # Variable coordinates - let's put those in the file to
+            # make it a standalone "swarm"
+
+            dmnew, dmfe, gvec = self._coordinates_gvec()
+
+            viewer = PETSc.ViewerHDF5().create(filename, "w", comm=PETSc.COMM_WORLD)
+            viewer(self._gvec)
+            viewer(gvec)
+
+            dmnew.restoreGlobalVec(gvec)
+
+            uw.mpi.barrier()
+            viewer.destroy()
+            dmfe.destroy()
+
+        else:
+            viewer = PETSc.ViewerHDF5().create(filename, "w", comm=PETSc.COMM_WORLD)
+            viewer(self._gvec)
+
+            uw.mpi.barrier()
+            viewer.destroy()
+
+            if uw.mpi.rank == 0:
+                import h5py
+
+                link_target = os.path.relpath(
+                    coordinates_file, os.path.dirname(os.path.abspath(filename))
+                )
+                with h5py.File(filename, "a") as h5f:
+                    h5f["fields"]["coordinates"] = h5py.ExternalLink(
+                        link_target, "/fields/coordinates"
+                    )
+
+            uw.mpi.barrier()
+
+        return
+
+    @timing.routine_timer_decorator
+    def write_coordinates(
+        self,
+        filename: str,
+    ):
+        """
+        Write the coordinates of the variable's nodes (only) to the specified
+        hdf5 file. The file will be over-written. Data files for any variable with
+        the same degree / continuity can refer to this file (see `write`).
+
+        Parameters
+        ----------
+        filename :
+            The filename of the coordinates file
+        """
+
+        dmnew, dmfe, gvec = self._coordinates_gvec()
+
         viewer = PETSc.ViewerHDF5().create(filename, "w", comm=PETSc.COMM_WORLD)
-        viewer(self._gvec)
         viewer(gvec)
 
         dmnew.restoreGlobalVec(gvec)
-        dmnew.restoreLocalVec(lvec)
 
         uw.mpi.barrier()
         viewer.destroy()
@@ -2208,7 +2548,17 @@ class _MeshVariable(Stateful, uw_object):
 
             h5f = h5py.File(data_file)
             D = h5f["fields"][data_name][()].reshape(-1, self.shape[1])
-            X = h5f["fields"]["coordinates"][()].reshape(-1, self.mesh.dim)
+
+            # The coordinates may be in a (shared) file for the output series
+            link = h5f["fields"].get("coordinates", getlink=True)
+            if isinstance(link, h5py.ExternalLink):
+                coordinates_file = os.path.join(
+                    os.path.dirname(os.path.abspath(data_file)), link.filename
+                )
+                with h5py.File(coordinates_file, "r") as h5f_coords:
+                    X = h5f_coords[link.path][()].reshape(-1, self.mesh.dim)
+            else:
+                X = h5f["fields"]["coordinates"][()].reshape(-1, self.mesh.dim)
 
             h5f.close()
 
@@ -2263,7 +2613,7 @@ class _MeshVariable(Stateful, uw_object):
             data_name = self.clean_name
 
         with self.mesh.access(self):
-            indexset, subdm = self.mesh.dm.createSubDM(self.field_id)
+            indexset, subdm = self.mesh._get_field_subdm(self.field_id)
 
             old_name = self._gvec.getName()
             viewer = PETSc.ViewerHDF5().create(filename, "r", comm=PETSc.COMM_WORLD)
@@ -2383,12 +2733,13 @@ class _MeshVariable(Stateful, uw_object):
         field, _ = self.mesh.dm.getField(self.field_id)
         field.setName(self.clean_name)
         self.mesh.dm.createDS()
+        self.mesh._invalidate_field_cache()
 
         return
 
     def _set_vec(self, available):
         if self._lvec == None:
-            indexset, subdm = self.mesh.dm.createSubDM(self.field_id)
+            indexset, subdm = self.mesh._get_field_subdm(self.field_id)
 
             self._lvec = subdm.createLocalVector()
             self._lvec.zeroEntries()  # not sure if required, but to be sure.
@@ -2404,6 +2755,26 @@ class _MeshVariable(Stateful, uw_object):
         if self._gvec:
             self._gvec.destroy()
 
+    def read_only_view(self) -> numpy.ndarray:
+        """
+        A read-only numpy view of the variable's local data that can be used
+        outside of the mesh `access()` context. The view shares memory with the
+        variable (it is not a copy) so it always shows the current values.
+        It remains valid for the lifetime of the variable's vector.
+        """
+
+        self.mesh._update_stale_proxies()
+
+        if self._lvec is None:
+            self._set_vec(available=False)
+
+        if self._read_only_view is None:
+            view = self._lvec.array.reshape(-1, self.num_components)
+            view.flags.writeable = False
+            self._read_only_view = view
+
+        return self._read_only_view
+
     @property
     def vec(self) -> PETSc.Vec:
         """
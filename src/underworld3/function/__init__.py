@@ -3,12 +3,17 @@ from ._function import (
     UnderworldFunction,
     evaluate,
     evalf,
+    clear_evaluation_cache,
+    InterpolationPlan,
     dm_swarm_get_migrate_type,
     dm_swarm_set_migrate_type,
     # evalf_at_coords,
     # _interpolate_all_vars_on_mesh,
 )
 
+from ._function import evaluate as _evaluate
+from ._function import evalf as _evalf
+
 from .expressions import UWexpression as expression
 from .expressions import substitute as fn_substitute_expressions
 from .expressions import substitute_expr as fn_substitute_one_expression
@@ -41,3 +46,46 @@ def derivative(expression, *args, **kwargs):
     )
 
     return subbed_derivative
+
+
+def evaluate_components(expression, coords, evalf=False, **kwargs):
+    """Evaluate every component of a (matrix) expression at the given coordinates in a
+    single pass (one interpolation of the mesh variables involved). Returns an
+    `(n, components)` array with the components in row-major order, e.g. `(n, dim)`
+    for a velocity vector. Set `evalf=True` to use `evalf` rather than `evaluate`.
+    Constant components (e.g. `(v.sym[0], 0)`) are filled in directly."""
+
+    import sympy
+    import numpy
+    from .expressions import unwrap
+
+    matrix = sympy.Matrix([expression]) if not hasattr(expression, "shape") else expression
+    num_components = matrix.shape[0] * matrix.shape[1]
+
+    values = numpy.empty((coords.shape[0], num_components))
+
+    # Constant entries evaluate to scalars rather than arrays so they are
+    # not included in the (lambdified) expression
+    varying = []
+    for i, entry in enumerate(matrix):
+        value = sympy.sympify(unwrap(entry, keep_constants=False, return_self=False))
+        if value.is_number:
+            values[:, i] = float(value)
+        else:
+            varying.append(i)
+
+    if len(varying) == 0:
+        return values
+
+    varying_matrix = sympy.Matrix([[matrix[i] for i in varying]])
+
+    if evalf:
+        varying_values = _evalf(varying_matrix, coords, **kwargs)
+    else:
+        varying_values = _evaluate(varying_matrix, coords, **kwargs)
+
+    values[:, varying] = numpy.asarray(varying_values).reshape(
+        coords.shape[0], len(varying)
+    )
+
+    return values
@@ -25,6 +25,8 @@ cdef extern from "petsc.h" nogil:
 cdef extern from "petsc_tools.h" nogil:
     PetscErrorCode DMInterpolationSetUp_UW(DMInterpolationInfo ipInfo, PetscDM dm, int petscbool, int petscbool, size_t* owning_cell)
     PetscErrorCode DMInterpolationEvaluate_UW(DMInterpolationInfo ipInfo, PetscDM dm, PetscVec x, PetscVec v)
+    PetscErrorCode DMInterpolationReferenceCoordinates_UW(DMInterpolationInfo ipInfo, PetscDM dm, PetscReal *xi)
+    PetscErrorCode DMInterpolationEvaluateReference_UW(DMInterpolationInfo ipInfo, PetscDM dm, const PetscReal *xi, const PetscBool *active, PetscVec x, PetscVec v)
 
 cdef extern from "petsc.h" nogil:
     PetscErrorCode DMInterpolationCreate(MPI_Comm comm, DMInterpolationInfo *ipInfo)
@@ -160,12 +162,339 @@ class UnderworldFunction(sympy.Function):
         return ourcls
 
 
+cdef class InterpolationPlan:
+    """
+    The point location required to interpolate mesh variables at a fixed set of
+    points: the points, the cells that contain them and their reference (cell)
+    coordinates. The plan is built once and can then be applied to the current
+    mesh variable values at the cost of the interpolation alone.
+
+    This is useful for probes and for points that do not move between evaluations
+    (e.g. nodal swarms). The plan is rebuilt automatically if the mesh is deformed.
+    The plan keeps a (read-only) copy of the points: `evaluate` checks that the
+    coordinates it is given still have the same values.
+
+    ```python
+    plan = uw.function.InterpolationPlan(mesh, coords)
+    for step in range(nsteps):
+        ...
+        values = uw.function.evaluate(T.sym[0], interpolation_plan=plan)
+    ```
+    """
+
+    cdef DMInterpolationInfo ipInfo
+    cdef bint _ready
+    cdef np.ndarray _xi
+    cdef object _mesh_state
+    cdef readonly object mesh
+    cdef readonly np.ndarray coords
+    cdef readonly np.ndarray cells
+
+    def __cinit__(self):
+        self._ready = False
+
+    def __init__(self, mesh, np.ndarray coords):
+
+        if coords.ndim != 2 or coords.shape[1] not in [2,3]:
+            raise ValueError("Provided `coords` must be 2 dimensional array of coordinates.")
+        if coords.dtype != np.double:
+            raise ValueError("Provided `coords` must be an array of doubles.")
+
+        self.mesh = mesh
+        # A private (read-only) copy: the caller may change their array
+        self.coords = np.array(coords, dtype=np.double, order="C", copy=True)
+        self.coords.flags.writeable = False
+        self.build()
+
+    def __dealloc__(self):
+        if self._ready:
+            DMInterpolationDestroy(&self.ipInfo)
+
+    def destroy(self):
+        """Release the PETSc interpolation context (it is rebuilt if the plan is used again)"""
+        cdef PetscErrorCode ierr
+        if self._ready:
+            ierr = DMInterpolationDestroy(&self.ipInfo); CHKERRQ(ierr)
+            self._ready = False
+
+    @timing.routine_timer_decorator
+    def build(self):
+        """
+        Locate the points in the mesh and compute their reference coordinates.
+        """
+
+        self.destroy()
+
+        mesh = self.mesh
+        cdef DM dm = mesh.dm
+        cdef PetscErrorCode ierr
+        cdef np.ndarray coords = self.coords
+
+        # Use MPI_COMM_SELF as following uw2 paradigm, interpolations will be local.
+        ierr = DMInterpolationCreate(MPI_COMM_SELF, &self.ipInfo); CHKERRQ(ierr)
+        ierr = DMInterpolationSetDim(self.ipInfo, mesh.dim); CHKERRQ(ierr)
+        ierr = DMInterpolationSetDof(self.ipInfo, 1); CHKERRQ(ierr)
+        self._ready = True
+
+        cdef double* coords_buff = <double*> coords.data
+        ierr = DMInterpolationAddPoints(self.ipInfo, coords.shape[0], coords_buff); CHKERRQ(ierr)
+
+        # grab closest cells to use as hint for DMInterpolationSetUp
+        self.cells = np.ascontiguousarray(mesh.get_closest_cells(coords))
+        cdef np.ndarray cells = self.cells
+        cdef long unsigned int* cells_buff = <long unsigned int*> cells.data
+        ierr = DMInterpolationSetUp_UW(self.ipInfo, dm.dm, 0, 0, <size_t*> cells_buff)
+
+        if ierr != 0:
+            raise RuntimeError("Error encountered when trying to interpolate mesh variable.\n"
+                               "Interpolation location is possibly outside the domain.")
+
+        self._xi = np.zeros(coords.shape[0] * mesh.dim, dtype=np.double)
+        cdef np.ndarray xi = self._xi
+        ierr = DMInterpolationReferenceCoordinates_UW(self.ipInfo, dm.dm, <PetscReal*> xi.data); CHKERRQ(ierr)
+
+        self._mesh_state = mesh._get_state()
+
+        return
+
+    @property
+    def is_valid(self):
+        """False if the mesh has been deformed since the plan was built"""
+        return self._ready and self._mesh_state == self.mesh._get_state()
+
+    @timing.routine_timer_decorator
+    def interpolate_all(self, vars=None):
+        """
+        Interpolate mesh variables at the plan's points. Returns the
+        `(npoints, dofs)` array of values and a dictionary of the column at which each
+        variable starts. Only the fields of the variables in `vars` are interpolated
+        (the default is all variables on the mesh).
+        """
+
+        if not self.is_valid:
+            self.build()
+
+        mesh = self.mesh
+        cdef DM dm = mesh.dm
+        cdef PetscErrorCode ierr
+
+        if vars is None:
+            vars = mesh.vars.values()
+
+        # The interpolated values are returned in field order
+        vars = sorted(set(vars), key=lambda var: var.field_id)
+
+        # Get and set total count of dofs
+        cdef np.ndarray active = np.zeros(dm.getNumFields(), dtype=np.intc)
+        dofcount = 0
+        var_start_index = {}
+        for var in vars:
+            var_start_index[var] = dofcount
+            dofcount += var.num_components
+            active[var.field_id] = 1
+
+        ierr = DMInterpolationSetDof(self.ipInfo, dofcount); CHKERRQ(ierr)
+
+        # Generate a vector to hold the interpolation results.
+        # First create a numpy array of the required size.
+        cdef np.ndarray outarray = np.empty([self.coords.shape[0], dofcount], dtype=np.double)
+
+        if dofcount == 0:
+            return outarray, var_start_index
+
+        # Now create a PETSc vector to wrap the numpy memory.
+        cdef Vec outvec = PETSc.Vec().createWithArray(outarray,comm=PETSc.COMM_SELF)
+
+        mesh.update_lvec()
+        cdef Vec pyfieldvec = mesh.lvec
+        cdef np.ndarray xi = self._xi
+
+        # Use our custom routine as the PETSc one is broken.
+        ierr = DMInterpolationEvaluateReference_UW(self.ipInfo, dm.dm, <PetscReal*> xi.data, <PetscBool*> active.data,
+                                                   pyfieldvec.vec, outvec.vec); CHKERRQ(ierr)
+        outvec.destroy()
+
+        return outarray, var_start_index
+
+    def interpolate(self, varfns=None):
+        """
+        Interpolate mesh variables at the plan's points. Returns a dictionary
+        of values for each of the variable functions in `varfns` (e.g. the entries of
+        `var.sym_1d`). The default is every component of every variable on the mesh.
+        Only the variables that appear in `varfns` are interpolated.
+        """
+
+        if varfns is None:
+            varfns = []
+            for var in self.mesh.vars.values():
+                varfns += list(var.sym_1d)
+
+        outarray, var_start_index = self.interpolate_all(set(varfn.meshvar() for varfn in varfns))
+
+        # Create map between array slices and variable functions
+
+        varfns_arrays = {}
+        for varfn in varfns:
+            var  = varfn.meshvar()
+            comp = varfn.component
+            var_start = var_start_index[var]
+            arr = np.ascontiguousarray(outarray[:,var_start+comp])
+            varfns_arrays[varfn] = arr
+
+        return varfns_arrays
+
+
+## Compiled (lambdified) expressions used by `evaluate` / `evalf`, keyed
+## on the unwrapped expression. The lambdified function only depends on the
+## symbolic form so it can be shared by every call that evaluates the same
+## expression (the variable values are supplied at each call).
+## Keys include the id of the mesh that the expression was evaluated on and
+## the entries for a mesh are removed when that mesh is garbage collected.
+
+from collections import OrderedDict as _OrderedDict
+
+_evaluation_fn_cache = _OrderedDict()
+_evaluation_fn_cache_size = 256
+_evaluation_fn_cache_meshes = set()
+
+
+def clear_evaluation_cache():
+    """
+    Remove all the compiled expressions cached by `evaluate` / `evalf`
+    """
+    _evaluation_fn_cache.clear()
+    return
+
+
+def _clear_mesh_evaluation_cache(mesh_id):
+    """
+    Remove the compiled expressions cached for the mesh with id `mesh_id`
+    """
+    _evaluation_fn_cache_meshes.discard(mesh_id)
+    for key in [key for key in _evaluation_fn_cache if key[0] == mesh_id]:
+        del _evaluation_fn_cache[key]
+    return
+
+
+def _uw_varfns_of(expr):
+    """
+    Collect the mesh variable functions in `expr`, checking that they can be
+    evaluated (no derivatives, functions of the mesh coordinates only).
+    """
+
+    varfns = set()
+    def unpack_var_fns(exp):
+
+        if isinstance(exp,uw.function._function.UnderworldAppliedFunctionDeriv):
+            raise RuntimeError("Derivative functions are not handled in evaluations, a projection should be used first to create a mesh Variable.")
+
+        isUW = isinstance(exp, uw.function._function.UnderworldAppliedFunction)
+        isMatrix = isinstance(exp, sympy.Matrix)
+
+        if isUW:
+            varfns.add(exp)
+            if exp.args != exp.meshvar().mesh.r:
+                raise RuntimeError(f"Mesh Variable functions can only be evaluated as functions of '{exp.meshvar().mesh.r}'.\n"
+                                   f"However, mesh variable '{exp.meshvar().name}' appears to take the argument {exp.args}." )
+        elif isMatrix:
+            for sub_exp in exp:
+                if isinstance(sub_exp, uw.function._function.UnderworldAppliedFunction):
+                    varfns.add(sub_exp)
+                else:
+                    unpack_var_fns(sub_exp)
+        else:
+            # Recurse.
+            for arg in exp.args:
+                unpack_var_fns(arg)
+
+        return
+
+    unpack_var_fns(expr)
+
+    return varfns
+
+
+def _compiled_expression(expr, N, dim, simplify=True, verbose=False, mesh=None):
+    """
+    Return `(lambfn, varfns)` for the (unwrapped) expression `expr`.
+    `lambfn(coords_list, values_list)` evaluates the expression where `values_list`
+    holds the values of the mesh variable functions `varfns` (in that order).
+
+    The result is cached so that repeated evaluation of the same expression only pays
+    for the interpolation of the variables and the arithmetic. The cache entries
+    for `mesh` are released when the mesh is garbage collected.
+    """
+
+    import weakref
+
+    if isinstance(expr, sympy.MatrixBase):
+        expr_key = sympy.ImmutableMatrix(expr)
+    else:
+        expr_key = expr
+
+    mesh_id = None
+    if mesh is not None:
+        mesh_id = id(mesh)
+        if mesh_id not in _evaluation_fn_cache_meshes:
+            _evaluation_fn_cache_meshes.add(mesh_id)
+            weakref.finalize(mesh, _clear_mesh_evaluation_cache, mesh_id)
+
+    key = (mesh_id, expr_key, N, dim, simplify)
+
+    try:
+        cached = _evaluation_fn_cache[key]
+        _evaluation_fn_cache.move_to_end(key)
+        return cached
+    except KeyError:
+        pass
+    except TypeError:
+        # Not hashable - fall through to an uncached compilation
+        key = None
+
+    if simplify:
+        expr = sympy.simplify(expr)
+
+    if verbose and uw.mpi.rank==0:
+        print(f"Compiling expression for evaluation: {expr}")
+
+    # Replace mesh variables in the expression with sympy symbols
+    # in a fixed order
+
+    varfns = tuple(sorted(_uw_varfns_of(expr), key=sympy.default_sort_key))
+    varfns_symbols = {}
+    for i, varfn in enumerate(varfns):
+        varfns_symbols[varfn] = sympy.Symbol(f"_uw_varfn_{i}")
+
+    subbedexpr = expr.subs(varfns_symbols)
+
+    from sympy import lambdify
+
+    r = N.base_scalars()[0:dim]
+
+    # This likely never applies any more
+    if isinstance(subbedexpr, sympy.vector.Vector):
+        subbedexpr = subbedexpr.to_matrix(N)[0:dim,0]
+    elif isinstance(subbedexpr, sympy.vector.Dyadic):
+        subbedexpr = subbedexpr.to_matrix(N)[0:dim,0:dim]
+
+    # Leave out modules. This is equivalent to SYMPY_DECIDE and can then include scipy if available
+    lambfn = lambdify( (r, list(varfns_symbols.values())), subbedexpr )
+
+    if key is not None:
+        _evaluation_fn_cache[key] = (lambfn, varfns)
+        while len(_evaluation_fn_cache) > _evaluation_fn_cache_size:
+            _evaluation_fn_cache.popitem(last=False)
+
+    return lambfn, varfns
+
+
 def evaluate(   expr,
                 np.ndarray coords=None,
                 coord_sys=None,
                 other_arguments=None,
                 simplify=True,
-                verbose=False, ):
+                verbose=False,
+                interpolation_plan=None, ):
     """
     Evaluate a given expression at a list of coordinates.
 
@@ -184,6 +513,9 @@ def evaluate(   expr,
     other_arguments: dict
         Dictionary of other arguments necessary to evaluate function.
         Not yet implemented.
+    interpolation_plan: InterpolationPlan
+        Pre-computed point location for the coordinates (see `InterpolationPlan`).
+        If `coords` is not given, the plan's coordinates are used.
 
     Notes
     -----
@@ -207,6 +539,10 @@ def evaluate(   expr,
            evaluated variable function result arrays.
         6. Return results array for full expression evaluation.
 
+    The lambdified expression (steps 3 and 4) is cached on the unwrapped expression so
+    that repeated evaluations of the same expression (e.g. every timestep) only pay for
+    the interpolation and the arithmetic. Use `clear_evaluation_cache` to release it.
+
 
     """
 
@@ -221,6 +557,12 @@ def evaluate(   expr,
     # if uw.function.fn_is_constant_expr(expr):
     #     return uw.function.fn_substitute_expressions(expr, keep_constants=False)
 
+    if coords is None and interpolation_plan is not None:
+        coords = interpolation_plan.coords
+    elif interpolation_plan is not None:
+        if coords.shape != interpolation_plan.coords.shape or not np.array_equal(coords, interpolation_plan.coords):
+            raise RuntimeError("`evaluate()` the supplied `coords` do not match the `interpolation_plan` coordinates.")
+
     if (not coords is None) and not isinstance( coords, np.ndarray ):
         raise RuntimeError("`evaluate()` function parameter `input` does not appear to be a numpy array.")
 
@@ -238,64 +580,11 @@ def evaluate(   expr,
     ## Substitute any UWExpressions for their values before calculation
     expr = uw.function.fn_substitute_expressions(expr, keep_constants=False)
 
-    if simplify:
-        expr = sympy.simplify(expr)
-
-    if verbose and uw.mpi.rank==0:
-        print(f"Expression to be evaluated: {expr}")
-
     # 1. Extract UW variables.
     # Let's first collect all the meshvariables present in the expression and check
     # them for validity. This is applied recursively across the expression
-    # Recurse the expression tree.
-
-    # varfns = set()
-    # def get_var_fns(exp):
-
-    #     if isinstance(exp,uw.function._function.UnderworldAppliedFunctionDeriv):
-    #         raise RuntimeError("Derivative functions are not handled in evaluations, a projection should be used first to create a mesh Variable.")
-
-    #     isUW = isinstance(exp, uw.function._function.UnderworldAppliedFunction)
-    #     if isUW:
-    #         varfns.add(exp)
-    #         if exp.args != exp.meshvar().mesh.r:
-    #             raise RuntimeError(f"Mesh Variable functions can only be evaluated as functions of '{exp.meshvar().mesh.r}'.\n"
-    #                                f"However, mesh variable '{exp.meshvar().name}' appears to take the argument {exp.args}." )
-    #     else:
-    #         # Recurse.
-    #         for arg in exp.args:
-    #             get_var_fns(arg)
-
-    #     return
 
-    # get_var_fns(expr)
-
-    varfns = set()
-    def unpack_var_fns(exp):
-
-        if isinstance(exp,uw.function._function.UnderworldAppliedFunctionDeriv):
-            raise RuntimeError("Derivative functions are not handled in evaluations, a projection should be used first to create a mesh Variable.")
-
-        isUW = isinstance(exp, uw.function._function.UnderworldAppliedFunction)
-        isMatrix = isinstance(exp, sympy.Matrix)
-
-        if isUW:
-            varfns.add(exp)
-            if exp.args != exp.meshvar().mesh.r:
-                raise RuntimeError(f"Mesh Variable functions can only be evaluated as functions of '{exp.meshvar().mesh.r}'.\n"
-                                   f"However, mesh variable '{exp.meshvar().name}' appears to take the argument {exp.args}." )
-        elif isMatrix:
-            for sub_exp in exp:
-                if isinstance(sub_exp, uw.function._function.UnderworldAppliedFunction):
-                    varfns.add(sub_exp)
-        else:
-            # Recurse.
-            for arg in exp.args:
-                unpack_var_fns(arg)
-
-        return
-
-    unpack_var_fns(expr)
+    varfns = _uw_varfns_of(expr)
 
     # Check the same mesh is used for all mesh variables
     mesh = None
@@ -311,18 +600,10 @@ def evaluate(   expr,
     if verbose:
         print(f"Mesh for evaluations: {mesh.name}", flush=True)
 
-
-
     if (len(varfns)==0) and (coords is None):
         raise RuntimeError("Interpolation coordinates not specified by supplied expression contains mesh variables.\n"
                            "Mesh variables can only be interpolated at coordinates.")
 
-    if mesh is not None:
-        varfns = set()
-        for var in mesh.vars.values():
-            for subvar in var.sym_1d:
-                varfns.add(subvar)
-
     # Create dictionary which creates a per mesh list of vars.
     # Usually there will only be a single mesh, but this allows for the
     # more general situation.
@@ -337,8 +618,8 @@ def evaluate(   expr,
         interpolant_varfns[varfn.meshvar().mesh].append(varfn)
 
 
-    # 2. Evaluate all mesh variables - there is no real
-    # computational benefit in interpolating a subset.
+    # 2. Evaluate the mesh variables that appear in the expression. Only
+    # the fields of these variables are interpolated.
 
     def interpolate_vars_on_mesh( varfns, np.ndarray coords ):
         """
@@ -350,6 +631,7 @@ def evaluate(   expr,
 
         # Grab the mesh
         mesh = varfns[0].meshvar().mesh
+        cached_results = {}
 
         if mesh._evaluation_hash is not None:
             xxh = xxhash.xxh64()
@@ -364,7 +646,10 @@ def evaluate(   expr,
             if coord_hash == mesh._evaluation_hash:
                 # if uw.mpi.rank == 0:
                 #     print("Using uw.evaluation cache", flush=True)
-                return mesh._evaluation_interpolated_results
+                cached_results = mesh._evaluation_interpolated_results
+                varfns = [varfn for varfn in varfns if not varfn in cached_results]
+                if len(varfns) == 0:
+                    return cached_results
             else:
                 # if uw.mpi.rank == 0:
                 #     print("No uw.evaluation cache", flush=True)
@@ -372,83 +657,24 @@ def evaluate(   expr,
                 mesh._evaluation_interpolated_results = None
 
 
-        # For now, eval over all vars
-        vars = mesh.vars.values()
-
-        cdef DM dm = mesh.dm
-        # vars = mesh.vars.values()
-        # Now construct and perform the PETSc evaluate of these variables
-        # Use MPI_COMM_SELF as following uw2 paradigm, interpolations will be local.
-        # TODO: Investigate whether it makes sense to default to global operations here.
-
-        cdef DMInterpolationInfo ipInfo
-        cdef PetscErrorCode ierr
-        ierr = DMInterpolationCreate(MPI_COMM_SELF, &ipInfo); CHKERRQ(ierr)
-        ierr = DMInterpolationSetDim(ipInfo, mesh.dim); CHKERRQ(ierr)
-
-        # Get and set total count of dofs
-        dofcount = 0
-        var_start_index = {}
-        for var in vars:
-            var_start_index[var] = dofcount
-            dofcount += var.num_components
-
-        ierr = DMInterpolationSetDof(ipInfo, dofcount); CHKERRQ(ierr)
-
-        # Add interpolation points
-        # Get c-pointer to data buffer
-        # First grab copy, as we're unsure about the underlying array's
-        # memory layout
-
-        coords = np.ascontiguousarray(coords)
-        cdef double* coords_buff = <double*> coords.data
-        ierr = DMInterpolationAddPoints(ipInfo, coords.shape[0], coords_buff); CHKERRQ(ierr)
-
-        # Generate a vector to hold the interpolation results.
-        # First create a numpy array of the required size.
-        cdef np.ndarray outarray = np.empty([len(coords), dofcount], dtype=np.double)
-        # Now create a PETSc vector to wrap the numpy memory.
-        cdef Vec outvec = PETSc.Vec().createWithArray(outarray,comm=PETSc.COMM_SELF)
+        # The point location is the expensive part of the interpolation:
+        # a plan can be supplied to do this only once.
 
-        # INTERPOLATE ALL VARIABLES ON THE DM
-
-        # grab closest cells to use as hint for DMInterpolationSetUp
-        cdef np.ndarray cells = mesh.get_closest_cells(coords)
-        cdef long unsigned int* cells_buff = <long unsigned int*> cells.data
-        ierr = DMInterpolationSetUp_UW(ipInfo, dm.dm, 0, 0, <size_t*> cells_buff)
-
-        if ierr != 0:
-            raise RuntimeError("Error encountered when trying to interpolate mesh variable.\n"
-                               "Interpolation location is possibly outside the domain.")
-        mesh.update_lvec()
-        cdef Vec pyfieldvec = mesh.lvec
-        # Use our custom routine as the PETSc one is broken.
-
-        ierr = DMInterpolationEvaluate_UW(ipInfo, dm.dm, pyfieldvec.vec, outvec.vec);CHKERRQ(ierr)
-        ierr = DMInterpolationDestroy(&ipInfo);CHKERRQ(ierr)
-
-        # Create map between array slices and variable functions
-
-        varfns_arrays = {}
-        for varfn in varfns:
-            var  = varfn.meshvar()
-            comp = varfn.component
-            var_start = var_start_index[var]
-            arr = np.ascontiguousarray(outarray[:,var_start+comp])
-            varfns_arrays[varfn] = arr
+        if interpolation_plan is not None and interpolation_plan.mesh is mesh:
+            varfns_arrays = interpolation_plan.interpolate(varfns)
+        else:
+            plan = InterpolationPlan(mesh, coords)
+            varfns_arrays = plan.interpolate(varfns)
+            plan.destroy()
 
-        # Cache these results
+        # Cache these results (alongside any previously cached variables)
+        varfns_arrays.update(cached_results)
         xxh = xxhash.xxh64()
         xxh.update(np.ascontiguousarray(coords))
         coord_hash = xxh.intdigest()
         mesh._evaluation_hash = coord_hash
         mesh._evaluation_interpolated_results = varfns_arrays
 
-        del outarray
-        del coords
-        del cells
-        outvec.destroy()
-
         return varfns_arrays
 
 
@@ -458,19 +684,9 @@ def evaluate(   expr,
         interpolated_var_values = interpolate_vars_on_mesh(vals, coords)
         interpolated_results.update(interpolated_var_values)
 
-    # 3. Replace mesh variables in the expression with sympy symbols
-    # First generate random string symbols to act as proxies.
-    import string
-    import random
-    varfns_symbols = {}
-    for varfn in interpolated_results.keys():
-        randstr = ''.join(random.choices(string.ascii_uppercase, k = 5))
-        varfns_symbols[varfn] = sympy.Symbol(randstr)
-    # subs variable fns in expression for symbols
-    subbedexpr = expr.subs(varfns_symbols)
-
-    # 4. Generate sympy lambdified expression
-    from sympy import lambdify
+    # 3. / 4. Obtain the compiled (lambdified) form of the expression. The mesh
+    # variables are replaced by placeholder symbols. This is cached so repeated
+    # evaluations of the same expression skip the symbolic work.
     from sympy.vector import CoordSys3D
     dim = coords.shape[1]
 
@@ -483,20 +699,11 @@ def evaluate(   expr,
     else:
         N = mesh.N
 
-    r = N.base_scalars()[0:dim]
-
-    # This likely never applies any more
-    if isinstance(subbedexpr, sympy.vector.Vector):
-        subbedexpr = subbedexpr.to_matrix(N)[0:dim,0]
-    elif isinstance(subbedexpr, sympy.vector.Dyadic):
-        subbedexpr = subbedexpr.to_matrix(N)[0:dim,0:dim]
-
-    lambfn = lambdify( (r, varfns_symbols.values()), subbedexpr )
-    # Leave out modules. This is equivalent to SYMPY_DECIDE and can then include scipy if available
+    lambfn, expr_varfns = _compiled_expression(expr, N, dim, simplify, verbose, mesh)
 
     # 5. Eval generated lambda expression
     coords_list = [ coords[:,i] for i in range(dim) ]
-    results = lambfn( coords_list, interpolated_results.values() )
+    results = lambfn( coords_list, [interpolated_results[varfn] for varfn in expr_varfns] )
 
 
     # Check shape of original expression
@@ -587,6 +794,10 @@ def evalf(  expr,
            evaluated variable function result arrays.
         6. Return results array for full expression evaluation.
 
+    The lambdified expression (steps 3 and 4) is cached on the unwrapped expression so
+    that repeated evaluations of the same expression (e.g. every timestep) only pay for
+    the interpolation and the arithmetic. Use `clear_evaluation_cache` to release it.
+
 
     """
 
@@ -616,41 +827,12 @@ def evalf(  expr,
     ## Substitute any uw_expressions for their values before calculation
     expr = uw.function.fn_substitute_expressions(expr, keep_constants=False)
 
-    if simplify:
-        expr = sympy.simplify(expr)
-
     # 1. Extract UW variables.
 
     # Let's first collect all the meshvariables present in the expression and check
     # them for validity. This is applied recursively across the expression
-    # Recurse the expression tree.
-
-    varfns = set()
-    def unpack_var_fns(exp):
-
-        if isinstance(exp,uw.function._function.UnderworldAppliedFunctionDeriv):
-            raise RuntimeError("Derivative functions are not handled in evaluations, a projection should be used first to create a mesh Variable.")
-
-        isUW = isinstance(exp, uw.function._function.UnderworldAppliedFunction)
-        isMatrix = isinstance(exp, sympy.Matrix)
-
-        if isUW:
-            varfns.add(exp)
-            if exp.args != exp.meshvar().mesh.r:
-                raise RuntimeError(f"Mesh Variable functions can only be evaluated as functions of '{exp.meshvar().mesh.r}'.\n"
-                                   f"However, mesh variable '{exp.meshvar().name}' appears to take the argument {exp.args}." )
-        elif isMatrix:
-            for sub_exp in exp:
-                if isinstance(sub_exp, uw.function._function.UnderworldAppliedFunction):
-                    varfns.add(sub_exp)
-        else:
-            # Recurse.
-            for arg in exp.args:
-                unpack_var_fns(arg)
 
-        return
-
-    unpack_var_fns(expr)
+    varfns = _uw_varfns_of(expr)
 
     mesh = None
     for varfn in varfns:
@@ -661,34 +843,25 @@ def evalf(  expr,
             if mesh != varfn.meshvar().mesh:
                 raise RuntimeError("In this expression there are functions defined on different meshes. This is not supported")
 
-    # 2. Evaluate all mesh variables - there is no real
-    # computational benefit in interpolating a subset.
+    # 2. Evaluate the mesh variables that appear in the expression. Each
+    # variable is interpolated once (all components) however many of its
+    # components are needed.
 
     # Get map of all variable functions (no cache)
     interpolated_results = {}
+    parent_values = {}
 
     for varfn in varfns:
         parent, component = uw.discretisation.meshVariable_lookup_by_symbol(mesh, varfn)
-        values = parent.rbf_interpolate(coords, nnn=mesh.dim+1)[:,component]
-        interpolated_results[varfn] = values
+        if not parent in parent_values:
+            parent_values[parent] = parent.rbf_interpolate(coords, nnn=mesh.dim+1)
+
+        interpolated_results[varfn] = parent_values[parent][:,component]
 
         if verbose:
             print(f"{varfn} = {parent.name}[{component}]")
 
-    # 3. Replace mesh variables in the expression with sympy symbols
-    # First generate random string symbols to act as proxies.
-
-    import string
-    import random
-    varfns_symbols = {}
-    for varfn in interpolated_results.keys():
-        randstr = ''.join(random.choices(string.ascii_uppercase, k = 5))
-        varfns_symbols[varfn] = sympy.Symbol(randstr)
-    # subs variable fns in expression for symbols
-    subbedexpr = expr.subs(varfns_symbols)
-
-    # 4. Generate sympy lambdified expression
-    from sympy import lambdify
+    # 3. / 4. Obtain the (cached) lambdified form of the expression
     from sympy.vector import CoordSys3D
     dim = coords.shape[1]
 
@@ -697,24 +870,15 @@ def evalf(  expr,
     if coord_sys is not None:
         N = coord_sys
     elif mesh is None:
-        from sympy.vector import CoordSys3D
         N = CoordSys3D(f"N")
     else:
         N = mesh.N
 
-    r = N.base_scalars()[0:dim]
-
-    # # This likely never applies any more
-    # if isinstance(subbedexpr, sympy.vector.Vector):
-    #     subbedexpr = subbedexpr.to_matrix(N)[0:dim,0]
-    # elif isinstance(subbedexpr, sympy.vector.Dyadic):
-    #     subbedexpr = subbedexpr.to_matrix(N)[0:dim,0:dim]
-
-    lambfn = lambdify( (r, varfns_symbols.values()), subbedexpr )
+    lambfn, expr_varfns = _compiled_expression(expr, N, dim, simplify, verbose, mesh)
 
     # 5. Eval generated lambda expression
     coords_list = [ coords[:,i] for i in range(dim) ]
-    results = lambfn( coords_list, interpolated_results.values() )
+    results = lambfn( coords_list, [interpolated_results[varfn] for varfn in expr_varfns] )
 
 
     # Check shape of original expression
@@ -151,6 +151,43 @@ PetscErrorCode DMInterpolationSetUp_UW(DMInterpolationInfo ctx, DM dm, PetscBool
   PetscFunctionReturn(PETSC_SUCCESS);
 }
 
+/*@C
+  DMInterpolationReferenceCoordinates_UW - Compute the reference (cell) coordinates of the interpolation points
+
+  Input Parameters:
++ ctx - The DMInterpolationInfo context (after DMInterpolationSetUp_UW)
+- dm  - The DM
+
+  Output Parameters:
+. xi  - The reference coordinates, an array of size ctx->n * ctx->dim (unlocated points are set to zero)
+
+  Note: These can be passed to DMInterpolationEvaluateReference_UW to re-use the point location.
+
+  Level: intermediate
+
+.seealso: DMInterpolationEvaluateReference_UW(), DMInterpolationSetUp_UW()
+@*/
+PetscErrorCode DMInterpolationReferenceCoordinates_UW(DMInterpolationInfo ctx, DM dm, PetscReal *xi)
+{
+  const PetscScalar *coords;
+  PetscInt           p, d, cdim;
+
+  PetscFunctionBegin;
+  PetscValidHeaderSpecific(dm, DM_CLASSID, 2);
+  PetscCall(DMGetCoordinateDim(dm, &cdim));
+  PetscCall(VecGetArrayRead(ctx->coords, &coords));
+  for (p = 0; p < ctx->n; ++p) {
+    PetscReal pcoords[3];
+
+    for (d = 0; d < ctx->dim; ++d) xi[p * ctx->dim + d] = 0.0;
+    if (ctx->cells[p] < 0) continue;
+    for (d = 0; d < cdim; ++d) pcoords[d] = PetscRealPart(coords[p * cdim + d]);
+    PetscCall(DMPlexCoordinatesToReference(dm, ctx->cells[p], 1, pcoords, &xi[p * ctx->dim]));
+  }
+  PetscCall(VecRestoreArrayRead(ctx->coords, &coords));
+  PetscFunctionReturn(PETSC_SUCCESS);
+}
+
 /*@C
   DMInterpolationEvaluate - Using the input from dm and x, calculates interpolated field values at the interpolation points.
 
@@ -169,6 +206,31 @@ PetscErrorCode DMInterpolationSetUp_UW(DMInterpolationInfo ctx, DM dm, PetscBool
 .seealso: DMInterpolationGetVector(), DMInterpolationAddPoints(), DMInterpolationCreate()
 @*/
 PetscErrorCode DMInterpolationEvaluate_UW(DMInterpolationInfo ctx, DM dm, Vec x, Vec v)
+{
+  PetscFunctionBegin;
+  PetscCall(DMInterpolationEvaluateReference_UW(ctx, dm, NULL, NULL, x, v));
+  PetscFunctionReturn(PETSC_SUCCESS);
+}
+
+/*@C
+  DMInterpolationEvaluateReference_UW - As DMInterpolationEvaluate_UW but with the reference coordinates of the
+  interpolation points supplied (from DMInterpolationReferenceCoordinates_UW) rather than recomputed
+
+  Input Parameters:
++ ctx    - The DMInterpolationInfo context
+. dm     - The DM
+. xi     - The reference coordinates of the points (or NULL to compute them)
+. active - Flags for the fields to interpolate (or NULL for all fields); ctx->dof must match the active fields
+- x      - The local vector containing the field to be interpolated
+
+  Output Parameters:
+. v   - The vector containing the interpolated values
+
+  Level: intermediate
+
+.seealso: DMInterpolationReferenceCoordinates_UW(), DMInterpolationEvaluate_UW()
+@*/
+PetscErrorCode DMInterpolationEvaluateReference_UW(DMInterpolationInfo ctx, DM dm, const PetscReal *xi_points, const PetscBool *active, Vec x, Vec v)
 {
   PetscDS   ds;
   PetscInt  n, p, Nf, field;
@@ -176,8 +238,8 @@ PetscErrorCode DMInterpolationEvaluate_UW(DMInterpolationInfo ctx, DM dm, Vec x,
 
   PetscFunctionBegin;
   PetscValidHeaderSpecific(dm, DM_CLASSID, 2);
-  PetscValidHeaderSpecific(x, VEC_CLASSID, 3);
-  PetscValidHeaderSpecific(v, VEC_CLASSID, 4);
+  PetscValidHeaderSpecific(x, VEC_CLASSID, 5);
+  PetscValidHeaderSpecific(v, VEC_CLASSID, 6);
   PetscCall(VecGetLocalSize(v, &n));
   PetscCheck(n == ctx->n * ctx->dof, ctx->comm, PETSC_ERR_ARG_SIZ, "Invalid input vector size %" PetscInt_FMT " should be %" PetscInt_FMT, n, ctx->n * ctx->dof);
   if (!n) PetscFunctionReturn(PETSC_SUCCESS);
@@ -206,13 +268,19 @@ PetscErrorCode DMInterpolationEvaluate_UW(DMInterpolationInfo ctx, DM dm, Vec x,
     PetscCall(VecGetArrayRead(ctx->coords, &coords));
     PetscCall(VecGetArrayWrite(v, &interpolant));
     for (p = 0; p < ctx->n; ++p) {
-      PetscReal    pcoords[3], xi[3];
-      PetscScalar *xa   = NULL;
-      PetscInt     coff = 0, foff = 0, clSize;
+      PetscReal        pcoords[3], xi_p[3];
+      const PetscReal *xi;
+      PetscScalar     *xa   = NULL;
+      PetscInt         coff = 0, foff = 0, clSize;
 
       if (ctx->cells[p] < 0) continue;
-      for (d = 0; d < cdim; ++d) pcoords[d] = PetscRealPart(coords[p * cdim + d]);
-      PetscCall(DMPlexCoordinatesToReference(dm, ctx->cells[p], 1, pcoords, xi));
+      if (xi_points) {
+        xi = &xi_points[p * ctx->dim];
+      } else {
+        for (d = 0; d < cdim; ++d) pcoords[d] = PetscRealPart(coords[p * cdim + d]);
+        PetscCall(DMPlexCoordinatesToReference(dm, ctx->cells[p], 1, pcoords, xi_p));
+        xi = xi_p;
+      }
       PetscCall(DMPlexVecGetClosure(dm, NULL, x, ctx->cells[p], &clSize, &xa));
       for (field = 0; field < Nf; ++field) {
         PetscTabulation T;
@@ -221,7 +289,14 @@ PetscErrorCode DMInterpolationEvaluate_UW(DMInterpolationInfo ctx, DM dm, Vec x,
 
         PetscCall(PetscDSGetDiscretization(ds, field, &obj));
         PetscCall(PetscObjectGetClassId(obj, &id));
-        if (id == PETSCFE_CLASSID) {
+        if (active && !active[field]) {
+          /* Skip over this field's closure values */
+          PetscInt Nb;
+
+          if (id == PETSCFE_CLASSID) PetscCall(PetscFEGetDimension((PetscFE)obj, &Nb));
+          else PetscCall(PetscFVGetNumComponents((PetscFV)obj, &Nb));
+          foff += Nb;
+        } else if (id == PETSCFE_CLASSID) {
           PetscFE fe = (PetscFE)obj;
 
           PetscCall(PetscFECreateTabulation(fe, 1, 1, xi, 0, &T));
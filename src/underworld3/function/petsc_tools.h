@@ -6,4 +6,6 @@
 #include <petsc/private/petscfeimpl.h>
 
 PetscErrorCode DMInterpolationSetUp_UW(DMInterpolationInfo ctx, DM dm, PetscBool redundantPoints, PetscBool ignoreOutsideDomain, size_t* owning_cell);
-PetscErrorCode DMInterpolationEvaluate_UW(DMInterpolationInfo ctx, DM dm, Vec x, Vec v);
\ No newline at end of file
+PetscErrorCode DMInterpolationEvaluate_UW(DMInterpolationInfo ctx, DM dm, Vec x, Vec v);
+PetscErrorCode DMInterpolationReferenceCoordinates_UW(DMInterpolationInfo ctx, DM dm, PetscReal *xi);
+PetscErrorCode DMInterpolationEvaluateReference_UW(DMInterpolationInfo ctx, DM dm, const PetscReal *xi, const PetscBool *active, Vec x, Vec v);
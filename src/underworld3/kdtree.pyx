@@ -12,8 +12,10 @@ cdef extern from "kdtree_interface.hpp" nogil:
         KDTree_Interface()
         KDTree_Interface( const double* points, int numpoints, int dim )
         void build_index()
-        void find_closest_point( size_t  num_coords, const double* coords, long unsigned int* indices, double* out_dist_sqr, bool* found )
+        void find_closest_point( size_t  num_coords, const double* coords, long unsigned int* indices, double* out_dist_sqr, bool* found, int num_threads )
+        void find_closest_n_points( size_t num_coords, const double* coords, size_t num_closest, long unsigned int* indices, double* out_dist_sqr, int num_threads )
         size_t knnSearch(const double* query_point, const size_t num_closest, long unsigned int* indices, double* out_dist_sqr )
+        void rbf_interpolate( size_t num_coords, const double* coords, size_t nnn, const double* data, size_t data_size, double* values, int num_threads )
 
 cdef class KDTree:
     """
@@ -86,7 +88,8 @@ cdef class KDTree:
 
     @timing.routine_timer_decorator
     def find_closest_point(self,
-                          const double[:,::1] coords not None:   numpy.ndarray):
+                          const double[:,::1] coords not None:   numpy.ndarray,
+                          int nthreads = 1):
         """
         Find the points closest to the provided set of coordinates.
 
@@ -95,6 +98,9 @@ cdef class KDTree:
         coords:
             An array of coordinates for which the kd-tree index will be searched for nearest
             neighbours. This should be a 2-dimensional array of size (n_coords,dim).
+        nthreads:
+            The number of threads to share the queries between (`nthreads < 1` uses all
+            available cores).
 
         Returns
         -------
@@ -114,25 +120,31 @@ cdef class KDTree:
         if coords.shape[1] != self.points.shape[1]:
             raise RuntimeError(f"Provided coords array dimensionality ({coords.shape[1]}) is different to points dimensionality ({self.points.shape[1]}).")
 
-        count = coords.shape[0]
+        cdef size_t count = coords.shape[0]
         indices  = np.empty(count, dtype=np.uint64,  order='C')
         dist_sqr = np.empty(count, dtype=np.float64, order='C')
         found    = np.empty(count, dtype=np.bool_,   order='C')
 
+        if count == 0:
+            return indices, dist_sqr, found
+
         cdef long unsigned int[::1]  c_indices = indices
         cdef            double[::1] c_dist_sqr = dist_sqr
         cdef              bool[::1]    c_found = found
-        self.index.find_closest_point(count,
-                                    <    const double *> &coords[0][0],
-                                    <long unsigned int*> &c_indices[0],
-                                    <           double*> &c_dist_sqr[0],
-                                    <             bool*> &c_found[0] )
+        with nogil:
+            self.index.find_closest_point(count,
+                                        <    const double *> &coords[0][0],
+                                        <long unsigned int*> &c_indices[0],
+                                        <           double*> &c_dist_sqr[0],
+                                        <             bool*> &c_found[0],
+                                        nthreads )
         return indices, dist_sqr, found
 
     @timing.routine_timer_decorator
     def find_closest_n_points(self,
                   const int nCount                    :   numpy.int64,
-                  const double[: ,::1] coords not None:   numpy.ndarray):
+                  const double[: ,::1] coords not None:   numpy.ndarray,
+                  int nthreads = 1):
         """
         Find the n points closest to the provided coordinates.
 
@@ -145,6 +157,10 @@ cdef class KDTree:
             Coordinates of the points for which the kd-tree index will be searched for nearest
             neighbours. This should be a 2-dimensional array of size (n_coords,dim).
 
+        nthreads:
+            The number of threads to share the queries between (`nthreads < 1` uses all
+            available cores).
+
         Returns
         -------
         indices:
@@ -158,43 +174,45 @@ cdef class KDTree:
 
         if coords.shape[1] != self.points.shape[1]:
             raise RuntimeError(f"Provided coords array dimensionality ({coords.shape[1]}) is different to points dimensionality ({self.points.shape[1]}).")
-        nInput = coords.shape[0]
+
+        cdef size_t nInput = coords.shape[0]
+        cdef size_t c_nCount = nCount
 
         # allocate numpy arrays -
 
-        n_indices  = np.empty((coords.shape[0], nCount), dtype=np.uint64,  order='C')
-        n_dist_sqr = np.empty((coords.shape[0], nCount), dtype=np.float64,  order='C')
+        n_indices  = np.empty((nInput, nCount), dtype=np.uint64,  order='C')
+        n_dist_sqr = np.empty((nInput, nCount), dtype=np.float64,  order='C')
 
-        indices  = np.empty(nCount, dtype=np.uint64,  order='C')
-        dist_sqr = np.empty(nCount, dtype=np.float64, order='C')
+        if nInput == 0 or nCount == 0:
+            return n_indices, n_dist_sqr
 
         # allocate memoryviews in C contiguous layout
-        cdef long unsigned int[::1] c_indices  = indices
-        cdef            double[::1] c_dist_sqr = dist_sqr
-
-        # Build the array one point at a time
+        cdef long unsigned int[:, ::1] c_indices  = n_indices
+        cdef            double[:, ::1] c_dist_sqr = n_dist_sqr
 
-        for p in range(coords.shape[0]):
-            self.index.knnSearch( <const double *> &coords[p][0],
-                                nCount,
-                                <long unsigned int*> &c_indices[0],
-                                <           double*> &c_dist_sqr[0])
+        # All the points are searched in one call (without the GIL)
 
-            n_indices[p,:] = indices[:]
-            n_dist_sqr[p,:] = dist_sqr[:]
+        with nogil:
+            self.index.find_closest_n_points(nInput,
+                                    <    const double *> &coords[0][0],
+                                    c_nCount,
+                                    <long unsigned int*> &c_indices[0][0],
+                                    <           double*> &c_dist_sqr[0][0],
+                                    nthreads )
 
         # return numpy data
         return n_indices, n_dist_sqr
 
 
 ## A general point-to-point rbf interpolator here
-## NOTE this is not using cython optimisation for numpy
 
+    @timing.routine_timer_decorator
     def rbf_interpolator_local(self,
             coords,
             data,
             nnn = 4,
             verbose = False,
+            int nthreads = 1,
         ):
 
         '''
@@ -202,47 +220,42 @@ cdef class KDTree:
         set of coordinates to another. This assumes all points are local to the
         same processor. If that is not the case, it is best to use a particle swarm
         to migrate data.
+
+        The weights are computed once for each coordinate and applied to all the
+        columns of `data`. The work can be shared between `nthreads` threads
+        (`nthreads < 1` uses all available cores).
         '''
 
         if coords.shape[1] != self.points.shape[1]:
             raise RuntimeError(f"Interpolation coordinates dimensionality ({coords.shape[1]}) is different to kD-tree dimensionality ({self.points.shape[1]}).")
-        nInput = coords.shape[0]
 
         if data.shape[0] != self.points.shape[0]:
                 raise RuntimeError(f"Data does not match kD-tree size array ({data.shape[0]}) v ({self.points.shape[0]}).")
 
-        coords_contiguous = np.ascontiguousarray(coords)
-
-        closest_n, distance_n = self.find_closest_n_points(nnn, coords_contiguous)
+        cdef const double[:, ::1] c_coords = np.ascontiguousarray(coords, dtype=np.float64)
+        cdef const double[:, ::1] c_data = np.ascontiguousarray(data, dtype=np.float64)
 
-        num_local_points = coords.shape[0]
-        data_size = data.shape[1]
+        cdef size_t num_local_points = coords.shape[0]
+        cdef size_t data_size = data.shape[1]
+        cdef size_t c_nnn = nnn
 
         Values = np.zeros((num_local_points, data_size))
-        Weights = np.zeros((num_local_points, 1))
+        cdef double[:, ::1] c_values = Values
 
         if verbose and uw.mpi.rank == 0:
             print("Mapping values  ... start", flush=True)
 
-        epsilon = 1.0e-9
-        for j in range(nnn):
-            j_distance = epsilon + np.sqrt(distance_n[:, j])
-            Weights[:, 0] += 1.0 / j_distance[:]
-
-        for d in range(data_size):
-            for j in range(nnn):
-                j_distance = epsilon + np.sqrt(distance_n[:, j])
-                j_nearest = closest_n[:, j]
-                Values[:, d] += data[j_nearest, d] / j_distance
-
-        Values[...] /= Weights[:]
+        if num_local_points > 0 and data_size > 0 and self.points.shape[0] > 0:
+            with nogil:
+                self.index.rbf_interpolate(num_local_points,
+                                           &c_coords[0][0],
+                                           c_nnn,
+                                           &c_data[0][0],
+                                           data_size,
+                                           &c_values[0][0],
+                                           nthreads)
 
         if verbose and uw.mpi.rank == 0:
             print("Mapping values ... done", flush=True)
 
-        del coords_contiguous
-        del closest_n
-        del distance_n
-        del Weights
-
         return Values
@@ -1,5 +1,40 @@
 #include "nanoflann.hpp"
 
+#include <algorithm>
+#include <cmath>
+#include <thread>
+#include <vector>
+
+// Apply f(begin, end) to contiguous chunks of the range [0, n) using up to
+// num_threads threads (num_threads < 1 uses all available hardware threads).
+// The kd-tree queries are read-only so they can be shared between threads.
+template <class F>
+void parallel_for_chunks(size_t n, int num_threads, F f)
+{
+    if (num_threads < 1)
+        num_threads = std::max(1u, std::thread::hardware_concurrency());
+
+    size_t nthreads = std::min((size_t)num_threads, n);
+    if (nthreads <= 1)
+    {
+        f((size_t)0, n);
+        return;
+    }
+
+    std::vector<std::thread> threads;
+    size_t chunk = (n + nthreads - 1) / nthreads;
+    for (size_t t = 0; t < nthreads; t++)
+    {
+        size_t begin = t * chunk;
+        size_t end = std::min(n, begin + chunk);
+        if (begin >= end)
+            break;
+        threads.emplace_back(f, begin, end);
+    }
+    for (auto &thread : threads)
+        thread.join();
+}
+
 struct PointCloudAdaptor
 {
 	const double* obj;
@@ -77,24 +112,37 @@ class KDTree_Interface
             else
                 index3d->buildIndex();
         };
-        void find_closest_point( size_t num_coords, const double* coords, long unsigned int* indices, double* out_dist_sqr, bool* found )
+        void find_closest_point( size_t num_coords, const double* coords, long unsigned int* indices, double* out_dist_sqr, bool* found, int num_threads=1 )
         {
-            double dist;
-            nanoflann::KNNResultSet<double> resultSet(1);
-            for (size_t item=0; item<num_coords; item++ )
+            parallel_for_chunks(num_coords, num_threads, [&](size_t begin, size_t end)
             {
-                resultSet.init( &indices[item], &dist );
-                bool founditem;
-                if(dim==2)
-                    founditem = index2d->findNeighbors(resultSet, &coords[item*dim], nanoflann::SearchParams(10)); // note that I believe the value 10 here is ignored.. i'll retain it as it's used in the examples
-                else
-                    founditem = index3d->findNeighbors(resultSet, &coords[item*dim], nanoflann::SearchParams(10));  // See line 561 of .hpp, not used but 
-                                                                                                                    // if you want to set other args you'll need to be aware of it
-                if (out_dist_sqr!=NULL) out_dist_sqr[item] = dist; 
-                if (       found!=NULL)        found[item] = founditem; 
-            }
+                double dist;
+                nanoflann::KNNResultSet<double> resultSet(1);
+                for (size_t item=begin; item<end; item++ )
+                {
+                    resultSet.init( &indices[item], &dist );
+                    bool founditem;
+                    if(dim==2)
+                        founditem = index2d->findNeighbors(resultSet, &coords[item*dim], nanoflann::SearchParams(10)); // note that I believe the value 10 here is ignored.. i'll retain it as it's used in the examples
+                    else
+                        founditem = index3d->findNeighbors(resultSet, &coords[item*dim], nanoflann::SearchParams(10));  // See line 561 of .hpp, not used but 
+                                                                                                                        // if you want to set other args you'll need to be aware of it
+                    if (out_dist_sqr!=NULL) out_dist_sqr[item] = dist; 
+                    if (       found!=NULL)        found[item] = founditem; 
+                }
+            });
         }; 
 
+        // The num_closest nearest points for each of the coords (row-major, num_coords x num_closest)
+        void find_closest_n_points( size_t num_coords, const double* coords, size_t num_closest, long unsigned int* indices, double* out_dist_sqr, int num_threads=1 )
+        {
+            parallel_for_chunks(num_coords, num_threads, [&](size_t begin, size_t end)
+            {
+                for (size_t item=begin; item<end; item++ )
+                    knnSearch( &coords[item*dim], num_closest, &indices[item*num_closest], &out_dist_sqr[item*num_closest] );
+            });
+        };
+
         size_t knnSearch(const double* query_point, const size_t num_closest, long unsigned int* indices, double* out_dist_sqr ) {
           if( dim == 2 )
            return index2d->knnSearch( query_point, num_closest, indices, out_dist_sqr ); 
@@ -102,4 +150,37 @@ class KDTree_Interface
            return index3d->knnSearch( query_point, num_closest, indices, out_dist_sqr ); 
         };
 
+        // Inverse distance weighted interpolation of data (numpoints x data_size) from the
+        // nnn nearest points to each of the coords. The weights are computed once per
+        // coordinate and applied to all components of the data.
+        void rbf_interpolate( size_t num_coords, const double* coords, size_t nnn, const double* data, size_t data_size, double* values, int num_threads )
+        {
+            parallel_for_chunks(num_coords, num_threads, [&](size_t begin, size_t end)
+            {
+                const double epsilon = 1.0e-9;
+                std::vector<long unsigned int> indices(nnn);
+                std::vector<double> dist_sqr(nnn);
+
+                for (size_t item=begin; item<end; item++ )
+                {
+                    size_t nfound = knnSearch( &coords[item*dim], nnn, indices.data(), dist_sqr.data() );
+                    double* value = &values[item*data_size];
+                    double weights = 0.0;
+
+                    for (size_t d=0; d<data_size; d++ ) value[d] = 0.0;
+
+                    for (size_t j=0; j<nfound; j++ )
+                    {
+                        const double weight = 1.0 / (epsilon + std::sqrt(dist_sqr[j]));
+                        const double* data_j = &data[indices[j]*data_size];
+                        weights += weight;
+                        for (size_t d=0; d<data_size; d++ ) value[d] += weight * data_j[d];
+                    }
+
+                    if (weights > 0.0)
+                        for (size_t d=0; d<data_size; d++ ) value[d] /= weights;
+                }
+            });
+        };
+
 };
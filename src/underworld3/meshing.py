@@ -18,6 +18,90 @@ import underworld3.timing as timing
 import sympy
 
 
+class _MeshCache:
+    """
+    Content-addressed cache for the meshes built by the generators in this module.
+
+    The cache key is a hash of the generator name, all the arguments that define
+    the mesh and the gmsh version. Unless a `filename` is given, the mesh is stored
+    as `.meshes/<name>_<key>.msh` and the converted dmplex file (with its labels)
+    as `.meshes/<name>_<key>.msh.h5`. The key is stored in the .h5 file. If it
+    matches, the generator skips gmsh and the mesh is loaded directly from the
+    .h5 file. A mesh written to a user supplied `filename` with different
+    arguments is regenerated.
+
+    Usage in a generator:
+
+        mesh_cache = _MeshCache("uw_name", filename, cellSize=cellSize, ...)
+        uw_filename = mesh_cache.msh_file
+
+        if uw.mpi.rank == 0 and not mesh_cache.cached:
+            ...  # gmsh
+
+        new_mesh = Mesh(mesh_cache.mesh_file, ...)
+        mesh_cache.store()
+    """
+
+    # Change this if the generators change the meshes that they build
+    _version = 1
+
+    def __init__(self, name, filename=None, **arguments):
+        from underworld3.discretisation import _plexh5_attribute
+
+        key = None
+        cached = False
+
+        if uw.mpi.rank == 0:
+            import gmsh
+            import xxhash
+
+            xxh = xxhash.xxh64()
+            xxh.update(
+                repr(
+                    (name, self._version, gmsh.__version__, sorted(arguments.items()))
+                ).encode()
+            )
+            key = xxh.hexdigest()
+
+            if filename is None:
+                os.makedirs(".meshes", exist_ok=True)
+                filename = f".meshes/{name}_{key}.msh"
+
+            cached = _plexh5_attribute(filename + ".h5", "uw_cache_key") == key
+
+        self.key, self.msh_file, self.cached = uw.mpi.comm.bcast(
+            (key, filename, cached), root=0
+        )
+        self.h5_file = self.msh_file + ".h5"
+
+    @property
+    def mesh_file(self):
+        """The file to build the `Mesh` from (the .h5 file if it is cached)"""
+
+        if self.cached:
+            return self.h5_file
+        else:
+            return self.msh_file
+
+    def store(self):
+        """Stamp the (newly converted) .h5 file with the cache key"""
+
+        if self.cached:
+            return
+
+        uw.mpi.barrier()
+
+        if uw.mpi.rank == 0:
+            import h5py
+
+            with h5py.File(self.h5_file, "a") as f:
+                f.attrs["uw_cache_key"] = self.key
+
+        self.cached = True
+
+        return
+
+
 @timing.routine_timer_decorator
 def UnstructuredSimplexBox(
     minCoords: Tuple = (0.0, 0.0),
@@ -83,15 +167,17 @@ def UnstructuredSimplexBox(
         boundaries = boundaries_3D
         boundary_normals = boundary_normals_3D
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_simplexbox_minC{minCoords}_maxC{maxCoords}_csize{cellSize}_reg{regular}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_simplexbox",
+        filename,
+        minCoords=minCoords,
+        maxCoords=maxCoords,
+        cellSize=cellSize,
+        regular=regular,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         gmsh.initialize()
@@ -229,7 +315,7 @@ def UnstructuredSimplexBox(
         return coords
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         boundaries=boundaries,
@@ -244,6 +330,8 @@ def UnstructuredSimplexBox(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     return new_mesh
 
 
@@ -318,17 +406,16 @@ def StructuredQuadBox(
         boundaries = boundaries_3D
         boundary_normals = boundary_normals_3D
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = (
-            f".meshes/uw_structuredQuadBox_minC{minCoords}_maxC{maxCoords}.msh"
-        )
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_structuredQuadBox",
+        filename,
+        elementRes=elementRes,
+        minCoords=minCoords,
+        maxCoords=maxCoords,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         gmsh.initialize()
         gmsh.option.setNumber("General.Verbosity", gmsh_verbosity)
         gmsh.model.add("Box")
@@ -545,7 +632,7 @@ def StructuredQuadBox(
         return coords
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         boundaries=boundaries,
@@ -560,6 +647,8 @@ def StructuredQuadBox(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     return new_mesh
 
 
@@ -582,15 +671,16 @@ def SphericalShell(
 
     import gmsh
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_spherical_shell_ro{radiusOuter}_ri{radiusInner}_csize{cellSize}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_spherical_shell",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInner=radiusInner,
+        cellSize=cellSize,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         gmsh.initialize()
         gmsh.option.setNumber("General.Verbosity", gmsh_verbosity)
         gmsh.model.add("Sphere")
@@ -701,7 +791,7 @@ def SphericalShell(
         return
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         coordinate_system_type=CoordinateSystemType.SPHERICAL,
@@ -715,6 +805,8 @@ def SphericalShell(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = 11
         Upper = 12
@@ -800,19 +892,21 @@ def SphericalShellInternalBoundary(
 
     import gmsh
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_spherical_shell_ro{radiusOuter}_rint{radiusInternal}_ri{radiusInner}_csize{cellSize}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_spherical_shell_internalBoundary",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInternal=radiusInternal,
+        radiusInner=radiusInner,
+        cellSize=cellSize,
+    )
+    uw_filename = mesh_cache.msh_file
 
     # Check if r_i is greater than 0
     if radiusInner <= 0:
         raise ValueError("The inner radius must be greater than 0.")
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         gmsh.initialize()
         gmsh.option.setNumber("General.Verbosity", gmsh_verbosity)
         gmsh.model.add("SphereShell_with_Internal_Surface")
@@ -932,7 +1026,7 @@ def SphericalShellInternalBoundary(
         return
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         coordinate_system_type=CoordinateSystemType.SPHERICAL,
@@ -946,6 +1040,8 @@ def SphericalShellInternalBoundary(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = 11
         Internal = 12
@@ -1044,13 +1140,17 @@ def SegmentofSphere(
 
     import gmsh
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_segmentofsphere_ro{radiusOuter}_ri{radiusInner}_longext{longitudeExtent}_latext{latitudeExtent}_csize{cellSize}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_segmentofsphere",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInner=radiusInner,
+        longitudeExtent=longitudeExtent,
+        latitudeExtent=latitudeExtent,
+        cellSize=cellSize,
+        centroid=centroid,
+    )
+    uw_filename = mesh_cache.msh_file
 
     if (
         radiusInner <= 0
@@ -1063,7 +1163,7 @@ def SegmentofSphere(
             "and longitudeExtent and latitudeExtent must be within the range (0, 180)."
         )
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
 
         def getSphericalXYZ(point):
             """
@@ -1217,7 +1317,7 @@ def SegmentofSphere(
         return
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         coordinate_system_type=CoordinateSystemType.SPHERICAL,
@@ -1231,6 +1331,8 @@ def SegmentofSphere(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = 11
         Upper = 12
@@ -1262,17 +1364,18 @@ def QuarterAnnulus(
         Right = 4
         Centre = 10
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = (
-            f"uw_QuarterAnnulus_ro{radiusOuter}_ri{radiusInner}_csize{cellSize}.msh"
-        )
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_quarter_annulus",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInner=radiusInner,
+        angle=angle,
+        cellSize=cellSize,
+        centre=centre,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         gmsh.initialize()
@@ -1382,7 +1485,7 @@ def QuarterAnnulus(
         gmsh.finalize()
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         useMultipleTags=True,
@@ -1394,6 +1497,8 @@ def QuarterAnnulus(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     # add boundary normal information to the new mesh
     # this is done now because it requires the coordinate system to be
     # instantiated already (could/should this be done before the mesh is constructed ?)
@@ -1430,15 +1535,17 @@ def Annulus(
         Upper = 2
         Centre = 10
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = (
-            f".meshes/uw_annulus_ro{radiusOuter}_ri{radiusInner}_csize{cellSize}.msh"
-        )
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_annulus",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInner=radiusInner,
+        cellSize=cellSize,
+        cellSizeOuter=cellSizeOuter,
+        cellSizeInner=cellSizeInner,
+        centre=centre,
+    )
+    uw_filename = mesh_cache.msh_file
 
     if cellSizeInner is None:
         cellSizeInner = cellSize
@@ -1446,7 +1553,7 @@ def Annulus(
     if cellSizeOuter is None:
         cellSizeOuter = cellSize
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         gmsh.initialize()
@@ -1562,7 +1669,7 @@ def Annulus(
         return coords
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         useMultipleTags=True,
@@ -1576,6 +1683,8 @@ def Annulus(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = new_mesh.CoordinateSystem.unit_e_0
         Upper = new_mesh.CoordinateSystem.unit_e_0
@@ -1667,13 +1776,16 @@ def SegmentofAnnulus(
         Right = 4
         Centre = 10
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f"uw_SegmentOfAnnulus_ro{radiusOuter}_ri{radiusInner}_extent{angleExtent}_csize{cellSize}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_SegmentOfAnnulus",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInner=radiusInner,
+        angleExtent=angleExtent,
+        cellSize=cellSize,
+        centre=centre,
+    )
+    uw_filename = mesh_cache.msh_file
 
     # error checks
     if radiusInner <= 0 or not (0 < angleExtent < 180):
@@ -1683,7 +1795,7 @@ def SegmentofAnnulus(
             "and angleExtent must be within the range (0, 180)."
         )
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         gmsh.initialize()
@@ -1820,7 +1932,7 @@ def SegmentofAnnulus(
         return coords
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         useMultipleTags=True,
@@ -1834,6 +1946,8 @@ def SegmentofAnnulus(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = new_mesh.CoordinateSystem.unit_e_0
         Upper = new_mesh.CoordinateSystem.unit_e_0
@@ -1867,18 +1981,22 @@ def AnnulusWithSpokes(
         Centre = 1
         Spokes = 99
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_annulus_ro{radiusOuter}_ri{radiusInner}_csize{cellSizeOuter}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_annulus_spokes",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInner=radiusInner,
+        cellSizeOuter=cellSizeOuter,
+        cellSizeInner=cellSizeInner,
+        centre=centre,
+        spokes=spokes,
+    )
+    uw_filename = mesh_cache.msh_file
 
     if cellSizeInner is None:
         cellSizeInner = cellSizeOuter
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         gmsh.initialize()
@@ -2087,6 +2205,8 @@ def AnnulusWithSpokes(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = new_mesh.CoordinateSystem.unit_e_0 * sympy.Piecewise(
             (1.0, new_mesh.CoordinateSystem.R[0] < 1.01 * radiusInner),
@@ -2134,15 +2254,21 @@ def AnnulusInternalBoundary(
     if cellSize_Internal is None:
         cellSize_Internal = cellSize
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_annulus_internalBoundary_rO{radiusOuter}rInt{radiusInternal}_rI{radiusInner}_csize{cellSize}_csizefs{cellSize_Outer}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_annulus_internalBoundary",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInternal=radiusInternal,
+        radiusInner=radiusInner,
+        cellSize=cellSize,
+        cellSize_Outer=cellSize_Outer,
+        cellSize_Inner=cellSize_Inner,
+        cellSize_Internal=cellSize_Internal,
+        centre=centre,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         gmsh.initialize()
@@ -2291,7 +2417,7 @@ def AnnulusInternalBoundary(
         return
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         useMultipleTags=True,
@@ -2305,6 +2431,8 @@ def AnnulusInternalBoundary(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = new_mesh.CoordinateSystem.unit_e_0
         Upper = new_mesh.CoordinateSystem.unit_e_0
@@ -2351,15 +2479,21 @@ def DiscInternalBoundaries(
     if cellSize_Centre is None:
         cellSize_Centre = cellSize
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-
-        uw_filename = f".meshes/uw_disc_internalBoundaries_rO{radiusUpper}rInt{radiusInternal}_rI{radiusLower}_csize{cellSize}_csizefs{cellSize_Upper}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_disc_internalBoundaries",
+        filename,
+        radiusUpper=radiusUpper,
+        radiusInternal=radiusInternal,
+        radiusLower=radiusLower,
+        cellSize=cellSize,
+        cellSize_Upper=cellSize_Upper,
+        cellSize_Lower=cellSize_Lower,
+        cellSize_Internal=cellSize_Internal,
+        cellSize_Centre=cellSize_Centre,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         gmsh.initialize()
@@ -2500,7 +2634,7 @@ def DiscInternalBoundaries(
         return
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         useMultipleTags=True,
@@ -2514,6 +2648,8 @@ def DiscInternalBoundaries(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = new_mesh.CoordinateSystem.unit_e_0
         Upper = new_mesh.CoordinateSystem.unit_e_0
@@ -2552,14 +2688,17 @@ def CubedSphere(
     r1 = radiusInner / np.sqrt(3)
     r2 = radiusOuter / np.sqrt(3)
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_cubed_spherical_shell_ro{radiusOuter}_ri{radiusInner}_elts{numElements}_plex{simplex}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_cubed_spherical_shell",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInner=radiusInner,
+        numElements=numElements,
+        simplex=simplex,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         gmsh.initialize()
@@ -2719,7 +2858,7 @@ def CubedSphere(
         return
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         useMultipleTags=True,
@@ -2734,6 +2873,8 @@ def CubedSphere(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = new_mesh.CoordinateSystem.unit_e_0
         Upper = new_mesh.CoordinateSystem.unit_e_0
@@ -2773,14 +2914,17 @@ def RegionalSphericalBox(
     r1 = radiusInner / np.sqrt(3)
     r2 = radiusOuter / np.sqrt(3)
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_cubed_spherical_shell_ro{radiusOuter}_ri{radiusInner}_elts{numElements}_plex{simplex}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_regional_spherical_box",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInner=radiusInner,
+        numElements=numElements,
+        simplex=simplex,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         gmsh.initialize()
@@ -2930,7 +3074,7 @@ def RegionalSphericalBox(
         return
 
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         useMultipleTags=True,
@@ -2945,6 +3089,8 @@ def RegionalSphericalBox(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = sympy.UnevaluatedExpr(
             new_mesh.CoordinateSystem.unit_e_0
@@ -2983,14 +3129,16 @@ def SegmentedSphericalSurface2D(
     num_segments = numSegments
     meshRes = cellSize
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_segmented_spherical_surface_r{radius}_csize{cellSize}_segs{num_segments}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_segmented_spherical_surface",
+        filename,
+        radius=radius,
+        cellSize=cellSize,
+        numSegments=numSegments,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         options = PETSc.Options()
@@ -3120,6 +3268,8 @@ def SegmentedSphericalSurface2D(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     #### May have been causing the script to hang - BK
 
     # # This may not be needed
@@ -3161,14 +3311,18 @@ def SegmentedSphericalShell(
     else:
         coordinate_system = CoordinateSystemType.SPHERICAL
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_segmented_sphere_ro{radiusOuter}_ri{radiusInner}_csize{cellSize}_segs{num_segments}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_segmented_sphere",
+        filename,
+        radiusOuter=radiusOuter,
+        radiusInner=radiusInner,
+        cellSize=cellSize,
+        numSegments=numSegments,
+        coordinatesNative=coordinatesNative,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         options = PETSc.Options()
@@ -3514,6 +3668,8 @@ def SegmentedSphericalShell(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Lower = sympy.UnevaluatedExpr(
             new_mesh.CoordinateSystem.unit_e_0
@@ -3566,14 +3722,17 @@ def SegmentedSphericalBall(
     else:
         coordinate_system = CoordinateSystemType.SPHERICAL
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        uw_filename = f".meshes/uw_segmented_ball_ro{radius}_csize{cellSize}_segs{num_segments}.msh"
-    else:
-        uw_filename = filename
+    mesh_cache = _MeshCache(
+        "uw_segmented_ball",
+        filename,
+        radius=radius,
+        cellSize=cellSize,
+        numSegments=numSegments,
+        coordinatesNative=coordinatesNative,
+    )
+    uw_filename = mesh_cache.msh_file
 
-    if uw.mpi.rank == 0:
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
 
         options = PETSc.Options()
@@ -3885,6 +4044,8 @@ def SegmentedSphericalBall(
         verbose=verbose,
     )
 
+    mesh_cache.store()
+
     class boundary_normals(Enum):
         Upper = sympy.UnevaluatedExpr(
             new_mesh.CoordinateSystem.unit_e_0
@@ -3971,19 +4132,27 @@ def BoxInternalBoundary(
     
     dim = len(minCoords)
 
-    if filename is None:
-        if uw.mpi.rank == 0:
-            os.makedirs(".meshes", exist_ok=True)
-        if not simplex:
-            # structuredQuadBoxIB
-            uw_filename = (f".meshes/uw_sqbIB_minC{minCoords}_maxC{maxCoords}.msh")
-        else:
-            uw_filename = (f".meshes/uw_usbIB_minC{minCoords}_maxC{maxCoords}.msh")
+    if dim == 2:
+        boundaries = boundaries_2D
+        boundary_normals = boundary_normals_2D
     else:
-        uw_filename = filename
-         
-        
-    if uw.mpi.rank == 0:
+        boundaries = boundaries_3D
+        boundary_normals = boundary_normals_3D
+
+    mesh_cache = _MeshCache(
+        "uw_sqbIB" if not simplex else "uw_usbIB",
+        filename,
+        elementRes=elementRes,
+        zelementRes=zelementRes,
+        cellSize=cellSize,
+        minCoords=minCoords,
+        maxCoords=maxCoords,
+        zintCoord=zintCoord,
+        simplex=simplex,
+    )
+    uw_filename = mesh_cache.msh_file
+
+    if uw.mpi.rank == 0 and not mesh_cache.cached:
         import gmsh
         gmsh.initialize()
         gmsh.option.setNumber("General.Verbosity", gmsh_verbosity)
@@ -3993,8 +4162,6 @@ def BoxInternalBoundary(
             xmin, ymin = minCoords
             xmax, ymax = maxCoords
             yint = zintCoord
-            boundaries = boundaries_2D
-            boundary_normals = boundary_normals_2D
     
             if not simplex:
                 cellSize = 0.0       
@@ -4070,8 +4237,6 @@ def BoxInternalBoundary(
             xmin, ymin, zmin = minCoords
             xmax, ymax, zmax = maxCoords
             zint = zintCoord
-            boundaries = boundaries_3D
-            boundary_normals = boundary_normals_3D
             
             if not simplex:
                 cellSize = 0.0   
@@ -4252,7 +4417,7 @@ def BoxInternalBoundary(
         return coords
     
     new_mesh = Mesh(
-        uw_filename,
+        mesh_cache.mesh_file,
         degree=degree,
         qdegree=qdegree,
         boundaries=boundaries,
@@ -4265,5 +4430,6 @@ def BoxInternalBoundary(
         refinement_callback=None,
         return_coords_to_bounds=box_return_coords_to_bounds,
         verbose=verbose,)
+    mesh_cache.store()
     uw.adaptivity._dm_unstack_bcs(new_mesh.dm, new_mesh.boundaries, "Face Sets") 
     return new_mesh
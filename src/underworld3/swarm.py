@@ -37,6 +37,300 @@ class SwarmPICLayout(Enum):
     SUBDIVISION = 2
 
 
+# Explicit Runge-Kutta coefficients (Butcher tableaux) for swarm advection.
+# The velocity field is frozen over the step so only the stage weights a_ij
+# and the quadrature weights b_i are needed. The adaptive scheme is the
+# Bogacki-Shampine 3(2) pair with its embedded second order weights.
+
+_rk_tableaux = {
+    3: {
+        "a": [[], [1 / 2], [-1.0, 2.0]],
+        "b": [1 / 6, 2 / 3, 1 / 6],
+    },
+    4: {
+        "a": [[], [1 / 2], [0.0, 1 / 2], [0.0, 0.0, 1.0]],
+        "b": [1 / 6, 1 / 3, 1 / 3, 1 / 6],
+    },
+    "adaptive": {
+        "a": [[], [1 / 2], [0.0, 3 / 4], [2 / 9, 1 / 3, 4 / 9]],
+        "b": [2 / 9, 1 / 3, 4 / 9, 0.0],
+        "b_embedded": [7 / 24, 1 / 4, 1 / 3, 1 / 8],
+        "order": 3,
+    },
+}
+
+
+class _StagePoints:
+    """
+    Evaluate an expression at points that do not necessarily lie in the local
+    part of the mesh (e.g. the Runge-Kutta stage positions of the particles).
+    The points are migrated to the processes that own them in a temporary
+    DMSwarm, evaluated there and migrated back to the processes that
+    requested them (the same approach as the semi-Lagrangian nodal swarm).
+    Points that are not in the domain are not evaluated (their values are NaN).
+    """
+
+    def __init__(self, swarm, num_components):
+        self.mesh = swarm.mesh
+        self.dim = swarm.dim
+        self.num_components = num_components
+
+        self.dm = PETSc.DMSwarm().create()
+        self.dm.setDimension(self.dim)
+        self.dm.setType(SwarmType.DMSWARM_PIC.value)
+        self.dm.setCellDM(swarm.celldm)
+        self.dm.registerField("uw_stage_index", 1, dtype=PETSc.IntType)
+        self.dm.registerField("uw_stage_rank", 1, dtype=PETSc.IntType)
+        self.dm.registerField(
+            "uw_stage_values", num_components, dtype=PETSc.ScalarType
+        )
+        self.dm.finalizeFieldRegister()
+
+    def evaluate_components(self, fn_matrix, X, evalf=False):
+        """
+        `uw.function.evaluate_components(fn_matrix, X)` for the local points `X`
+        (collective). The rows of points outside the domain are NaN.
+        """
+
+        dm = self.dm
+        npoints = X.shape[0]
+
+        # Send the points to the processes that own them
+
+        dm.setLocalSizes(npoints, 0)
+
+        coords = dm.getField("DMSwarmPIC_coor").reshape((-1, self.dim))
+        cellid = dm.getField("DMSwarm_cellid")
+        index = dm.getField("uw_stage_index")
+        ranks = dm.getField("uw_stage_rank")
+
+        coords[...] = X[...]
+        if npoints > 0:
+            cellid[:] = self.mesh.get_closest_cells(X).reshape(-1)
+        index[:] = np.arange(npoints)
+        ranks[:] = uw.mpi.rank
+
+        dm.restoreField("uw_stage_rank")
+        dm.restoreField("uw_stage_index")
+        dm.restoreField("DMSwarm_cellid")
+        dm.restoreField("DMSwarmPIC_coor")
+
+        dm.migrate(remove_sent_points=True)
+
+        # Evaluate on the owning process (points that were not located
+        # anywhere are dropped by the migration or have no cell)
+
+        coords = dm.getField("DMSwarmPIC_coor").reshape((-1, self.dim))
+        cellid = dm.getField("DMSwarm_cellid")
+        values = dm.getField("uw_stage_values").reshape((-1, self.num_components))
+        located = cellid >= 0
+        values[...] = np.nan
+        if np.any(located):
+            values[located] = uw.function.evaluate_components(
+                fn_matrix, np.ascontiguousarray(coords[located]), evalf=evalf
+            )
+        dm.restoreField("uw_stage_values")
+        dm.restoreField("DMSwarm_cellid")
+        dm.restoreField("DMSwarmPIC_coor")
+
+        # And return the values to the processes that requested them
+
+        orig_ranks = dm.getField("uw_stage_rank")
+        point_ranks = dm.getField("DMSwarm_rank")
+        point_ranks[...] = orig_ranks[...]
+        dm.restoreField("DMSwarm_rank")
+        dm.restoreField("uw_stage_rank")
+
+        mig_type = uw.function.dm_swarm_get_migrate_type(self)
+        uw.function.dm_swarm_set_migrate_type(
+            self, PETSc.DMSwarm.MigrateType.MIGRATE_BASIC
+        )
+        dm.migrate(remove_sent_points=True)
+        uw.function.dm_swarm_set_migrate_type(self, mig_type)
+
+        # Points arrive in any order - put them back in place
+
+        index = dm.getField("uw_stage_index")
+        values = dm.getField("uw_stage_values").reshape((-1, self.num_components))
+
+        result = np.full((npoints, self.num_components), np.nan)
+        result[index.reshape(-1), :] = values[...]
+
+        dm.restoreField("uw_stage_values")
+        dm.restoreField("uw_stage_index")
+
+        return result
+
+
+def _reduce_to_nodes(nodes, weights, num_nodes, values=None, bins=None, num_bins=1):
+    """
+    Weighted sums of particle contributions on mesh nodes in a single pass.
+
+    Each particle contributes `weights` to the node `nodes`. With `values`
+    (n_particles, n_components) the weighted values are summed for every
+    component; with `bins` (integers in [0, num_bins)) the weights are summed
+    into the column given by `bins` (e.g. a material index). Returns the
+    (num_nodes, n_components or num_bins) sums and the total weight of each node.
+    """
+
+    node_weights = np.bincount(nodes, weights=weights, minlength=num_nodes)
+
+    if values is not None:
+        num_bins = values.shape[1]
+        index = (nodes.reshape(-1, 1) * num_bins + np.arange(num_bins)).reshape(-1)
+        node_sums = np.bincount(
+            index,
+            weights=(weights.reshape(-1, 1) * values).reshape(-1),
+            minlength=num_nodes * num_bins,
+        )
+    else:
+        node_sums = np.bincount(
+            nodes * num_bins + bins, weights=weights, minlength=num_nodes * num_bins
+        )
+
+    return node_sums.reshape(num_nodes, num_bins), node_weights
+
+
+def _local_rows(num_rows):
+    """
+    The contiguous block of rows [start, end) of a distributed dataset that
+    this rank is responsible for reading (the rows are divided evenly).
+    """
+
+    start = (num_rows * comm.rank) // comm.size
+    end = (num_rows * (comm.rank + 1)) // comm.size
+
+    return start, end
+
+
+def _distribute_to_owners(mesh, coords, *arrays):
+    """
+    Send each point in `coords` (and the matching rows of `arrays`) to every
+    rank whose local mesh bounding box contains it. The points read by one rank
+    can then be located / added on the ranks that own them without every rank
+    having to read all of the points. Returns the received coordinates followed
+    by the received arrays (all 2D). Collective.
+    """
+
+    coords = np.ascontiguousarray(coords).reshape(-1, mesh.dim)
+    # (the number of components is explicit, a rank may have no points)
+    arrays = [np.asarray(a) for a in arrays]
+    arrays = [a.reshape(coords.shape[0], int(np.prod(a.shape[1:]))) for a in arrays]
+
+    if comm.size == 1:
+        return (coords, *arrays)
+
+    # local domain bounding box (padded a little so that points on the
+    # partition boundaries are sent to all the candidate owners)
+
+    local_vertices = mesh.data[:, : mesh.dim]
+    if local_vertices.shape[0] > 0:
+        lo = local_vertices.min(axis=0)
+        hi = local_vertices.max(axis=0)
+        pad = 0.01 * np.max(hi - lo)
+        lo, hi = lo - pad, hi + pad
+    else:
+        lo = np.full(mesh.dim, np.inf)
+        hi = np.full(mesh.dim, -np.inf)
+
+    boxes = comm.allgather((lo, hi))
+
+    send_index = [
+        np.where(np.all((coords >= box_lo) & (coords <= box_hi), axis=1))[0]
+        for box_lo, box_hi in boxes
+    ]
+    send_counts = np.array([len(i) for i in send_index], dtype=np.int64)
+    recv_counts = np.empty_like(send_counts)
+    comm.Alltoall(send_counts, recv_counts)
+
+    send_index = np.concatenate(send_index)
+
+    def exchange(values):
+        ncomp = values.shape[1]
+        send = np.ascontiguousarray(values[send_index])
+        recv = np.empty((recv_counts.sum(), ncomp), dtype=values.dtype)
+        comm.Alltoallv(
+            [send, (send_counts * ncomp).tolist()],
+            [recv, (recv_counts * ncomp).tolist()],
+        )
+        return recv
+
+    return tuple(exchange(values) for values in (coords, *arrays))
+
+
+def _write_swarm_xdmf(output_base_name, index, field_names=None, time=None):
+    """
+    Combine the swarm coordinate and swarm variable h5 files written by
+    `Swarm.write_timestep` into a single xdmf file (call on one proc only).
+    """
+
+    with open(f"{output_base_name}.{index:05d}.xdmf", "w") as xdmf:
+        # Write the XDMF header
+        xdmf.write('<?xml version="1.0" ?>\n')
+        xdmf.write('<Xdmf xmlns:xi="http://www.w3.org/2001/XInclude" Version="2.0">\n')
+        xdmf.write("<Domain>\n")
+        xdmf.write(f'<Grid Name="{output_base_name}.{index:05d}" GridType="Uniform">\n')
+
+        if time != None:
+            xdmf.write(f'	<Time Value="{time}" />\n')
+
+        # Write the grid element for the HDF5 dataset
+        with h5py.File(f"{output_base_name}.{index:05}.h5", "r") as h5f:
+            xdmf.write(
+                f'	<Topology Type="POLYVERTEX" NodesPerElement="{h5f["coordinates"].shape[0]}"> </Topology>\n'
+            )
+            if h5f["coordinates"].shape[1] == 2:
+                xdmf.write('		<Geometry Type="XY">\n')
+            elif h5f["coordinates"].shape[1] == 3:
+                xdmf.write('		<Geometry Type="XYZ">\n')
+            xdmf.write(
+                f'			<DataItem Format="HDF" NumberType="Float" Precision="8" Dimensions="{h5f["coordinates"].shape[0]} {h5f["coordinates"].shape[1]}">{os.path.basename(h5f.filename)}:/coordinates</DataItem>\n'
+            )
+            xdmf.write("		</Geometry>\n")
+
+        # Write the attribute element for the field
+        if field_names != None:
+            for field_name in field_names:
+                with h5py.File(f"{output_base_name}.{field_name}.{index:05d}.h5", "r") as h5f:
+                    if h5f["data"].dtype == np.int32:
+                        xdmf.write(
+                            f'	<Attribute Type="Scalar" Center="Node" Name="{field_name}">\n'
+                        )
+                        xdmf.write(
+                            f'			<DataItem Format="HDF" NumberType="Int" Precision="4" Dimensions="{h5f["data"].shape[0]} {h5f["data"].shape[1]}">{os.path.basename(h5f.filename)}:/data</DataItem>\n'
+                        )
+                    elif h5f["data"].shape[1] == 1:
+                        xdmf.write(
+                            f'	<Attribute Type="Scalar" Center="Node" Name="{field_name}">\n'
+                        )
+                        xdmf.write(
+                            f'			<DataItem Format="HDF" NumberType="Float" Precision="8" Dimensions="{h5f["data"].shape[0]} {h5f["data"].shape[1]}">{os.path.basename(h5f.filename)}:/data</DataItem>\n'
+                        )
+                    elif h5f["data"].shape[1] == 2 or h5f["data"].shape[1] == 3:
+                        xdmf.write(
+                            f'	<Attribute Type="Vector" Center="Node" Name="{field_name}">\n'
+                        )
+                        xdmf.write(
+                            f'			<DataItem Format="HDF" NumberType="Float" Precision="8" Dimensions="{h5f["data"].shape[0]} {h5f["data"].shape[1]}">{os.path.basename(h5f.filename)}:/data</DataItem>\n'
+                        )
+                    else:
+                        xdmf.write(
+                            f'	<Attribute Type="Tensor" Center="Node" Name="{field_name}">\n'
+                        )
+                        xdmf.write(
+                            f'			<DataItem Format="HDF" NumberType="Float" Precision="8" Dimensions="{h5f["data"].shape[0]} {h5f["data"].shape[1]}">{os.path.basename(h5f.filename)}:/data</DataItem>\n'
+                        )
+
+                    xdmf.write("	</Attribute>\n")
+        else:
+            pass
+
+        # Write the XDMF footer
+        xdmf.write("</Grid>\n")
+        xdmf.write("</Domain>\n")
+        xdmf.write("</Xdmf>\n")
+
+
 # Note - much of the setup is necessarily the same as the MeshVariable
 # and the duplication should be removed.
 
@@ -170,6 +464,8 @@ class SwarmVariable(Stateful, uw_object):
             )
 
         self._data = None
+        self._read_only_view = None
+        self._read_only_view_key = None
         # add to swarms dict
 
         self.swarm._vars[self.clean_name] = self
@@ -181,6 +477,7 @@ class SwarmVariable(Stateful, uw_object):
         self._proxy_degree = proxy_degree
         self._proxy_continuous = proxy_continuous
         self._nn_proxy = _nn_proxy
+        self._proxy_stale = False
         self._create_proxy_variable()
 
         # recycle swarm
@@ -268,6 +565,8 @@ class SwarmVariable(Stateful, uw_object):
         swarm & particle variable state.
         """
 
+        self._proxy_stale = False
+
         # if not proxied, nothing to do. return.
         if not self._meshVar:
             return
@@ -315,7 +614,8 @@ class SwarmVariable(Stateful, uw_object):
             1) for each particle, create a distance-weighted average on the node data
             2) check to see which nodes have zero weight / zero contribution and replace with nearest particle value
 
-        Todo: caching the k-d trees etc for the proxy-mesh-variable nodal points
+        The nodal k-d tree and the particle-to-node map are cached on the swarm.
+
         Todo: some form of global fall-back for when there are no particles on a processor
 
         """
@@ -326,25 +626,22 @@ class SwarmVariable(Stateful, uw_object):
 
         # 1 - Average particles to nodes with distance weighted average
 
-        kd = uw.kdtree.KDTree(meshVar.coords)
-        kd.build_index()
-
-        with self.swarm.access():
-            n, d, b = kd.find_closest_point(self.swarm.data)
+        (n, d, b), num_nodes = self.swarm._get_particle_node_map(meshVar)
 
-            node_values = np.zeros((meshVar.coords.shape[0], self.num_components))
-            w = np.zeros(meshVar.coords.shape[0])
-
-            if not self._nn_proxy:
-                for i in range(self.data.shape[0]):
-                    if b[i]:
-                        node_values[n[i], :] += self.data[i, :] / (1.0e-24 + d[i])
-                        w[n[i]] += 1.0 / (1.0e-24 + d[i])
-
-                node_values[np.where(w > 0.0)[0], :] /= w[np.where(w > 0.0)[0]].reshape(
-                    -1, 1
+        if not self._nn_proxy:
+            with self.swarm.access(readable_vars=[self]):
+                node_values, w = _reduce_to_nodes(
+                    n[b].astype(np.int64),
+                    1.0 / (1.0e-24 + d[b]),
+                    num_nodes,
+                    values=self.data[b],
                 )
 
+            node_values[w > 0.0, :] /= w[w > 0.0].reshape(-1, 1)
+        else:
+            node_values = np.zeros((num_nodes, self.num_components))
+            w = np.zeros(num_nodes)
+
         # 2 - set NN vals on mesh var where w == 0.0
 
         p_nnmap = self.swarm._get_map(self)
@@ -377,23 +674,22 @@ class SwarmVariable(Stateful, uw_object):
         if nnn > data_size[0]:
             nnn = data_size[0]
 
-        with self.swarm.access():
-            if self.swarm.recycle_rate > 1:
-                not_remeshed = self.swarm._remeshed.data[:, 0] != 0
-                D = self.data[not_remeshed].copy()
+        # The particle kd-tree is cached on the swarm and only rebuilt
+        # when the particles move
 
-                kdt = uw.kdtree.KDTree(
-                    self.swarm.particle_coordinates.data[not_remeshed, :]
-                )
-            else:
-                D = self.data.copy()
-                kdt = uw.kdtree.KDTree(self.swarm.particle_coordinates.data[:, :])
+        kdt, not_remeshed = self.swarm._get_kdtree(
+            exclude_remeshed=self.swarm.recycle_rate > 1
+        )
 
-            kdt.build_index()
+        with self.swarm.access():
+            if not_remeshed is not None:
+                D = self.data[not_remeshed]
+            else:
+                D = self.data
 
             values = kdt.rbf_interpolator_local(new_coords, D, nnn, verbose)
 
-            del kdt
+            del D
 
         return values
 
@@ -405,6 +701,40 @@ class SwarmVariable(Stateful, uw_object):
             )
         return self._data
 
+    def read_only_view(self):
+        """
+        A read-only numpy array of the variable's local particle data that can be
+        used outside of the swarm `access()` context. The DMSwarm storage is
+        re-allocated when the particles are migrated, added or removed so this is
+        a copy of the data. The copy is cached until the variable is written to
+        or the particles change (so repeated calls are cheap) and it is never
+        modified: a new array is returned once the data have changed.
+        """
+
+        if self._is_accessed:
+            # The data may still be changed within this access context
+            view = self._data.copy()
+            view.flags.writeable = False
+            return view
+
+        key = (
+            self.swarm._get_state(),
+            self._get_state(),
+            self.swarm.dm.getLocalSize(),
+        )
+
+        if self._read_only_view is None or self._read_only_view_key != key:
+            view = self.swarm.dm.getField(self.clean_name).reshape(
+                (-1, self.num_components)
+            ).copy()
+            self.swarm.dm.restoreField(self.clean_name)
+
+            view.flags.writeable = False
+            self._read_only_view = view
+            self._read_only_view_key = key
+
+        return self._read_only_view
+
     @property
     def sym(self):
         return self._meshVar.sym
@@ -439,7 +769,7 @@ class SwarmVariable(Stateful, uw_object):
         """
         if h5py.h5.get_config().mpi == False and comm.size > 1 and comm.rank == 0:
             warnings.warn(
-                "Collective IO not possible as h5py not available in parallel mode. Switching to sequential. This will be slow for models running on multiple processors",
+                "Collective IO not possible as h5py not available in parallel mode. Switching to one writer per node. This will be slow for models running on many nodes",
                 stacklevel=2,
             )
         if compression == True and comm.rank == 0:
@@ -447,44 +777,14 @@ class SwarmVariable(Stateful, uw_object):
         if filename.endswith(".h5") == False:
             raise RuntimeError("The filename must end with .h5")
 
-        if h5py.h5.get_config().mpi == True and not force_sequential:
-            with h5py.File(f"{filename[:-3]}.h5", "w", driver="mpio", comm=comm) as h5f:
-                with self.swarm.access(self):
-                    if compression == True:
-                        h5f.create_dataset(
-                            "data", data=self.data[:], compression=compressionType
-                        )
-                    else:
-                        h5f.create_dataset("data", data=self.data[:])
-        else:
-            with self.swarm.access(self):
-                if comm.rank == 0:
-                    with h5py.File(f"{filename[:-3]}.h5", "w") as h5f:
-                        if compression == True:
-                            h5f.create_dataset(
-                                "data",
-                                data=self.data[:],
-                                chunks=True,
-                                maxshape=(None, self.data.shape[1]),
-                                compression=compressionType,
-                            )
-                        else:
-                            h5f.create_dataset(
-                                "data",
-                                data=self.data[:],
-                                chunks=True,
-                                maxshape=(None, self.data.shape[1]),
-                            )
-                comm.barrier()
-                for proc in range(1, comm.size):
-                    if comm.rank == proc:
-                        with h5py.File(f"{filename[:-3]}.h5", "a") as h5f:
-                            h5f["data"].resize(
-                                (h5f["data"].shape[0] + self.data.shape[0]), axis=0
-                            )
-                            h5f["data"][-self.data.shape[0] :] = self.data[:]
-                    comm.barrier()
-                comm.barrier()
+        uw.utilities.h5_write_distributed(
+            f"{filename[:-3]}.h5",
+            "data",
+            self.read_only_view(),
+            compression=compression,
+            compressionType=compressionType,
+            force_sequential=force_sequential,
+        )
 
         return
 
@@ -527,35 +827,43 @@ class SwarmVariable(Stateful, uw_object):
         else:
             raise RuntimeError(f"{os.path.abspath(filename)} does not exist")
 
-        ### open up file with coords on all procs and open up data on all procs. May be problematic for large problems.
+        # Each rank reads one block of the particles (and their data) and sends
+        # them to the ranks that might own them.
+
         with h5py.File(f"{filename}", "r") as h5f_data, h5py.File(
             f"{swarmFilename}", "r"
         ) as h5f_swarm:
-            with self.swarm.access(self):
-                var_dtype = self.data.dtype
-                file_dtype = h5f_data["data"][:].dtype
-                file_length = h5f_data["data"][:].shape[0]
-
-                if var_dtype != file_dtype:
-                    if comm.rank == 0:
-                        warnings.warn(
-                            f"{os.path.basename(filename)} dtype ({file_dtype}) does not match {self.name} swarm variable dtype ({var_dtype}) which may result in a loss of data.",
-                            stacklevel=2,
-                        )
+            file_dtype = h5f_data["data"].dtype
+            start, end = _local_rows(h5f_swarm["coordinates"].shape[0])
+            file_coords = h5f_swarm["coordinates"][start:end]
+            file_data = h5f_data["data"][start:end]
+
+        file_coords, file_data = _distribute_to_owners(
+            self.swarm.mesh, file_coords, file_data
+        )
 
-                # First work out which are local points and ignore the rest
-                # This might help speed up the load by dropping lots of particles
+        # Now work out which are local points and ignore the rest
 
-                all_coords = h5f_swarm["coordinates"][()]
-                all_data = h5f_data["data"][()]
+        if file_coords.shape[0] > 0:
+            cell = self.swarm.mesh.get_closest_local_cells(file_coords)
+            local = np.where(cell >= 0)[0]
+        else:
+            local = np.empty(0, dtype=int)
 
-                cell = self.swarm.mesh.get_closest_local_cells(all_coords)
-                local = np.where(cell >= 0)[0]
-                # not_not_local = np.where(cell == -1)[0]
+        local_coords = file_coords[local]
+        local_data = file_data[local]
 
-                local_coords = all_coords[local]
-                local_data = all_data[local]
+        with self.swarm.access(self):
+            var_dtype = self.data.dtype
 
+            if var_dtype != file_dtype:
+                if comm.rank == 0:
+                    warnings.warn(
+                        f"{os.path.basename(filename)} dtype ({file_dtype}) does not match {self.name} swarm variable dtype ({var_dtype}) which may result in a loss of data.",
+                        stacklevel=2,
+                    )
+
+            if local_coords.shape[0] > 0 and self.data.shape[0] > 0:
                 kdt = uw.kdtree.KDTree(local_coords)
 
                 self.data[:] = kdt.rbf_interpolator_local(
@@ -697,32 +1005,45 @@ class IndexSwarmVariable(SwarmVariable):
 
         """
 
-        kd = uw.kdtree.KDTree(self._meshLevelSetVars[0].coords)
-        kd.build_index()
+        self._proxy_stale = False
 
-        for ii in range(self.indices):
-            meshVar = self._meshLevelSetVars[ii]
+        # 1 - Average particles to nodes with distance weighted average, all
+        # the indices are accumulated together (one pass over the particles)
 
-            # 1 - Average particles to nodes with distance weighted average
-            with self.swarm.mesh.access(meshVar), self.swarm.access():
-                n, d, b = kd.find_closest_point(self.swarm.data)
+        (n, d, b), num_nodes = self.swarm._get_particle_node_map(
+            self._meshLevelSetVars[0]
+        )
 
-                node_values = np.zeros((meshVar.data.shape[0],))
-                w = np.zeros((meshVar.data.shape[0],))
+        with self.swarm.access(readable_vars=[self]):
+            index = np.rint(self.data[:, 0]).astype(np.int64)
+            valid = (
+                b
+                & np.isclose(self.data[:, 0], index)
+                & (index >= 0)
+                & (index < self.indices)
+            )
 
-                for i in range(self.data.shape[0]):
-                    if b[i]:
-                        node_values[n[i]] += np.isclose(self.data[i], ii) / (
-                            1.0e-16 + d[i]
-                        )
-                        w[n[i]] += 1.0 / (1.0e-16 + d[i])
+        node_values, w = _reduce_to_nodes(
+            n[valid].astype(np.int64),
+            1.0 / (1.0e-16 + d[valid]),
+            num_nodes,
+            bins=index[valid],
+            num_bins=self.indices,
+        )
 
-                node_values[np.where(w > 0.0)[0]] /= w[np.where(w > 0.0)[0]]
+        # The weights include all particles that were found (as before), not just
+        # those with a valid index
+        w = np.bincount(
+            n[b].astype(np.int64), weights=1.0 / (1.0e-16 + d[b]), minlength=num_nodes
+        )
+        node_values[w > 0.0, :] /= w[w > 0.0].reshape(-1, 1)
 
-            # 2 - set NN vals on mesh var where w == 0.0
+        # 2 - set NN vals on mesh var where w == 0.0
 
-            with self.swarm.mesh.access(meshVar), self.swarm.access():
-                meshVar.data[...] = node_values[...].reshape(-1, 1)
+        with self.swarm.mesh.access(*self._meshLevelSetVars):
+            for ii in range(self.indices):
+                meshVar = self._meshLevelSetVars[ii]
+                meshVar.data[...] = node_values[:, ii].reshape(-1, 1)
 
                 # Need to document this assumption, if there is no material found,
                 # assume the default material (0). An alternative would be to impose
@@ -826,6 +1147,9 @@ class Swarm(Stateful, uw_object):
         self._X0_uninitialised = True
         self._index = None
         self._nnmapdict = {}
+        self._kdtree_cache = {}
+        self._node_map_cache = {}
+        self._stage_points = None
 
         super().__init__()
 
@@ -1068,7 +1392,10 @@ class Swarm(Stateful, uw_object):
                 )
             )
 
-        cells = self.mesh.get_closest_local_cells(coordinatesArray)
+        if coordinatesArray.shape[0] > 0:
+            cells = self.mesh.get_closest_local_cells(coordinatesArray)
+        else:
+            cells = np.zeros(0, dtype=int)
 
         valid_coordinates = coordinatesArray[cells != -1]
         valid_cells = cells[cells != -1]
@@ -1101,6 +1428,7 @@ class Swarm(Stateful, uw_object):
                 self._remeshed.data[...] = 0
 
         self.dm.migrate(remove_sent_points=True)
+        self._increment()
 
         return npoints
 
@@ -1130,7 +1458,7 @@ class Swarm(Stateful, uw_object):
         """
         if h5py.h5.get_config().mpi == False and comm.size > 1 and comm.rank == 0:
             warnings.warn(
-                "Collective IO not possible as h5py not available in parallel mode. Switching to sequential. This will be slow for models running on multiple processors",
+                "Collective IO not possible as h5py not available in parallel mode. Switching to one writer per node. This will be slow for models running on many nodes",
                 stacklevel=2,
             )
         if filename.endswith(".h5") == False:
@@ -1138,68 +1466,18 @@ class Swarm(Stateful, uw_object):
         if compression == True and comm.rank == 0:
             warnings.warn("Compression may slow down write times", stacklevel=2)
 
-        if h5py.h5.get_config().mpi == True and not force_sequential:
-            # It seems to be a bad idea to mix mpi barriers with the access
-            # context manager so the copy-free version of this seems to hang
-            # when there are many active cores. This is probably why the parallel
-            # h5py write hangs
-
-            with self.access():
-                data_copy = self.data[:].copy()
-
-            with h5py.File(f"{filename[:-3]}.h5", "w", driver="mpio", comm=comm) as h5f:
-                if compression == True:
-                    h5f.create_dataset(
-                        "coordinates",
-                        data=data_copy[:],
-                        compression=compressionType,
-                    )
-                else:
-                    h5f.create_dataset("coordinates", data=data_copy[:])
-
-            del data_copy
-
-        else:
-            # It seems to be a bad idea to mix mpi barriers with the access
-            # context manager so the copy-free version of this seems to hang
-            # when there are many active cores
-
-            with self.access():
-                data_copy = self.data[:].copy()
-
-            if comm.rank == 0:
-                with h5py.File(f"{filename[:-3]}.h5", "w") as h5f:
-                    if compression == True:
-                        h5f.create_dataset(
-                            "coordinates",
-                            data=data_copy,
-                            chunks=True,
-                            maxshape=(None, data_copy.shape[1]),
-                            compression=compressionType,
-                        )
-                    else:
-                        h5f.create_dataset(
-                            "coordinates",
-                            data=data_copy,
-                            chunks=True,
-                            maxshape=(None, data_copy.shape[1]),
-                        )
-
-            comm.barrier()
-            for i in range(1, comm.size):
-                if comm.rank == i:
-                    with h5py.File(f"{filename[:-3]}.h5", "a") as h5f:
-                        h5f["coordinates"].resize(
-                            (h5f["coordinates"].shape[0] + data_copy.shape[0]),
-                            axis=0,
-                        )
-                        # passive swarm, zero local particles is not unusual
-                        if data_copy.shape[0] > 0:
-                            h5f["coordinates"][-data_copy.shape[0] :] = data_copy[:]
-                comm.barrier()
-            comm.barrier()
-
-            del data_copy
+        # The read-only view avoids copying the coordinates and is used outside
+        # the access context manager (mixing mpi barriers with the access
+        # context manager seems to be a bad idea when there are many active cores)
+
+        uw.utilities.h5_write_distributed(
+            f"{filename[:-3]}.h5",
+            "coordinates",
+            self.particle_coordinates.read_only_view(),
+            compression=compression,
+            compressionType=compressionType,
+            force_sequential=force_sequential,
+        )
 
         return
 
@@ -1214,11 +1492,16 @@ class Swarm(Stateful, uw_object):
         output_base_name = os.path.join(outputPath, base_filename)
         swarm_file = output_base_name + f".{swarm_id}.{index:05}.h5"
 
-        ### open up file with coords on all procs
+        ### each proc reads a block of the coordinates and sends the particles
+        ### to the procs whose domain might contain them
         with h5py.File(f"{swarm_file}", "r") as h5f:
-            coordinates = h5f["coordinates"][:]
+            start, end = _local_rows(h5f["coordinates"].shape[0])
+            coordinates = h5f["coordinates"][start:end]
+
+        (coordinates,) = _distribute_to_owners(self.mesh, coordinates)
 
         #### utilises the UW function for adding a swarm by an array
+        #### (non-local particles are dropped, then one migration)
         self.add_particles_with_coordinates(coordinates)
 
         return
@@ -1347,83 +1630,18 @@ class Swarm(Stateful, uw_object):
 
         if uw.mpi.rank == 0:
             ### only need to combine the h5 files to a single xdmf on one proc
-            with open(f"{output_base_name}.{index:05d}.xdmf", "w") as xdmf:
-                # Write the XDMF header
-                xdmf.write('<?xml version="1.0" ?>\n')
-                xdmf.write(
-                    '<Xdmf xmlns:xi="http://www.w3.org/2001/XInclude" Version="2.0">\n'
-                )
-                xdmf.write("<Domain>\n")
-                xdmf.write(
-                    f'<Grid Name="{output_base_name}.{index:05d}" GridType="Uniform">\n'
-                )
-
-                if time != None:
-                    xdmf.write(f'	<Time Value="{time}" />\n')
-
-                # Write the grid element for the HDF5 dataset
-                with h5py.File(f"{output_base_name}.{index:05}.h5", "r") as h5f:
-                    xdmf.write(
-                        f'	<Topology Type="POLYVERTEX" NodesPerElement="{h5f["coordinates"].shape[0]}"> </Topology>\n'
-                    )
-                    if h5f["coordinates"].shape[1] == 2:
-                        xdmf.write('		<Geometry Type="XY">\n')
-                    elif h5f["coordinates"].shape[1] == 3:
-                        xdmf.write('		<Geometry Type="XYZ">\n')
-                    xdmf.write(
-                        f'			<DataItem Format="HDF" NumberType="Float" Precision="8" Dimensions="{h5f["coordinates"].shape[0]} {h5f["coordinates"].shape[1]}">{os.path.basename(h5f.filename)}:/coordinates</DataItem>\n'
-                    )
-                    xdmf.write("		</Geometry>\n")
-
-                # Write the attribute element for the field
-                if swarmVars != None:
-                    for field in swarmVars:
-                        with h5py.File(
-                            f"{output_base_name}.{field.name}.{index:05d}.h5", "r"
-                        ) as h5f:
-                            if h5f["data"].dtype == np.int32:
-                                xdmf.write(
-                                    f'	<Attribute Type="Scalar" Center="Node" Name="{field.name}">\n'
-                                )
-                                xdmf.write(
-                                    f'			<DataItem Format="HDF" NumberType="Int" Precision="4" Dimensions="{h5f["data"].shape[0]} {h5f["data"].shape[1]}">{os.path.basename(h5f.filename)}:/data</DataItem>\n'
-                                )
-                            elif h5f["data"].shape[1] == 1:
-                                xdmf.write(
-                                    f'	<Attribute Type="Scalar" Center="Node" Name="{field.name}">\n'
-                                )
-                                xdmf.write(
-                                    f'			<DataItem Format="HDF" NumberType="Float" Precision="8" Dimensions="{h5f["data"].shape[0]} {h5f["data"].shape[1]}">{os.path.basename(h5f.filename)}:/data</DataItem>\n'
-                                )
-                            elif h5f["data"].shape[1] == 2 or h5f["data"].shape[1] == 3:
-                                xdmf.write(
-                                    f'	<Attribute Type="Vector" Center="Node" Name="{field.name}">\n'
-                                )
-                                xdmf.write(
-                                    f'			<DataItem Format="HDF" NumberType="Float" Precision="8" Dimensions="{h5f["data"].shape[0]} {h5f["data"].shape[1]}">{os.path.basename(h5f.filename)}:/data</DataItem>\n'
-                                )
-                            else:
-                                xdmf.write(
-                                    f'	<Attribute Type="Tensor" Center="Node" Name="{field.name}">\n'
-                                )
-                                xdmf.write(
-                                    f'			<DataItem Format="HDF" NumberType="Float" Precision="8" Dimensions="{h5f["data"].shape[0]} {h5f["data"].shape[1]}">{os.path.basename(h5f.filename)}:/data</DataItem>\n'
-                                )
-
-                            xdmf.write("	</Attribute>\n")
-                else:
-                    pass
-
-                # Write the XDMF footer
-                xdmf.write("</Grid>\n")
-                xdmf.write("</Domain>\n")
-                xdmf.write("</Xdmf>\n")
+            _write_swarm_xdmf(
+                output_base_name,
+                index,
+                [field.name for field in swarmVars] if swarmVars != None else None,
+                time,
+            )
 
     @property
     def vars(self):
         return self._vars
 
-    def access(self, *writeable_vars: SwarmVariable):
+    def access(self, *writeable_vars: SwarmVariable, readable_vars=None):
         """
         This context manager makes the underlying swarm variables data available to
         the user. The data should be accessed via the variables `data` handle.
@@ -1440,6 +1658,11 @@ class Swarm(Stateful, uw_object):
         ----------
         writeable_vars
             The variables for which data write access is required.
+        readable_vars
+            If provided, only these variables (and the `writeable_vars`) are
+            made available, which makes short-lived accesses cheaper when the
+            swarm has many variables. Note that `swarm.data` requires the
+            `particle_coordinates` variable. See also `SwarmVariable.read_only_view`.
 
         Example
         -------
@@ -1461,6 +1684,15 @@ class Swarm(Stateful, uw_object):
             # if already accessed within higher level context manager, continue.
             if var._is_accessed == True:
                 continue
+
+            # lightweight access: only the named variables
+            if (
+                readable_vars is not None
+                and not var in writeable_vars
+                and not var in readable_vars
+            ):
+                continue
+
             # set flag so variable status can be known elsewhere
             var._is_accessed = True
             # add to de-access list to rewind this later
@@ -1511,6 +1743,18 @@ class Swarm(Stateful, uw_object):
                     var._data = None
                     self.em_swarm.dm.restoreField(var.clean_name)
                     var._is_accessed = False
+
+                    # the component views refer to the restored field
+                    if var._proxy:
+                        for i in range(0, var.shape[0]):
+                            for j in range(0, var.shape[1]):
+                                # var._data_ij[i, j] = None
+                                var._data_container[i, j] = var._data_container[
+                                    i, j
+                                ]._replace(
+                                    data=f"SwarmVariable[...].data is only available within mesh.access() context",
+                                )
+
                 # do particle migration if coords changes
 
                 if self.em_swarm.particle_coordinates in writeable_vars:
@@ -1544,25 +1788,24 @@ class Swarm(Stateful, uw_object):
                     # void these things too
                     self.em_swarm._index = None
                     self.em_swarm._nnmapdict = {}
+                    self.em_swarm._kdtree_cache = {}
+
+                    # the particle data has been moved (read-only views are stale)
+                    self.em_swarm._increment()
 
                 # do var updates
+                migrated = self.em_swarm.particle_coordinates in writeable_vars
                 for var in self.em_swarm.vars.values():
-                    # if swarm migrated, update all.
+                    # if swarm migrated, the proxies are rebuilt lazily (all
+                    # together) when the mesh data is next required.
                     # if var updated, update var.
-                    if (self.em_swarm.particle_coordinates in writeable_vars) or (
-                        var in writeable_vars
-                    ):
+                    if migrated:
+                        var._proxy_stale = True
+                    elif var in writeable_vars:
                         var._update()
 
-                    if var._proxy:
-                        for i in range(0, var.shape[0]):
-                            for j in range(0, var.shape[1]):
-                                # var._data_ij[i, j] = None
-                                var._data_container[i, j] = var._data_container[
-                                    i, j
-                                ]._replace(
-                                    data=f"SwarmVariable[...].data is only available within mesh.access() context",
-                                )
+                if migrated:
+                    self.em_swarm.mesh._register_stale_proxies(self.em_swarm)
 
                 uw.timing._decrementDepth()
                 uw.timing.log_result(time.time() - stime, "Swarm.access", 1)
@@ -1601,12 +1844,102 @@ class Swarm(Stateful, uw_object):
         if self.vtype == uw.VarType.MATRIX:
             return i + j * self.shape[0]
 
+    @timing.routine_timer_decorator
+    def _update_stale_proxies(self):
+        """
+        Rebuild the proxy mesh variables of all the swarm variables that were
+        marked stale when the particles were moved / migrated. This is called
+        by the mesh when its data is next required (access, solvers,
+        evaluation, output) so that the proxies are only recomputed once per
+        migration. All the stale variables are updated in one pass that shares
+        the particle kd-tree and particle-to-node map.
+        """
+
+        stale_vars = [var for var in self.vars.values() if var._proxy_stale]
+
+        if not stale_vars:
+            return
+
+        with self.access(readable_vars=stale_vars):
+            for var in stale_vars:
+                var._update()
+
+        return
+
+    @timing.routine_timer_decorator
+    def _get_kdtree(self, exclude_remeshed=False):
+        """
+        A kd-tree index of the local particle coordinates (optionally excluding the
+        recently remeshed particles of a recycling swarm). This is cached and only
+        rebuilt when the swarm state changes (particles moved, migrated or added).
+        Returns the tree and the boolean mask of the particles that it indexes
+        (`None` if it indexes all of them).
+        """
+
+        with self.access():
+            npoints = self.particle_coordinates.data.shape[0]
+            key = (self._get_state(), npoints)
+            if exclude_remeshed:
+                key += (self._remeshed._get_state(),)
+
+            cached = self._kdtree_cache.get(exclude_remeshed)
+            if cached is not None and cached[0] == key:
+                return cached[1], cached[2]
+
+            if exclude_remeshed:
+                mask = self._remeshed.data[:, 0] != 0
+                coords = np.ascontiguousarray(self.particle_coordinates.data[mask, :])
+            else:
+                mask = None
+                coords = self.particle_coordinates.data.copy()
+
+        kdt = uw.kdtree.KDTree(coords)
+        kdt.build_index()
+
+        self._kdtree_cache[exclude_remeshed] = (key, kdt, mask)
+
+        return kdt, mask
+
+    @timing.routine_timer_decorator
+    def _get_particle_node_map(self, meshVar):
+        """
+        The closest node of `meshVar` to each local particle (with the squared
+        distance and found flag). The node kd-tree is shared by all mesh variables
+        with the same discretisation and is cached until the mesh is deformed;
+        the map is cached until the particles move.
+        """
+
+        node_key = (meshVar.degree, meshVar.continuous)
+        cached = self._node_map_cache.get(node_key)
+
+        if cached is None or cached["mesh_state"] != self.mesh._get_state():
+            kd = uw.kdtree.KDTree(np.ascontiguousarray(meshVar.coords))
+            kd.build_index()
+            cached = {
+                "mesh_state": self.mesh._get_state(),
+                "kdtree": kd,
+                "num_nodes": meshVar.coords.shape[0],
+                "swarm_key": None,
+            }
+            self._node_map_cache[node_key] = cached
+
+        swarm_key = (self._get_state(), self.dm.getLocalSize())
+        if cached["swarm_key"] != swarm_key:
+            with self.access(readable_vars=[self.particle_coordinates]):
+                cached["map"] = cached["kdtree"].find_closest_point(
+                    np.ascontiguousarray(self.particle_coordinates.data)
+                )
+            cached["swarm_key"] = swarm_key
+
+        return cached["map"], cached["num_nodes"]
+
     @timing.routine_timer_decorator
     def _get_map(self, var):
-        # generate tree if not avaiable
-        if not self._index:
-            with self.access():
-                self._index = uw.kdtree.KDTree(self.data)
+        # generate tree if not avaiable (the particle kd-tree is shared)
+        index, _ = self._get_kdtree()
+        if index is not self._index:
+            self._index = index
+            self._nnmapdict = {}
 
         # get or generate map
         meshvar_coords = var._meshVar.coords
@@ -1623,6 +1956,146 @@ class Swarm(Stateful, uw_object):
             self._nnmapdict[digest] = self._index.find_closest_point(meshvar_coords)[0]
         return self._nnmapdict[digest]
 
+    def _rk_stages(self, V_fn_matrix, X, h, a, evalf, restore_points_to_domain_func):
+        # Velocity at each of the stage positions. The stage positions are local
+        # arrays and the particles are not moved / migrated. A stage position
+        # may be on another process so the stage points are evaluated by their
+        # owners (see _StagePoints). If a stage position is outside the domain,
+        # the particle is lost: `lost` flags these particles and `X_lost` holds
+        # the (outside) position to send them to so that the migration at the
+        # end of the step removes them, as it does for the Euler / mid-point
+        # schemes.
+
+        num_components = V_fn_matrix.shape[0] * V_fn_matrix.shape[1]
+        if (
+            self._stage_points is None
+            or self._stage_points.num_components != num_components
+        ):
+            self._stage_points = _StagePoints(self, num_components)
+
+        k = []
+        lost = np.zeros(X.shape[0], dtype=bool)
+        X_lost = X.copy()
+
+        for a_i in a:
+            X_i = X.copy()
+            for j, a_ij in enumerate(a_i):
+                if a_ij != 0.0:
+                    X_i += h * a_ij * k[j]
+
+            if len(a_i) != 0 and restore_points_to_domain_func is not None:
+                X_i = restore_points_to_domain_func(X_i)
+
+            k_i = self._stage_points.evaluate_components(
+                V_fn_matrix, X_i, evalf=evalf
+            )
+
+            outside = np.isnan(k_i).any(axis=1)
+            X_lost[outside & ~lost] = X_i[outside & ~lost]
+            lost |= outside
+            k_i[outside] = 0.0
+
+            k.append(k_i)
+
+        return k, lost, X_lost
+
+    def _rk_advection(
+        self,
+        V_fn_matrix,
+        X,
+        delta_t,
+        substeps,
+        order,
+        evalf,
+        restore_points_to_domain_func,
+    ):
+        # Fixed step, explicit Runge-Kutta update of the positions X
+
+        a = _rk_tableaux[order]["a"]
+        b = _rk_tableaux[order]["b"]
+        h = delta_t / substeps
+
+        for step in range(0, substeps):
+            k, lost, X_lost = self._rk_stages(
+                V_fn_matrix, X, h, a, evalf, restore_points_to_domain_func
+            )
+            for b_i, k_i in zip(b, k):
+                X += h * b_i * k_i
+
+            if restore_points_to_domain_func is not None:
+                X = restore_points_to_domain_func(X)
+
+            X[lost] = X_lost[lost]
+
+        return X
+
+    def _adaptive_rk_advection(
+        self,
+        V_fn_matrix,
+        X,
+        delta_t,
+        h,
+        tolerance,
+        evalf,
+        restore_points_to_domain_func,
+    ):
+        # Embedded Runge-Kutta update of the positions X with step size control.
+        # The error is the largest particle displacement difference between
+        # the two schemes (over all processes so that every process takes the
+        # same steps - the interpolation is collective)
+
+        from mpi4py import MPI
+
+        tableau = _rk_tableaux["adaptive"]
+        a = tableau["a"]
+        b = tableau["b"]
+        b_embedded = tableau["b_embedded"]
+        exponent = 1.0 / tableau["order"]
+
+        sign = 1.0 if delta_t >= 0.0 else -1.0
+        h = sign * abs(h)
+        t = 0.0
+
+        while abs(t) < abs(delta_t) * (1.0 - 1.0e-12):
+            h = sign * min(abs(h), abs(delta_t - t))
+
+            k, lost, X_lost = self._rk_stages(
+                V_fn_matrix, X, h, a, evalf, restore_points_to_domain_func
+            )
+
+            X_new = X.copy()
+            X_embedded = X.copy()
+            for b_i, be_i, k_i in zip(b, b_embedded, k):
+                X_new += h * b_i * k_i
+                X_embedded += h * be_i * k_i
+
+            # Lost particles do not contribute to the error
+            if np.any(~lost):
+                error = np.sqrt(
+                    ((X_new[~lost] - X_embedded[~lost]) ** 2).sum(axis=1)
+                ).max()
+            else:
+                error = 0.0
+
+            error = comm.allreduce(error, op=MPI.MAX)
+
+            if error <= tolerance:
+                X = X_new
+                if restore_points_to_domain_func is not None:
+                    X = restore_points_to_domain_func(X)
+                X[lost] = X_lost[lost]
+                t += h
+
+            if error > 0.0:
+                h *= min(5.0, max(0.2, 0.9 * (tolerance / error) ** exponent))
+            else:
+                h *= 5.0
+
+            if uw.mpi.rank == 0 and self.verbose:
+                print(f"Adaptive advection: t = {t}, h = {h}, error = {error}")
+
+        return X
+
     @timing.routine_timer_decorator
     def advection(
         self,
@@ -1633,7 +2106,26 @@ class Swarm(Stateful, uw_object):
         restore_points_to_domain_func=None,
         evalf=False,
         step_limit=True,
+        adaptive=False,
+        tolerance=None,
     ):
+        """
+        Move the swarm particles with the velocity field `V_fn` for a time `delta_t`.
+
+        `order=1` is forward Euler and `order=2` is the mid-point method. `order=3`
+        and `order=4` are the classical third / fourth order Runge-Kutta schemes:
+        the stage positions are held in local arrays (in parallel, they are
+        evaluated by the processes that own them) and the particles are
+        migrated once at the end of the step. As for the other schemes, particles
+        that leave the domain (here, if any stage position is outside) are
+        removed. With `adaptive=True`, an embedded Runge-Kutta 3(2)
+        pair is used and the sub-steps are chosen so that the estimated
+        displacement error of any particle is less than `tolerance` (the default
+        is 1% of the smallest element radius).
+
+        The step is divided into sub-steps that respect the advective time-step
+        limit of the mesh (`estimate_dt`) unless `step_limit=False`.
+        """
 
         dt_limit = self.estimate_dt(V_fn)
 
@@ -1693,6 +2185,52 @@ class Swarm(Stateful, uw_object):
         #         del updated_current_coords
         #         del v_at_Vpts
 
+        # Higher order schemes: the stage positions are carried in local
+        # arrays and the swarm is only migrated once, at the end of the step.
+
+        if adaptive or order in _rk_tableaux:
+            with self.access(X0):
+                X0.data[...] = self.particle_coordinates.data[...]
+
+            with self.access(self.particle_coordinates):
+                X = self.particle_coordinates.data.copy()
+
+                if adaptive:
+                    if tolerance is None:
+                        tolerance = 0.01 * self.mesh.get_min_radius()
+
+                    if step_limit and dt_limit is not None:
+                        h = min(abs(delta_t), dt_limit)
+                    else:
+                        h = abs(delta_t)
+
+                    X = self._adaptive_rk_advection(
+                        V_fn_matrix,
+                        X,
+                        delta_t,
+                        h,
+                        tolerance,
+                        evalf,
+                        restore_points_to_domain_func,
+                    )
+                else:
+                    X = self._rk_advection(
+                        V_fn_matrix,
+                        X,
+                        delta_t,
+                        substeps,
+                        order,
+                        evalf,
+                        restore_points_to_domain_func,
+                    )
+
+                self.particle_coordinates.data[...] = X[...]
+
+                del X
+
+            # No substepping needed below
+            substeps = 0
+
         # Wrap this whole thing in sub-stepping loop
         for step in range(0, substeps):
 
@@ -1703,18 +2241,10 @@ class Swarm(Stateful, uw_object):
 
             if order == 2:
                 with self.access(self.particle_coordinates):
-                    v_at_Vpts = np.zeros_like(self.particle_coordinates.data)
-
-                    if evalf:
-                        for d in range(self.dim):
-                            v_at_Vpts[:, d] = uw.function.evalf(
-                                V_fn_matrix[d], self.particle_coordinates.data
-                            ).reshape(-1)
-                    else:
-                        for d in range(self.dim):
-                            v_at_Vpts[:, d] = uw.function.evaluate(
-                                V_fn_matrix[d], self.particle_coordinates.data
-                            ).reshape(-1)
+                    # All components in one pass (a single interpolation)
+                    v_at_Vpts = uw.function.evaluate_components(
+                        V_fn_matrix, self.particle_coordinates.data, evalf=evalf
+                    )
 
                     mid_pt_coords = (
                         self.particle_coordinates.data[...]
@@ -1732,18 +2262,10 @@ class Swarm(Stateful, uw_object):
 
                     ## Let the swarm be updated, and then move the rest of the way
 
-                    v_at_Vpts = np.zeros_like(self.data)
-
-                    if evalf:
-                        for d in range(self.dim):
-                            v_at_Vpts[:, d] = uw.function.evalf(
-                                V_fn_matrix[d], self.particle_coordinates.data
-                            ).reshape(-1)
-                    else:
-                        for d in range(self.dim):
-                            v_at_Vpts[:, d] = uw.function.evaluate(
-                                V_fn_matrix[d], self.particle_coordinates.data
-                            ).reshape(-1)
+                    # All components in one pass (a single interpolation)
+                    v_at_Vpts = uw.function.evaluate_components(
+                        V_fn_matrix, self.particle_coordinates.data, evalf=evalf
+                    )
 
                     # if (uw.mpi.rank == 0):
                     #     print("Re-launch from X0", flush=True)
@@ -1762,18 +2284,10 @@ class Swarm(Stateful, uw_object):
             # forward Euler (1st order)
             else:
                 with self.access(self.particle_coordinates):
-                    v_at_Vpts = np.zeros_like(self.data)
-
-                    if evalf:
-                        for d in range(self.dim):
-                            v_at_Vpts[:, d] = uw.function.evalf(
-                                V_fn_matrix[d], self.data
-                            ).reshape(-1)
-                    else:
-                        for d in range(self.dim):
-                            v_at_Vpts[:, d] = uw.function.evaluate(
-                                V_fn_matrix[d], self.data
-                            ).reshape(-1)
+                    # All components in one pass (a single interpolation)
+                    v_at_Vpts = uw.function.evaluate_components(
+                        V_fn_matrix, self.data, evalf=evalf
+                    )
 
                     new_coords = self.data + delta_t * v_at_Vpts / substeps
 
@@ -1850,6 +2364,7 @@ class Swarm(Stateful, uw_object):
                         swarmVar.data[swarm_size::] = interpolated_values
 
             self.dm.migrate(remove_sent_points=True)
+            self._increment()
 
             with self.access(self._remeshed):
                 self._remeshed.data[...] = np.mod(
@@ -1998,6 +2513,8 @@ class NodalPointSwarm(Swarm):
         restore_points_to_domain_func=None,
         evalf=False,
         step_limit=True,
+        adaptive=False,
+        tolerance=None,
     ):
 
         with self.access(self._X0):
@@ -2014,6 +2531,8 @@ class NodalPointSwarm(Swarm):
             restore_points_to_domain_func,
             evalf,
             step_limit,
+            adaptive,
+            tolerance,
         )
 
         return
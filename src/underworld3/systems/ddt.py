@@ -253,20 +253,15 @@ class SemiLagrangian(uw_object):
                     self._psi_star_projection_solver.smoothing = 0.0
                     self._psi_star_projection_solver.solve(verbose=verbose)
 
-            if evalf:
-                with self._nswarm_psi.access(self._nswarm_psi.swarmVariable):
-                    for d in range(self.psi_star[i].shape[1]):
-                        self._nswarm_psi.swarmVariable.data[:, d] = uw.function.evalf(
-                            self.psi_star[i].sym[d], self._nswarm_psi.data
-                        )
-            else:
-                with self._nswarm_psi.access(self._nswarm_psi.swarmVariable):
-                    for d in range(self.psi_star[i].shape[1]):
-                        self._nswarm_psi.swarmVariable.data[
-                            :, d
-                        ] = uw.function.evaluate(
-                            self.psi_star[i].sym[d], self._nswarm_psi.data
-                        )
+            with self._nswarm_psi.access(self._nswarm_psi.swarmVariable):
+                ncomps = self.psi_star[i].shape[1]
+                self._nswarm_psi.swarmVariable.data[:, 0:ncomps] = (
+                    uw.function.evaluate_components(
+                        self.psi_star[i].sym[0:ncomps],
+                        self._nswarm_psi.data,
+                        evalf=evalf,
+                    )
+                )
 
             if self.preserve_moments and self._workVar.num_components == 1:
 
@@ -581,8 +581,7 @@ class SNES_Stokes(SNES_Stokes_SaddlePt):
 
     @penalty.setter
     def penalty(self, value):
-        self.is_setup = False
-        self._penalty.sym = value
+        self._set_constant_expression(self._penalty, value)
 
 
 class SNES_VE_Stokes(SNES_Stokes):
@@ -1343,8 +1342,7 @@ class SNES_AdvectionDiffusion(SNES_Scalar):
 
     @delta_t.setter
     def delta_t(self, value):
-        self.is_setup = False
-        self._delta_t.sym = value
+        self._set_constant_expression(self._delta_t, value)
 
     @timing.routine_timer_decorator
     def estimate_dt(self):
@@ -1706,8 +1704,7 @@ class SNES_NavierStokes(SNES_Stokes_SaddlePt):
 
     @delta_t.setter
     def delta_t(self, value):
-        self.is_setup = False
-        self._delta_t.sym = value
+        self._set_constant_expression(self._delta_t, value)
 
     @property
     def rho(self):
@@ -1715,8 +1712,7 @@ class SNES_NavierStokes(SNES_Stokes_SaddlePt):
 
     @rho.setter
     def rho(self, value):
-        self.is_setup = False
-        self._rho.sym = value
+        self._set_constant_expression(self._rho, value)
 
     @property
     def f(self):
@@ -1788,8 +1784,7 @@ class SNES_NavierStokes(SNES_Stokes_SaddlePt):
 
     @penalty.setter
     def penalty(self, value):
-        self.is_setup = False
-        self._penalty.sym = value
+        self._set_constant_expression(self._penalty, value)
 
     @timing.routine_timer_decorator
     def solve(
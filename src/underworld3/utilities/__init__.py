@@ -15,7 +15,8 @@ def _append_petsc_path():
 _append_petsc_path()
 
 from .uw_petsc_gen_xdmf import Xdmf, generateXdmf, generate_uw_Xdmf
-from .uw_swarmIO import swarm_h5, swarm_xdmf
+from .uw_swarmIO import swarm_h5, swarm_xdmf, h5_write_distributed
+from ._async_checkpoint import AsyncCheckpointWriter
 from ._utils import CaptureStdout, h5_scan, mem_footprint, gather_data, auditor
 
 from .read_medit_ascii import read_medit_ascii, print_medit_mesh_info
@@ -0,0 +1,272 @@
+import os
+import queue
+import threading
+
+import numpy as np
+from mpi4py import MPI
+
+from .uw_swarmIO import h5_write_distributed, _h5_chunk_rows
+
+
+def _h5_write_serial(
+    fileName, name, data, compression=False, compressionType="gzip", mode="w"
+):
+    """
+    Write all the (n, ncomp) rows into a dataset with the layout of
+    `h5_write_distributed` using serial h5py (no MPI calls).
+    """
+
+    import h5py
+
+    data = np.ascontiguousarray(data)
+    data = data.reshape(data.shape[0], -1)
+    ncomp = data.shape[1]
+
+    dataset_args = dict(
+        data=data,
+        chunks=(max(1, min(data.shape[0], _h5_chunk_rows)), ncomp),
+        maxshape=(None, ncomp),
+    )
+    if compression == True:
+        dataset_args["compression"] = compressionType
+
+    with h5py.File(fileName, mode) as h5f:
+        h5f.create_dataset(name, **dataset_args)
+
+    return
+
+
+class AsyncCheckpointWriter:
+    """
+    Write checkpoint data in the background while the model continues.
+
+    The data are copied into staging buffers (this is the only part that
+    blocks, and it includes all of the PETSc / MPI work needed to obtain the
+    locally owned values) and the HDF5 / xdmf output is done by a background
+    thread. At most `max_buffers` staged checkpoints are held in memory. Staging
+    a new checkpoint blocks until a buffer is free (the default of two buffers
+    allows one checkpoint to be written while the next one is being staged).
+
+    If MPI was initialised with `MPI_THREAD_MULTIPLE`, each process writes its
+    own slab of the file from the background thread (on a private
+    communicator). Otherwise the staged data are gathered to rank 0, which does
+    all of the writing with serial h5py, so that no MPI calls are made from
+    the thread.
+
+    Do not use the synchronous (PETSc viewer) writers for the same files, or
+    read the files, until `wait()` has been called.
+
+    Example
+    -------
+    >>> writer = uw.utilities.AsyncCheckpointWriter()
+    >>> for step in range(nsteps):
+    ...     stokes.solve()
+    ...     writer.write_mesh_variables(mesh, "output", step, [v, p], outputPath="out")
+    ...     writer.write_swarm_timestep(swarm, "output", "swarm", step, [material], outputPath="out")
+    >>> writer.wait()
+    """
+
+    def __init__(self, max_buffers: int = 2):
+        if max_buffers < 1:
+            raise RuntimeError("AsyncCheckpointWriter requires at least one buffer")
+
+        self._world = MPI.COMM_WORLD
+        self._threaded_mpi = (
+            self._world.size == 1 or MPI.Query_thread() == MPI.THREAD_MULTIPLE
+        )
+
+        if self._threaded_mpi:
+            self._comm = self._world.Dup()
+        else:
+            self._comm = MPI.COMM_SELF
+
+        self._jobs = queue.Queue(maxsize=max_buffers)
+        self._error = None
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                job()
+            except Exception as e:
+                self._error = e
+            finally:
+                self._jobs.task_done()
+
+    def _stage(self, rows):
+        """
+        Staged rows: the local rows (threaded MPI), or all the rows on
+        rank 0 and `None` elsewhere.
+        """
+
+        if self._threaded_mpi:
+            return rows
+
+        gathered = self._world.gather(rows, root=0)
+        if self._world.rank == 0:
+            return np.concatenate(gathered)
+
+        return None
+
+    def _write(self, fileName, name, rows, **kwargs):
+        """
+        Write the staged rows from the background thread. Without threaded
+        MPI, rank 0 holds all the rows and writes them with serial h5py.
+        """
+
+        if self._threaded_mpi:
+            h5_write_distributed(fileName, name, rows, comm=self._comm, **kwargs)
+        else:
+            _h5_write_serial(fileName, name, rows, **kwargs)
+
+        return
+
+    def _submit(self, job):
+        if not self._thread.is_alive():
+            raise RuntimeError("AsyncCheckpointWriter has been closed")
+
+        # blocks while all the buffers are in use
+        self._jobs.put(job)
+
+    def _participates(self):
+        return self._threaded_mpi or self._world.rank == 0
+
+    def write_mesh_variables(
+        self,
+        mesh,
+        filename: str,
+        index: int,
+        meshVars: list,
+        outputPath: str = "",
+    ):
+        """
+        Stage the mesh variables for writing with the same file names and
+        layout (`/fields/<name>` and `/fields/coordinates`) as the checkpoint
+        files of `Mesh.write_timestep`, so they can be read with
+        `MeshVariable.read_timestep`. The mesh itself and the visualisation
+        (vertex) fields are not written: use `Mesh.write_timestep` for those.
+        """
+
+        output_base_name = os.path.join(outputPath, filename)
+
+        staged = []
+        for var in meshVars:
+            values, coords = var._snapshot()
+            save_location = (
+                output_base_name + f".mesh.{var.clean_name}.{index:05}.h5"
+            )
+            staged.append(
+                (
+                    save_location,
+                    var.clean_name,
+                    self._stage(values),
+                    self._stage(coords),
+                )
+            )
+
+        def job():
+            for save_location, name, values, coords in staged:
+                self._write(save_location, f"fields/{name}", values, mode="w")
+                self._write(save_location, "fields/coordinates", coords, mode="a")
+
+        if self._participates():
+            self._submit(job)
+
+        return
+
+    def write_swarm_timestep(
+        self,
+        swarm,
+        filename: str,
+        swarmname: str,
+        index: int,
+        swarmVars: list = None,
+        outputPath: str = "",
+        time=None,
+        compression: bool = False,
+        compressionType: str = "gzip",
+    ):
+        """
+        Stage the swarm coordinates and swarm variables for writing in the
+        format of `Swarm.write_timestep` (including the xdmf file).
+        """
+
+        from underworld3.swarm import _write_swarm_xdmf
+
+        output_base_name = os.path.join(outputPath, filename) + "." + swarmname
+
+        if swarmVars is not None and not isinstance(swarmVars, list):
+            raise RuntimeError("`swarmVars` does not appear to be a list.")
+
+        staged = [
+            (
+                f"{output_base_name}.{index:05d}.h5",
+                "coordinates",
+                self._stage(swarm.particle_coordinates.read_only_view()),
+            )
+        ]
+
+        field_names = None
+        if swarmVars is not None:
+            field_names = [field.name for field in swarmVars]
+            for field in swarmVars:
+                staged.append(
+                    (
+                        f"{output_base_name}.{field.name}.{index:05d}.h5",
+                        "data",
+                        self._stage(field.read_only_view()),
+                    )
+                )
+
+        def job():
+            for save_location, name, rows in staged:
+                self._write(
+                    save_location,
+                    name,
+                    rows,
+                    compression=compression,
+                    compressionType=compressionType,
+                )
+
+            if self._comm.rank == 0:
+                _write_swarm_xdmf(output_base_name, index, field_names, time)
+
+        if self._participates():
+            self._submit(job)
+
+        return
+
+    def wait(self):
+        """
+        Block until all the staged checkpoints have been written. Errors raised
+        by the background writes are re-raised here.
+        """
+
+        self._jobs.join()
+        self._world.barrier()
+
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Asynchronous checkpoint write failed") from error
+
+        return
+
+    def close(self):
+        """
+        Wait for the pending writes and stop the background thread.
+        """
+
+        if self._thread.is_alive():
+            self.wait()
+            self._jobs.put(None)
+            self._thread.join()
+
+            if self._comm != MPI.COMM_SELF:
+                self._comm.Free()
+
+        return
@@ -1,5 +1,6 @@
 from typing import List
 import subprocess
+import functools
 from xmlrpc.client import boolean
 import sympy
 import underworld3
@@ -32,6 +33,230 @@ from collections import namedtuple
 
 _ext_dict = {}
 
+## Extensions that have already been loaded in this process, keyed by the
+## digest of their generated source (see `_createext`)
+_ext_digest_dict = {}
+
+## Persistent (on-disk) cache of compiled extensions. The location can be set
+## with the `UW_JITCACHE` environment variable or with `set_jit_cache_dir`.
+## A value of `None` disables the persistent cache and every extension is
+## rebuilt in /tmp (the previous behaviour).
+
+_jit_cache_dir_override = False
+
+## Which ranks compile the extensions: "all" (each rank independently),
+## "node" (one rank per shared-memory node) or "root" (rank 0 only).
+## Set with the `UW_JITBUILD` environment variable or `set_jit_build_mode`.
+
+_jit_build_mode_override = None
+_jit_build_comms = {}
+
+# Placeholders used while generating the extension source. These are replaced
+# with names derived from the source digest so that the same source always
+# produces the same module (and the same .so file).
+_RANDSTR_PLACEHOLDER = "__UW_JIT_RANDSTR__"
+_MODNAME_PLACEHOLDER = "__UW_JIT_MODNAME__"
+
+
+def set_jit_cache_dir(path):
+    """
+    Set the directory used to keep compiled JIT extensions between runs.
+    Pass `None` to disable the persistent cache. This over-rides the
+    `UW_JITCACHE` environment variable.
+    """
+    global _jit_cache_dir_override
+    _jit_cache_dir_override = path
+
+    return
+
+
+def jit_cache_dir():
+    """
+    The directory used to keep compiled JIT extensions between runs, or `None`
+    if the persistent cache is disabled. The default is
+    `$XDG_CACHE_HOME/underworld3/jit` (usually `~/.cache/underworld3/jit`) and
+    this can be changed with the `UW_JITCACHE` environment variable
+    (`UW_JITCACHE=none` disables the cache).
+    """
+    import os
+
+    if _jit_cache_dir_override is not False:
+        path = _jit_cache_dir_override
+    elif "UW_JITCACHE" in os.environ:
+        path = os.environ["UW_JITCACHE"]
+        if path.lower() in ("", "0", "none", "false", "off"):
+            path = None
+    else:
+        cache_home = os.environ.get(
+            "XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")
+        )
+        path = os.path.join(cache_home, "underworld3", "jit")
+
+    if path is None:
+        return None
+
+    return os.path.abspath(os.path.expanduser(str(path)))
+
+
+def set_jit_build_mode(mode):
+    """
+    Choose which ranks compile JIT extensions:
+
+    - `"node"` (default): one rank on each node builds, the others wait and
+      load the shared object that it produced.
+    - `"root"`: rank 0 builds for everyone. This needs the JIT cache
+      directory (`jit_cache_dir`) to be on a filesystem shared by all nodes.
+    - `"all"`: every rank builds its own copy.
+
+    This over-rides the `UW_JITBUILD` environment variable.
+    """
+    global _jit_build_mode_override
+
+    if mode is not None and mode.lower() not in ("all", "node", "root"):
+        raise ValueError("`mode` must take values `all`, `node` or `root`.")
+
+    _jit_build_mode_override = None if mode is None else mode.lower()
+
+    return
+
+
+def _jit_build_comm(shared_filesystem=True):
+    """
+    The communicator across which one rank (rank 0 of the communicator)
+    builds each extension. Without a shared (persistent) cache directory,
+    extensions are built in the node-local /tmp and `"root"` mode is
+    treated as `"node"`.
+    """
+    import os
+    from mpi4py import MPI
+
+    if _jit_build_mode_override is not None:
+        mode = _jit_build_mode_override
+    else:
+        mode = os.environ.get("UW_JITBUILD", "node").lower()
+
+    if mode == "root" and not shared_filesystem:
+        mode = "node"
+
+    if mode not in _jit_build_comms:
+        comm = underworld3.mpi.comm
+        if mode == "root":
+            _jit_build_comms[mode] = comm
+        elif mode == "node":
+            _jit_build_comms[mode] = comm.Split_type(MPI.COMM_TYPE_SHARED)
+        elif mode == "all":
+            _jit_build_comms[mode] = MPI.COMM_SELF
+        else:
+            raise ValueError(
+                f"UW_JITBUILD={mode} is not recognised: use `all`, `node` or `root`."
+            )
+
+    return _jit_build_comms[mode]
+
+
+@functools.lru_cache(maxsize=None)
+def _build_fingerprint():
+    """
+    A description of the build environment for the JIT extensions (compiler,
+    python, PETSc, Cython, numpy). Any change here invalidates the cached
+    extensions.
+    """
+    import sys
+    import platform
+    import sysconfig
+    import os
+
+    cc = os.environ.get("CC", sysconfig.get_config_var("CC") or "cc")
+    try:
+        cc_version = subprocess.run(
+            cc.split() + ["--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+        ).stdout.decode(errors="replace")
+    except Exception:
+        cc_version = ""
+
+    try:
+        import petsc4py
+        from petsc4py import PETSc
+
+        petsc_info = (
+            str(PETSc.Sys.getVersion()),
+            str(petsc4py.get_config().get("PETSC_DIR")),
+            str(petsc4py.get_config().get("PETSC_ARCH")),
+        )
+    except Exception:
+        petsc_info = ()
+
+    try:
+        import Cython
+
+        cython_version = Cython.__version__
+    except ImportError:
+        cython_version = ""
+
+    import numpy
+
+    fingerprint = (
+        sys.version,
+        platform.platform(),
+        cc,
+        cc_version,
+        *petsc_info,
+        cython_version,
+        numpy.__version__,
+        str(getattr(underworld3, "__version__", "")),
+    )
+
+    return "\n".join(fingerprint)
+
+
+def _source_digest(codeguys):
+    """
+    A stable digest of the generated extension source (`[filename, text]` pairs)
+    combined with the build environment.
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    digest.update(_build_fingerprint().encode())
+    for filename, text in codeguys:
+        digest.update(b"\0" + filename.encode() + b"\0" + text.encode())
+
+    return digest.hexdigest()
+
+
+def _load_dynamic(name, path):
+    """
+    Load an extension module.
+    Borrowed from:
+        https://stackoverflow.com/a/55172547
+    """
+    import importlib.machinery
+    from importlib._bootstrap import _load
+
+    loader = importlib.machinery.ExtensionFileLoader(name, path)
+
+    # Issue #24748: Skip the sys.modules check in _load_module_shims
+    # always load new extension
+    spec = importlib.machinery.ModuleSpec(name=name, loader=loader, origin=path)
+    return _load(spec)
+
+
+def _find_extension(path):
+    """Return the compiled extension (.so) in directory `path`, or None"""
+    import os
+
+    if not os.path.isdir(path):
+        return None
+
+    for _file in sorted(os.listdir(path)):
+        if _file.endswith(".so"):
+            return os.path.join(path, _file)
+
+    return None
+
 
 # Generates the C debugging string for the compiled function block
 def debugging_text(randstr, fn, fn_type, eqn_no):
@@ -78,6 +303,79 @@ def debugging_text_bd(randstr, fn, fn_type, eqn_no):
     return debug_str
 
 
+def _unwrap_for_jit(fn):
+    """
+    Substitute all the expressions in `fn` except the ones that are
+    numerical constants, which are passed to the compiled functions
+    at run time (see `_extract_constants`).
+    """
+
+    from underworld3.function.expressions import UWexpression
+
+    if isinstance(fn, sympy.MatrixBase):
+        return fn.applyfunc(_unwrap_for_jit)
+
+    if isinstance(fn, UWexpression) and isinstance(fn.sym, sympy.Number):
+        return fn
+
+    return underworld3.function.expressions.unwrap(
+        fn, keep_constants=True, return_self=False
+    )
+
+
+def _extract_constants(fns):
+    """
+    The numerical constant expressions remaining in the (unwrapped) functions,
+    in a reproducible order. In the generated code, the i-th constant is read
+    from `constants[i]`, the PetscDS constants array (`constant_values`).
+    """
+
+    from underworld3.function.expressions import UWexpression
+
+    constants = set()
+    for fn in fns:
+        for atom in sympy.sympify(fn).atoms(sympy.Symbol):
+            if isinstance(atom, UWexpression):
+                constants.add(atom)
+
+    return sorted(constants, key=lambda c: c._instance_no)
+
+
+def constant_values(constants):
+    """
+    The current values of the constants (as returned by `getext`) for the
+    PetscDS constants array. Returns `None` if any of the expressions is no
+    longer a numerical value, in which case the functions must be rebuilt.
+    """
+
+    if any(not isinstance(c.sym, sympy.Number) for c in constants):
+        return None
+
+    return [float(c.sym) for c in constants]
+
+
+def _kernel_code(printer, fn, out):
+    """
+    C code for one pointwise function: common subexpressions of all the
+    components of `fn` are computed once, as local temporaries, before the
+    components are assigned to `out`.
+    """
+
+    temporaries, (reduced_fn,) = sympy.cse(
+        fn, symbols=sympy.numbered_symbols("uw_cse_"), order="none"
+    )
+
+    code = ""
+    for temporary, expr in temporaries:
+        code += "const PetscScalar {} = {};\n".format(
+            temporary, printer.doprint(expr)
+        )
+
+    code += printer.doprint(reduced_fn, out)
+
+    return code
+
+
 @timing.routine_timer_decorator
 def getext(
     mesh,
@@ -108,19 +406,18 @@ def getext(
         + tuple(fns_bd_jacobian)
     )
 
-    ## Expand all functions to ensure that changes in constants are recognised
-    ## in the caching process.
+    ## Expand all functions to ensure that changes in the expressions are recognised
+    ## in the caching process. Numerical constants are left as symbols: their values
+    ## are passed in through the PetscDS constants array so changing them does not
+    ## require a new extension.
 
     expanded_fns = []
 
     for fn in raw_fns:
-        expanded_fns.append(
-            underworld3.function.expressions.unwrap(
-                fn, keep_constants=False, return_self=False
-            )
-        )
+        expanded_fns.append(_unwrap_for_jit(fn))
 
     fns = tuple(expanded_fns)
+    constants = _extract_constants(fns)
 
     if debug and underworld3.mpi.rank==0:
         print(f"Expanded functions for compilation:")
@@ -159,6 +456,7 @@ def getext(
             verbose=verbose,
             debug=debug,
             debug_name=debug_name,
+            constants=constants,
         )
     else:
         if verbose and underworld3.mpi.rank == 0:
@@ -194,10 +492,12 @@ def getext(
 
     extn_fn_dict = namedtuple(
         "Functions",
-        ["res", "jac", "ebc", "bd_res", "bd_jac"],
+        ["res", "jac", "ebc", "bd_res", "bd_jac", "constants"],
     )
 
-    extensions_functions_dicts = extn_fn_dict(i_res, i_jac, i_ebc, i_bd_res, i_bd_jac)
+    extensions_functions_dicts = extn_fn_dict(
+        i_res, i_jac, i_ebc, i_bd_res, i_bd_jac, tuple(constants)
+    )
 
     return ptrobj, extensions_functions_dicts
 
@@ -215,6 +515,7 @@ def _createext(
     verbose: Optional[bool] = False,
     debug: Optional[bool] = False,
     debug_name=None,
+    constants=None,
 ):
     """
     This creates the required extension which houses the JIT
@@ -226,6 +527,15 @@ def _createext(
     We hash the functions and create a dictionary of the generated extensions
     to avoid redundantly creating new extensions.
 
+    Compiled extensions are also kept in a persistent cache directory
+    (see `jit_cache_dir`) named by a digest of the generated source and the
+    build environment, so a new process that generates the same source
+    loads the existing module instead of compiling it again.
+
+    This function must be called collectively. Only one rank of the
+    build communicator (see `set_jit_build_mode`) runs the compiler, the
+    others wait for it and load the shared object it produced.
+
     Params
     ------
     name:
@@ -254,6 +564,10 @@ def _createext(
         petsc auxiliary variable arrays. Note that *all* the variables in the
         calling system's corresponding `PetscDM` must be included in this list.
         They must also be ordered according to their `field_id`.
+    constants
+        The (numerical) expressions that are read from the PetscDS
+        `constants[]` array in the generated code, in order (see
+        `_extract_constants`).
 
     """
     from sympy import symbols, Eq, MatrixSymbol
@@ -365,6 +679,15 @@ def _createext(
     type(mesh.N.x)._ccode = lambda self, printer: self._ccodestr
     type(mesh.Gamma_N.x)._ccode = lambda self, printer: self._ccodestr
 
+    # Numerical constants are read from the PetscDS constants array
+
+    if constants is None:
+        constants = _extract_constants([_unwrap_for_jit(fn) for fn in fns])
+
+    for i, constant in enumerate(constants):
+        constant._ccodestr = f"constants[{i}]"
+        type(constant)._ccode = lambda self, printer: self._ccodestr
+
     # Create a custom functions replacement dictionary.
     # Note that this dictionary is really just to appease Sympy,
     # and the actual implementation is printed directly into the
@@ -413,10 +736,7 @@ def _createext(
     eqns = []
     for index, fn in enumerate(fns):
 
-        fn = underworld3.function.expressions.unwrap(
-            fn, keep_constants=False, return_self=False
-        )
-
+        fn = _unwrap_for_jit(fn)
 
         if isinstance(fn, sympy.vector.Vector):
             fn = fn.to_matrix(mesh.N)[0 : mesh.dim, 0]
@@ -429,13 +749,14 @@ def _createext(
             print("Processing JIT {:4d} / {}".format(index, fn))
 
         out = sympy.MatrixSymbol("out", *fn.shape)
-        eqn = ("eqn_" + str(index), printer.doprint(fn, out))
-        if eqn[1].startswith("// Not supported in C:"):
+        eqn = ("eqn_" + str(index), _kernel_code(printer, fn, out))
+        if "// Not supported in C:" in eqn[1]:
             spliteqn = eqn[1].split("\n")
+            line = [l.startswith("// Not supported in C:") for l in spliteqn].index(True)
             raise RuntimeError(
                 f"Error encountered generating JIT extension:\n"
-                f"{spliteqn[0]}\n"
-                f"{spliteqn[1]}\n"
+                f"{spliteqn[line]}\n"
+                f"{spliteqn[line + 1]}\n"
                 f"This is usually because code generation for a Sympy function (or its derivative) is not supported.\n"
                 f"Please contact the developers."
                 f"---"
@@ -444,7 +765,24 @@ def _createext(
             )
         eqns.append(eqn)
 
-    MODNAME = "fn_ptr_ext_" + str(name)
+    import os
+
+    # Named (debugging / testing) extensions are always built in /tmp,
+    # everything else goes through the persistent cache if it is enabled.
+    cache_dir = jit_cache_dir()
+    persistent = (
+        cache_dir is not None
+        and debug_name is None
+        and not "UW_JITNAME" in os.environ
+    )
+
+    build_comm = _jit_build_comm(shared_filesystem=persistent)
+
+    if persistent:
+        MODNAME = _MODNAME_PLACEHOLDER
+    else:
+        # `name` may be a (process-dependent) hash, so agree on it first
+        MODNAME = build_comm.bcast("fn_ptr_ext_" + str(name), root=0)
 
     codeguys = []
     # Create a `setup.py`
@@ -514,9 +852,11 @@ cdef extern from "cy_ext.h" nogil:
 
     import string
     import random
-    import os
 
-    if not "UW_JITNAME" in os.environ:
+    if persistent:
+        # replaced by a digest of the source once it is complete
+        randstr = _RANDSTR_PLACEHOLDER
+    elif not "UW_JITNAME" in os.environ:
         randstr = "".join(random.choices(string.ascii_uppercase, k=5))
     else:
         if debug_name is None:
@@ -524,6 +864,8 @@ cdef extern from "cy_ext.h" nogil:
         else:
             randstr = debug_name
 
+    randstr = build_comm.bcast(randstr, root=0)
+
     # Print includes
     for header in printer.headers:
         h_str += '#include "{}"\n'.format(header)
@@ -652,52 +994,71 @@ cpdef PtrContainer getptrobj():
     pyx_str += "    return clsguy"
     codeguys.append(["cy_ext.pyx", pyx_str])
 
-    # Write out files
-    import os
-
-    tmpdir = os.path.join("/tmp", MODNAME)
-    try:
-        os.mkdir(tmpdir)
-    except OSError:
-        pass
-    for thing in codeguys:
-        filename = thing[0]
-        strguy = thing[1]
-        with open(os.path.join(tmpdir, filename), "w") as f:
-            f.write(strguy)
+    if persistent:
+        # Everyone loads the module that the builder rank would produce
+        source_digest = build_comm.bcast(_source_digest(codeguys), root=0)
+        randstr = "UW" + source_digest[:12].upper()
+        MODNAME = "fn_ptr_ext_" + source_digest[:24]
+        for thing in codeguys:
+            thing[1] = (
+                thing[1]
+                .replace(_RANDSTR_PLACEHOLDER, randstr)
+                .replace(_MODNAME_PLACEHOLDER, MODNAME)
+            )
 
-    # Build
-    import sys
+        # Already loaded in this process (from an equivalent set of functions)
+        if source_digest in _ext_digest_dict:
+            _ext_dict[name] = _ext_digest_dict[source_digest]
+            if verbose and underworld3.mpi.rank == 0:
+                print(f"JIT compiled module cached ... {MODNAME} ", flush=True)
+            return
+
+        tmpdir = os.path.join(cache_dir, MODNAME)
+        build_error = None
+
+        if build_comm.rank == 0:
+            ext_file = _find_extension(tmpdir)
+            if ext_file is None:
+                try:
+                    tmpdir = _build_cached_extension(cache_dir, MODNAME, codeguys)
+                except RuntimeError as e:
+                    build_error = str(e)
+            elif verbose and underworld3.mpi.rank == 0:
+                print(f"JIT module loaded from cache ... {ext_file} ", flush=True)
+
+        # Everyone fails together if the builder could not compile the module
+        tmpdir, build_error = build_comm.bcast((tmpdir, build_error), root=0)
+        if build_error is not None:
+            raise RuntimeError(build_error)
+
+        ext_file = _find_extension(tmpdir)
+
+        # The builder's directory is not visible here (e.g. not a shared
+        # filesystem), so this rank will have to build its own copy
+        if ext_file is None and build_comm.rank != 0:
+            tmpdir = _build_cached_extension(cache_dir, MODNAME, codeguys)
+            ext_file = _find_extension(tmpdir)
+
+        if ext_file is not None:
+            _ext_dict[name] = _load_dynamic(MODNAME, ext_file)
+            _ext_digest_dict[source_digest] = _ext_dict[name]
 
-    process = subprocess.Popen(
-        [sys.executable] + "setup.py build_ext --inplace".split(),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        cwd=tmpdir,
-    )
-    process.communicate()
-
-    # Load and add to dictionary
-    from importlib._bootstrap import _load
+    else:
+        tmpdir = os.path.join("/tmp", MODNAME)
 
-    def load_dynamic(name, path, file=None):
-        """
-        Load an extension module.
-        Borrowed from:
-            https://stackoverflow.com/a/55172547
-        """
-        import importlib.machinery
+        if build_comm.rank == 0:
+            try:
+                os.mkdir(tmpdir)
+            except OSError:
+                pass
 
-        loader = importlib.machinery.ExtensionFileLoader(name, path)
+            _build_extension(tmpdir, codeguys)
 
-        # Issue #24748: Skip the sys.modules check in _load_module_shims
-        # always load new extension
-        spec = importlib.machinery.ModuleSpec(name=name, loader=loader, origin=path)
-        return _load(spec)
+        build_comm.Barrier()
 
-    for _file in os.listdir(tmpdir):
-        if _file.endswith(".so"):
-            _ext_dict[name] = load_dynamic(MODNAME, os.path.join(tmpdir, _file))
+        ext_file = _find_extension(tmpdir)
+        if ext_file is not None:
+            _ext_dict[name] = _load_dynamic(MODNAME, ext_file)
 
     if name not in _ext_dict.keys():
         raise RuntimeError(
@@ -740,3 +1101,66 @@ cpdef PtrContainer getptrobj():
         )
 
     return
+
+
+def _build_extension(tmpdir, codeguys):
+    """
+    Write out the generated source files (`[filename, text]` pairs)
+    to `tmpdir` and build the extension in place. Returns the compiler (stderr)
+    output.
+    """
+    import os
+    import sys
+
+    for thing in codeguys:
+        filename = thing[0]
+        strguy = thing[1]
+        with open(os.path.join(tmpdir, filename), "w") as f:
+            f.write(strguy)
+
+    process = subprocess.Popen(
+        [sys.executable] + "setup.py build_ext --inplace".split(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=tmpdir,
+    )
+    _, stderr = process.communicate()
+
+    return stderr.decode(errors="replace")
+
+
+def _build_cached_extension(cache_dir, modname, codeguys):
+    """
+    Build the extension in a private directory within `cache_dir` and move it
+    into place (`cache_dir/modname`) when complete so that other processes never
+    see a partially written module. Returns the directory that holds the module.
+    A failed build is removed from the cache and raises a `RuntimeError` with
+    the compiler output.
+    """
+    import os
+    import shutil
+    import tempfile
+
+    tmpdir = os.path.join(cache_dir, modname)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    builddir = tempfile.mkdtemp(prefix=modname + ".", dir=cache_dir)
+
+    try:
+        build_output = _build_extension(builddir, codeguys)
+        if _find_extension(builddir) is None:
+            raise RuntimeError(
+                f"The Underworld extension module {modname} could not be built. "
+                f"The compiler output was:\n{build_output}"
+            )
+    except:
+        shutil.rmtree(builddir, ignore_errors=True)
+        raise
+
+    try:
+        os.rename(builddir, tmpdir)
+    except OSError:
+        # Another process got there first, use theirs
+        shutil.rmtree(builddir, ignore_errors=True)
+
+    return tmpdir
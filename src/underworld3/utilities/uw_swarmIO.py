@@ -10,6 +10,115 @@ size = comm.size
 rank = comm.rank
 
 
+# rows per chunk for the distributed particle datasets
+_h5_chunk_rows = 65536
+
+
+def h5_write_distributed(fileName, name, data, compression=False, compressionType='gzip', force_sequential=False, mode='w', comm=None):
+    '''
+    Collective write of a (n_local, ncomp) array, distributed by rows across the
+    processors, into a single dataset of a new h5 file. The offset of each
+    processor's rows is computed with an exclusive scan and the (chunked)
+    dataset is allocated once, at its final size.
+
+    With parallel h5py all processors write their slab collectively (MPI-IO).
+    Otherwise the data are gathered to one writer per node (aggregator) and
+    the aggregators write their slabs in turn, so the I/O is serialised over
+    nodes rather than over processors.
+
+    fileName         : Name of the h5 file.
+    name             : Name of the dataset.
+    data             : The local (n_local, ncomp) rows. Must have the same dtype / ncomp everywhere.
+    compression      : Whether to compress the dataset [bool]
+    compressionType  : The type of compression to use. 'gzip' and 'lzf' are the supported types, with 'gzip' as the default.
+    force_sequential : Use the aggregator path even if parallel h5py is available.
+    mode             : h5py file mode, 'w' (over-write) or 'a' (add the dataset to an existing file).
+    comm             : The communicator of the participating processors (default is COMM_WORLD).
+    '''
+
+    if comm is None:
+        comm = MPI.COMM_WORLD
+
+    data = np.ascontiguousarray(data)
+    data = data.reshape(data.shape[0], -1)
+    ncomp = data.shape[1]
+
+    n_local = data.shape[0]
+    n_total = comm.allreduce(n_local, op=MPI.SUM)
+    offset = comm.exscan(n_local, op=MPI.SUM)
+    if offset is None:  # rank 0
+        offset = 0
+
+    dataset_args = dict(
+        shape=(n_total, ncomp),
+        dtype=data.dtype,
+        chunks=(max(1, min(n_total, _h5_chunk_rows)), ncomp),
+        maxshape=(None, ncomp),
+    )
+    if compression == True:
+        dataset_args['compression'] = compressionType
+
+    if h5py.h5.get_config().mpi == True and not force_sequential:
+        with h5py.File(fileName, mode, driver='mpio', comm=comm) as h5f:
+            dset = h5f.create_dataset(name, **dataset_args)
+
+            # low level write so that every rank takes part in the collective
+            # call, even if it has no rows
+
+            fspace = dset.id.get_space()
+            mspace = h5py.h5s.create_simple((max(n_local, 1), ncomp))
+            if n_local > 0:
+                fspace.select_hyperslab((offset, 0), (n_local, ncomp))
+                buffer = data
+            else:
+                fspace.select_none()
+                mspace.select_none()
+                buffer = np.zeros((1, ncomp), dtype=data.dtype)
+
+            dxpl = h5py.h5p.create(h5py.h5p.DATASET_XFER)
+            dxpl.set_dxpl_mpio(h5py.h5fd.MPIO_COLLECTIVE)
+            dset.id.write(mspace, fspace, buffer, dxpl=dxpl)
+
+        return
+
+    # Aggregator mode: one writer per (shared memory) node
+
+    node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED, key=comm.rank)
+    is_writer = node_comm.rank == 0
+    writer_comm = comm.Split(0 if is_writer else MPI.UNDEFINED, key=comm.rank)
+
+    counts = np.array(node_comm.gather(n_local, root=0))
+    if is_writer:
+        node_data = np.empty((counts.sum(), ncomp), dtype=data.dtype)
+        node_comm.Gatherv(data, [node_data, (counts * ncomp).tolist()])
+    else:
+        node_comm.Gatherv(data, None)
+
+    if comm.rank == 0:
+        with h5py.File(fileName, mode) as h5f:
+            h5f.create_dataset(name, **dataset_args)
+
+    comm.barrier()
+
+    if is_writer:
+        node_offset = writer_comm.exscan(node_data.shape[0], op=MPI.SUM)
+        if node_offset is None:
+            node_offset = 0
+
+        for writer in range(writer_comm.size):
+            if writer_comm.rank == writer and node_data.shape[0] > 0:
+                with h5py.File(fileName, 'a') as h5f:
+                    h5f[name][node_offset:node_offset + node_data.shape[0]] = node_data
+            writer_comm.barrier()
+
+        writer_comm.Free()
+
+    node_comm.Free()
+    comm.barrier()
+
+    return
+
+
 def swarm_h5(swarm, fileName, timestep, fields=None, outputPath='', compression=False, compressionType='gzip'):
     '''
     Function to save swarm fields to h5 file for checkpointing purposes.
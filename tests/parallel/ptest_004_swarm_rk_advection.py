@@ -0,0 +1,39 @@
+import underworld3 as uw
+import numpy as np
+
+# Higher order swarm advection in parallel: the Runge-Kutta stage positions
+# cross the partition boundaries and have to be evaluated on other processes
+
+mesh1 = uw.meshing.UnstructuredSimplexBox(cellSize=0.05)
+
+# v = (0.5, 0.2 y) so that x = x0 + 0.5 t, y = y0 exp(0.2 t)
+v = uw.discretisation.MeshVariable("V", mesh1, mesh1.dim, degree=1)
+with mesh1.access(v):
+    v.data[:, 0] = 0.5
+    v.data[:, 1] = 0.2 * v.coords[:, 1]
+
+x0 = np.linspace(0.1, 0.4, 7)
+y0 = np.linspace(0.1, 0.7, 13)
+points = np.array([(x, y) for x in x0 for y in y0])
+
+for order, adaptive in ((3, False), (4, False), (2, True)):
+    print(f"{uw.mpi.rank} - advection order {order}, adaptive {adaptive}", flush=True)
+
+    swarm = uw.swarm.Swarm(mesh=mesh1)
+    swarm.add_particles_with_coordinates(points)
+
+    # A single step that is much longer than the advective limit
+    swarm.advection(v.sym, 1.0, order=order, adaptive=adaptive, step_limit=False)
+
+    with swarm.access():
+        X = swarm.data
+        X0 = swarm._X0.data
+
+        assert np.allclose(X[:, 0], X0[:, 0] + 0.5, atol=1.0e-3)
+        assert np.allclose(X[:, 1], X0[:, 1] * np.exp(0.2), atol=1.0e-3)
+
+        num_particles = uw.mpi.comm.allreduce(X.shape[0])
+
+    assert num_particles >= points.shape[0]
+
+print(f"Finalised")
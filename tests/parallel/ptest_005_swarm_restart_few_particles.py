@@ -0,0 +1,38 @@
+import underworld3 as uw
+import numpy as np
+import os
+import tempfile
+
+# Restart a swarm from a file with fewer particles than there are ranks:
+# some ranks read no rows from the file
+
+mesh1 = uw.meshing.UnstructuredSimplexBox(cellSize=0.1)
+
+outputPath = None
+if uw.mpi.rank == 0:
+    outputPath = tempfile.mkdtemp()
+outputPath = uw.mpi.comm.bcast(outputPath, root=0)
+
+swarm = uw.swarm.Swarm(mesh=mesh1)
+var = swarm.add_variable(name="Y", size=1)
+swarm.add_particles_with_coordinates(np.array([[0.26, 0.34]]))
+
+with swarm.access(var):
+    var.data[:, 0] = swarm.data[:, 0]
+
+print(f"{uw.mpi.rank} - write swarm", flush=True)
+swarm.write_timestep("few", "swarm", swarmVars=[var], outputPath=outputPath, index=0)
+
+print(f"{uw.mpi.rank} - read swarm", flush=True)
+new_swarm = uw.swarm.Swarm(mesh=mesh1)
+new_var = new_swarm.add_variable(name="Y", size=1)
+new_swarm.read_timestep("few", "swarm", 0, outputPath=outputPath)
+new_var.read_timestep("few", "swarm", "Y", 0, outputPath=outputPath)
+
+with new_swarm.access():
+    num_particles = uw.mpi.comm.allreduce(new_swarm.data.shape[0])
+    assert np.allclose(new_var.data[:, 0], new_swarm.data[:, 0])
+
+assert num_particles >= 1
+
+print(f"Finalised")
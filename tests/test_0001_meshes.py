@@ -127,3 +127,170 @@ def test_create_solid_usbIB_3d_mesh():
 
     return    
     
+
+
+def test_mesh_field_subdm_cache():
+    import underworld3 as uw
+    import numpy as np
+
+    mesh = uw.meshing.StructuredQuadBox(elementRes=(4, 4))
+    s = uw.discretisation.MeshVariable("S_cache", mesh, 1, degree=1)
+
+    with mesh.access(s):
+        s.data[:, 0] = 1.0
+    subdm = mesh._get_field_subdm(s.field_id)
+
+    # Re-used across accesses
+    with mesh.access(s):
+        s.data[:, 0] = 2.0
+    assert mesh._get_field_subdm(s.field_id) is subdm
+
+    # Rebuilt when a field is added
+    v = uw.discretisation.MeshVariable("V_cache", mesh, 2, degree=2)
+    assert mesh._get_field_subdm(s.field_id) is not subdm
+
+    with mesh.access(v):
+        v.data[...] = 3.0
+
+    with mesh.access():
+        assert np.allclose(s.data, 2.0)
+        assert np.allclose(v.data, 3.0)
+
+    return
+
+
+def test_mesh_update_lvec_incremental():
+    import underworld3 as uw
+    import numpy as np
+
+    mesh = uw.meshing.StructuredQuadBox(elementRes=(4, 4))
+    s = uw.discretisation.MeshVariable("S_lvec", mesh, 1, degree=1)
+    t = uw.discretisation.MeshVariable("T_lvec", mesh, 1, degree=1)
+
+    with mesh.access(s, t):
+        s.data[:, 0] = 1.0
+        t.data[:, 0] = 2.0
+
+    mesh.update_lvec()
+    t_state = mesh._lvec_var_states[t.field_id]
+
+    # Only s is modified (and re-packed)
+    with mesh.access(s):
+        s.data[:, 0] = 3.0
+
+    mesh.update_lvec()
+    assert mesh._lvec_var_states[t.field_id] == t_state
+    assert mesh._lvec_var_states[s.field_id] == s._get_state()
+
+    values = uw.function.evaluate(s.sym[0] + t.sym[0], np.array([[0.5, 0.5]]))
+    assert np.allclose(values, 5.0)
+
+    return
+
+
+def test_mesh_lightweight_access():
+    import underworld3 as uw
+    import numpy as np
+
+    mesh = uw.meshing.StructuredQuadBox(elementRes=(4, 4))
+    s = uw.discretisation.MeshVariable("S_light", mesh, 1, degree=1)
+    t = uw.discretisation.MeshVariable("T_light", mesh, 1, degree=1)
+
+    # Only the named variables are mapped
+    with mesh.access(s, readable_vars=[]):
+        s.data[:, 0] = 1.0
+        try:
+            t.data
+            assert False, "t should not be accessible"
+        except RuntimeError:
+            pass
+
+    view = s.read_only_view()
+    assert np.allclose(view, 1.0)
+    assert not view.flags.writeable
+
+    with mesh.access(s):
+        s.data[:, 0] = 2.0
+
+    assert np.allclose(view, 2.0)
+
+    return
+
+
+def test_gmsh_conversion_reused(tmp_path):
+    import os
+    import h5py
+    import underworld3 as uw
+    from underworld3.meshing import UnstructuredSimplexBox
+
+    msh_file = str(tmp_path / "usb.msh")
+    mesh = UnstructuredSimplexBox(cellSize=1.0 / 8.0, filename=msh_file)
+
+    with h5py.File(msh_file + ".h5", "r") as f:
+        assert "uw_source_hash" in f.attrs
+
+    mtime = os.path.getmtime(msh_file + ".h5")
+
+    # Same .msh file - the converted plex is read back without conversion
+    mesh2 = uw.discretisation.Mesh(msh_file, useMultipleTags=True, useRegions=True, markVertices=True)
+
+    assert os.path.getmtime(msh_file + ".h5") == mtime
+    assert mesh2.dm.getCoordinatesLocal().getSize() == mesh.dm.getCoordinatesLocal().getSize()
+
+    return
+
+
+def test_mesh_cache(tmp_path):
+    import os
+    import h5py
+    from underworld3.meshing import UnstructuredSimplexBox
+
+    msh_file = str(tmp_path / "cached.msh")
+    mesh = UnstructuredSimplexBox(cellSize=1.0 / 8.0, filename=msh_file)
+
+    with h5py.File(msh_file + ".h5", "r") as f:
+        key = f.attrs["uw_cache_key"]
+
+    mtime = os.path.getmtime(msh_file + ".h5")
+
+    # Same arguments - loaded from the cached .h5 file
+    mesh2 = UnstructuredSimplexBox(cellSize=1.0 / 8.0, filename=msh_file)
+
+    assert os.path.getmtime(msh_file + ".h5") == mtime
+    assert mesh2.dm.getCoordinatesLocal().getSize() == mesh.dm.getCoordinatesLocal().getSize()
+
+    # Different arguments - the mesh is rebuilt
+    mesh3 = UnstructuredSimplexBox(cellSize=1.0 / 4.0, filename=msh_file)
+
+    with h5py.File(msh_file + ".h5", "r") as f:
+        assert f.attrs["uw_cache_key"] != key
+
+    assert mesh3.dm.getCoordinatesLocal().getSize() < mesh.dm.getCoordinatesLocal().getSize()
+
+    return
+
+
+def test_mesh_cache_box_internal_boundary(tmp_path):
+    import os
+    from underworld3.meshing import BoxInternalBoundary
+
+    msh_file = str(tmp_path / "box_ib.msh")
+    args = dict(
+        elementRes=(4, 4),
+        zelementRes=(2, 2),
+        minCoords=(0.0, 0.0),
+        maxCoords=(1.0, 1.0),
+        zintCoord=0.5,
+        filename=msh_file,
+    )
+
+    mesh = BoxInternalBoundary(**args)
+    mtime = os.path.getmtime(msh_file + ".h5")
+
+    # Loaded from the cache - the boundaries are still defined
+    mesh2 = BoxInternalBoundary(**args)
+
+    assert os.path.getmtime(msh_file + ".h5") == mtime
+    assert mesh2.boundaries.Internal.value == mesh.boundaries.Internal.value
+
+    return
@@ -41,3 +41,181 @@ def test_create_swarmvariable(setup_data):
     elements = swarm.mesh._centroids.shape[0]
     var.save("var.h5")
     assert shape == (elements * 6, 2)
+
+
+@pytest.mark.parametrize("order, adaptive", [(2, False), (4, False), (3, True)])
+def test_swarm_advection(setup_data, order, adaptive):
+    import numpy as np
+    import underworld3 as uw
+
+    swarm = setup_data
+    mesh = swarm.mesh
+    X_start = swarm.add_variable(name="X_start", size=2)
+    swarm.populate(fill_param=2)
+
+    v = uw.discretisation.MeshVariable("V_adv", mesh, 2, degree=1)
+    with mesh.access(v):
+        v.data[:, 0] = 0.1
+        v.data[:, 1] = 0.05
+
+    with swarm.access(X_start):
+        X_start.data[...] = swarm.data[...]
+
+    swarm.advection(v.sym, delta_t=0.1, order=order, adaptive=adaptive)
+
+    # Uniform velocity: every particle that is still in the domain is
+    # displaced by the same amount
+    with swarm.access():
+        displacement = swarm.data - X_start.data
+
+    assert np.allclose(displacement[:, 0], 0.01, atol=1.0e-6)
+    assert np.allclose(displacement[:, 1], 0.005, atol=1.0e-6)
+
+
+@pytest.mark.parametrize("order, adaptive", [(3, False), (4, False), (3, True)])
+def test_swarm_advection_outflow(setup_data, order, adaptive):
+    import numpy as np
+    import underworld3 as uw
+
+    swarm = setup_data
+    mesh = swarm.mesh
+    X_start = swarm.add_variable(name="X_start", size=2)
+    swarm.populate(fill_param=2)
+
+    v = uw.discretisation.MeshVariable("V_out", mesh, 2, degree=1)
+    with mesh.access(v):
+        v.data[:, 0] = 1.0
+        v.data[:, 1] = 0.0
+
+    with swarm.access(X_start):
+        X_start.data[...] = swarm.data[...]
+        num_particles = swarm.data.shape[0]
+        num_leaving = np.count_nonzero(swarm.data[:, 0] > 0.9 + 1.0e-6)
+
+    assert num_leaving > 0
+
+    # One step: every particle within 0.1 of x=1 leaves the domain
+    swarm.advection(
+        v.sym, delta_t=0.1, order=order, adaptive=adaptive, step_limit=False
+    )
+
+    with swarm.access():
+        displacement = swarm.data - X_start.data
+        assert swarm.data.shape[0] <= num_particles - num_leaving
+        assert np.all(X_start.data[:, 0] <= 0.9 + 1.0e-6)
+
+    assert np.allclose(displacement[:, 0], 0.1, atol=1.0e-6)
+    assert np.allclose(displacement[:, 1], 0.0, atol=1.0e-6)
+
+
+def test_swarm_kdtree_cache(setup_data):
+    import numpy as np
+
+    swarm = setup_data
+    var = swarm.add_variable(name="cached", size=1)
+    swarm.populate(fill_param=2)
+
+    with swarm.access(var):
+        var.data[:, 0] = swarm.data[:, 0]
+
+    coords = np.array([[0.25, 0.5], [0.5, 0.5]])
+    values = var.rbf_interpolate(coords)
+
+    # Re-used while the particles are not moved
+    kdt, _ = swarm._get_kdtree()
+    var.rbf_interpolate(coords)
+    assert swarm._get_kdtree()[0] is kdt
+
+    # Rebuilt when they are
+    with swarm.access(swarm.particle_coordinates):
+        swarm.particle_coordinates.data[:, 0] *= 0.5
+
+    assert swarm._get_kdtree()[0] is not kdt
+    new_values = var.rbf_interpolate(coords)
+    assert not np.allclose(values, new_values)
+
+
+def test_swarm_lightweight_access(setup_data):
+    import numpy as np
+
+    swarm = setup_data
+    a = swarm.add_variable(name="light_a", size=1)
+    b = swarm.add_variable(name="light_b", size=1)
+    swarm.populate(fill_param=2)
+
+    # Only the named variables are mapped
+    with swarm.access(a, readable_vars=[]):
+        a.data[:, 0] = 1.0
+        with pytest.raises(RuntimeError):
+            b.data
+
+    view = a.read_only_view()
+    assert np.allclose(view, 1.0)
+    assert not view.flags.writeable
+
+    # The copy is re-used until the data change, and is never modified
+    assert a.read_only_view() is view
+
+    with swarm.access(a):
+        a.data[:, 0] = 2.0
+
+    new_view = a.read_only_view()
+    assert new_view is not view
+    assert np.allclose(view, 1.0)
+    assert np.allclose(new_view, 2.0)
+
+    with swarm.access(swarm.particle_coordinates):
+        swarm.particle_coordinates.data[:, 0] *= 0.99
+
+    assert a.read_only_view() is not new_view
+    assert np.allclose(new_view, 2.0)
+
+
+def test_reduce_to_nodes():
+    import numpy as np
+    from underworld3.swarm import _reduce_to_nodes
+
+    nodes = np.array([0, 0, 2, 2, 2])
+    weights = np.array([1.0, 3.0, 1.0, 1.0, 2.0])
+    values = np.array([[1.0, 2.0], [3.0, 4.0], [1.0, 1.0], [2.0, 2.0], [3.0, 3.0]])
+
+    sums, w = _reduce_to_nodes(nodes, weights, 4, values=values)
+    assert np.allclose(w, [4.0, 0.0, 4.0, 0.0])
+    assert np.allclose(sums[0], [10.0, 14.0])
+    assert np.allclose(sums[2], [9.0, 9.0])
+    assert np.allclose(sums[[1, 3]], 0.0)
+
+    bins = np.array([0, 1, 1, 1, 0])
+    sums, w = _reduce_to_nodes(nodes, weights, 4, bins=bins, num_bins=2)
+    assert np.allclose(sums[0], [1.0, 3.0])
+    assert np.allclose(sums[2], [2.0, 2.0])
+
+
+def test_swarm_lazy_proxy_update(setup_data):
+    import numpy as np
+
+    swarm = setup_data
+    mesh = swarm.mesh
+    a = swarm.add_variable(name="lazy_a", size=1, proxy_degree=1)
+    b = swarm.add_variable(name="lazy_b", size=1, proxy_degree=1)
+    swarm.populate(fill_param=2)
+
+    with swarm.access(a, b):
+        a.data[:, 0] = 1.0
+        b.data[:, 0] = 2.0
+
+    # Moving the particles marks the proxies stale rather than rebuilding them
+    with swarm.access(swarm.particle_coordinates, a):
+        swarm.particle_coordinates.data[:, 0] *= 0.99
+        a.data[:, 0] = 3.0
+
+    assert a._proxy_stale and b._proxy_stale
+    assert id(swarm) in mesh._stale_proxy_swarms
+
+    # ... and they are all rebuilt the next time the mesh data is needed
+    with mesh.access():
+        assert np.allclose(a._meshVar.data, 3.0)
+        assert np.allclose(b._meshVar.data, 2.0)
+
+    assert not a._proxy_stale and not b._proxy_stale
+    assert not mesh._stale_proxy_swarms
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 
 def test_mesh_save_and_load(tmp_path):
@@ -55,6 +56,8 @@ def test_swarm_save_and_load(tmp_path):
     new_swarm = uw.swarm.Swarm(mesh)
     new_swarm.read_timestep("test", "swarm", 0, outputPath=tmp_path)
 
+    assert new_swarm.dm.getSize() == swarm.dm.getSize()
+
 
 def test_swarmvariable_save_and_load(tmp_path):
     from underworld3 import swarm
@@ -79,3 +82,122 @@ def test_swarmvariable_save_and_load(tmp_path):
 
     with swarm.access():
         assert np.allclose(var.data, var2.data)
+
+
+def test_h5_write_distributed(tmp_path):
+    import h5py
+    import underworld3 as uw
+
+    data = np.arange(30, dtype=float).reshape(-1, 3) + 10.0 * uw.mpi.rank
+    filename = f"{tmp_path}/distributed.h5"
+
+    for force_sequential in (False, True):
+        uw.utilities.h5_write_distributed(
+            filename,
+            "data",
+            data,
+            compression=True,
+            force_sequential=force_sequential,
+        )
+
+        with h5py.File(filename, "r") as h5f:
+            assert h5f["data"].shape == (10 * uw.mpi.size, 3)
+            assert h5f["data"].chunks is not None
+            if uw.mpi.size == 1:
+                assert np.allclose(h5f["data"][()], data)
+
+
+@pytest.mark.parametrize("threaded_mpi", [True, False])
+def test_async_checkpoint_writer(tmp_path, threaded_mpi):
+    import os
+    from mpi4py import MPI
+    import underworld3 as uw
+    from underworld3.meshing import UnstructuredSimplexBox
+
+    mesh = UnstructuredSimplexBox(
+        minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 32.0
+    )
+
+    X = uw.discretisation.MeshVariable("X", mesh, 1, degree=2)
+    X2 = uw.discretisation.MeshVariable("X2", mesh, 1, degree=2)
+
+    swarm = uw.swarm.Swarm(mesh)
+    var = swarm.add_variable(name="Y", size=1)
+    var2 = swarm.add_variable(name="Y2", size=1)
+    swarm.populate(fill_param=2)
+
+    writer = uw.utilities.AsyncCheckpointWriter(max_buffers=2)
+
+    # Without threaded MPI the data are gathered and written by rank 0
+    if not threaded_mpi and writer._threaded_mpi:
+        writer._comm.Free()
+        writer._threaded_mpi = False
+        writer._comm = MPI.COMM_SELF
+
+    for step in range(3):
+        with mesh.access(X):
+            X.data[:, 0] = X.coords[:, 0] + step
+        with swarm.access(var):
+            var.data[:, 0] = swarm.data[:, 0] + step
+
+        writer.write_mesh_variables(mesh, "test", step, [X], outputPath=tmp_path)
+        writer.write_swarm_timestep(
+            swarm, "test", "swarm", step, swarmVars=[var], outputPath=tmp_path
+        )
+
+    # The staged data are not affected by later changes to the variables
+    with mesh.access(X):
+        X.data[:, 0] = -1.0
+
+    writer.close()
+
+    X2.read_timestep("test", "X", 1, outputPath=tmp_path)
+    with mesh.access():
+        assert np.allclose(X2.data[:, 0], X.coords[:, 0] + 1)
+
+    assert os.path.exists(f"{tmp_path}/test.swarm.00002.xdmf")
+
+    var2.read_timestep("test", "swarm", "Y", 2, outputPath=tmp_path)
+    with swarm.access():
+        assert np.allclose(var2.data[:, 0], swarm.data[:, 0] + 2)
+
+
+def test_meshvariable_linked_coordinates(tmp_path):
+    import glob
+    import h5py
+    import underworld3
+    from underworld3.meshing import UnstructuredSimplexBox
+
+    mesh = UnstructuredSimplexBox(
+        minCoords=(0.0, 0.0), maxCoords=(1.0, 1.0), cellSize=1.0 / 32.0
+    )
+
+    X = underworld3.discretisation.MeshVariable("X", mesh, 1, degree=2)
+    Y = underworld3.discretisation.MeshVariable("Y", mesh, 1, degree=2)
+    X2 = underworld3.discretisation.MeshVariable("X2", mesh, 1, degree=2)
+
+    for step in range(2):
+        with mesh.access(X, Y):
+            X.data[:, 0] = X.coords[:, 0] + step
+            Y.data[:, 0] = Y.coords[:, 1]
+
+        mesh.write_timestep(
+            "test",
+            meshUpdates=False,
+            meshVars=[X, Y],
+            outputPath=tmp_path,
+            index=step,
+            linkCoordinates=True,
+        )
+
+    # One coordinates file for the whole series (same degree / continuity)
+    assert len(glob.glob(f"{tmp_path}/test.mesh.coordinates.*.h5")) == 1
+
+    with h5py.File(f"{tmp_path}/test.mesh.X.00001.h5", "r") as h5f:
+        link = h5f["fields"].get("coordinates", getlink=True)
+        assert isinstance(link, h5py.ExternalLink)
+
+    X2.read_timestep("test", "X", 1, outputPath=tmp_path)
+
+    with mesh.access():
+        assert np.allclose(X.data, X2.data)
@@ -11,7 +11,7 @@ import os, shutil
 import numpy as np
 import sympy
 
-from underworld3.utilities._jitextension import getext
+from underworld3.utilities._jitextension import getext, constant_values
 
 
 # build a small mesh - we'll load up a simple problem and then see what functions are loaded
@@ -44,6 +44,8 @@ w = uw.discretisation.MeshVariable(
 shutil.rmtree("/tmp/fn_ptr_ext_TEST_0", ignore_errors=True)
 shutil.rmtree("/tmp/fn_ptr_ext_TEST_1", ignore_errors=True)
 shutil.rmtree("/tmp/fn_ptr_ext_TEST_2", ignore_errors=True)
+shutil.rmtree("/tmp/fn_ptr_ext_TEST_3", ignore_errors=True)
+shutil.rmtree("/tmp/fn_ptr_ext_TEST_4", ignore_errors=True)
 
 
 ## This needs to be fixed up for systems that don't use /tmp like this
@@ -144,6 +146,78 @@ def test_getext_meshVar():
     )
 
 
+def test_getext_constants():
+
+    alpha = uw.function.expression(r"\alpha", sym=2, description="constant")
+
+    res_fn = sympy.ImmutableDenseMatrix([alpha * v.sym[0], w.sym])
+    jac_fn = sympy.ImmutableDenseMatrix([alpha, y**2])
+    bc_fn = sympy.ImmutableDenseMatrix([sympy.sin(x), sympy.cos(y)])
+    bd_res_fn = sympy.ImmutableDenseMatrix([sympy.log(x), sympy.exp(y)])
+    bd_jac_fn = sympy.ImmutableDenseMatrix([x, y])
+
+    compiled_extns, dictionaries = getext(
+        mesh,
+        [res_fn, res_fn],
+        [jac_fn],
+        [bc_fn],
+        [bd_res_fn],
+        [bd_jac_fn],
+        mesh.vars.values(),
+        debug=True,
+        debug_name="TEST_3",
+        cache=False,
+    )
+
+    # The numerical constant is read from the PetscDS constants array
+    assert dictionaries.constants == (alpha,)
+
+    with open("/tmp/fn_ptr_ext_TEST_3/cy_ext.h") as f:
+        assert "constants[0]" in f.read()
+
+    alpha.sym = 3
+    assert constant_values(dictionaries.constants) == [3.0]
+
+    # symbolic values are compiled in and need a new extension
+    alpha.sym = x
+    assert constant_values(dictionaries.constants) is None
+
+
+def test_getext_cse():
+
+    # a shared subexpression (e.g. a strain-rate invariant) in all components
+    edot = sympy.sqrt(v.sym[0] ** 2 + v.sym[1] ** 2 + w.sym**2)
+
+    res_fn = sympy.ImmutableDenseMatrix([edot * x, sympy.Max(edot, 1) * y])
+    jac_fn = sympy.ImmutableDenseMatrix(
+        [sympy.diff(edot, v.sym[0]), sympy.diff(edot, v.sym[1])]
+    )
+    bc_fn = sympy.ImmutableDenseMatrix([sympy.sin(x), sympy.cos(y)])
+    bd_res_fn = sympy.ImmutableDenseMatrix([sympy.log(x), sympy.exp(y)])
+    bd_jac_fn = sympy.ImmutableDenseMatrix([x, y])
+
+    compiled_extns, dictionaries = getext(
+        mesh,
+        [res_fn, res_fn],
+        [jac_fn],
+        [bc_fn],
+        [bd_res_fn],
+        [bd_jac_fn],
+        mesh.vars.values(),
+        debug=True,
+        debug_name="TEST_4",
+        cache=False,
+    )
+
+    with open("/tmp/fn_ptr_ext_TEST_4/cy_ext.h") as f:
+        header = f.read()
+
+    # the invariant is computed once per function, not once per component
+    assert "const PetscScalar uw_cse_" in header
+    code = [line for line in header.split("\n") if not line.startswith("/*")]
+    assert sum("sqrt(" in line for line in code) == 3
+
+
 # def test_build_functions():
 #     stokes = uw.systems.Stokes(mesh, velocityField=v, pressureField=p)
 #     stokes.constitutive_model = uw.constitutive_models.ViscousFlowModel
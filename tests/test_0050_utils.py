@@ -124,3 +124,22 @@ def disable_test_auditor():
 
 
 # %%
+
+
+def test_jit_cache_dir(monkeypatch, tmp_path):
+    from underworld3.utilities import _jitextension
+
+    monkeypatch.setenv("UW_JITCACHE", str(tmp_path))
+    assert _jitextension.jit_cache_dir() == str(tmp_path)
+
+    monkeypatch.setenv("UW_JITCACHE", "none")
+    assert _jitextension.jit_cache_dir() is None
+
+    # The digest depends only on the generated source (and build environment)
+    codeguys = [["setup.py", "a"], ["cy_ext.h", "b"]]
+    assert _jitextension._source_digest(codeguys) == _jitextension._source_digest(
+        [list(c) for c in codeguys]
+    )
+    assert _jitextension._source_digest(codeguys) != _jitextension._source_digest(
+        [["setup.py", "a"], ["cy_ext.h", "c"]]
+    )
@@ -129,3 +129,54 @@ def test_mesh_centroid(res, dim, ppcell):
         assert np.allclose(
             swarm.particle_cellid.data[:, 0], kdpt
         ), "Point indices weren't as expected."
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_rbf_interpolator_local(dim):
+    """
+    Compare the inverse distance interpolation (single and multi-threaded)
+    with a direct numpy calculation.
+    """
+    pts = np.random.random(size=(1000, dim))
+    data = np.stack((pts[:, 0], 2 * pts[:, 1], np.ones(pts.shape[0])), axis=1)
+    coords = np.random.random(size=(100, dim))
+
+    index = uw.kdtree.KDTree(pts)
+    index.build_index()
+
+    nnn = 4
+    closest_n, distance_n = index.find_closest_n_points(nnn, coords)
+    weights = 1.0 / (1.0e-9 + np.sqrt(distance_n))
+    expected = (
+        np.einsum("ij,ijk->ik", weights, data[closest_n.astype(int)])
+        / weights.sum(axis=1)[:, np.newaxis]
+    )
+
+    values = index.rbf_interpolator_local(coords, data, nnn=nnn)
+    assert values.shape == (coords.shape[0], 3)
+    assert np.allclose(values, expected)
+
+    values_threaded = index.rbf_interpolator_local(coords, data, nnn=nnn, nthreads=4)
+    assert np.allclose(values_threaded, values)
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_threaded_queries(dim):
+    """
+    Multi-threaded queries should give the same results as the serial ones.
+    """
+    pts = np.random.random(size=(10000, dim))
+    coords = np.random.random(size=(5000, dim))
+
+    index = uw.kdtree.KDTree(pts)
+    index.build_index()
+
+    kdpt, dist, found = index.find_closest_point(coords)
+    kdpt_t, dist_t, found_t = index.find_closest_point(coords, nthreads=4)
+    assert np.all(kdpt == kdpt_t) and np.allclose(dist, dist_t)
+    assert np.all(found_t)
+
+    n_kdpt, n_dist = index.find_closest_n_points(5, coords)
+    n_kdpt_t, n_dist_t = index.find_closest_n_points(5, coords, nthreads=0)
+    assert np.all(n_kdpt == n_kdpt_t) and np.allclose(n_dist, n_dist_t)
+    assert np.all(n_kdpt[:, 0] == kdpt)
@@ -119,6 +119,131 @@ def test_vector_dot_product():
     del mesh
 
 
+def test_repeated_evaluation_cached():
+    mesh = uw.meshing.StructuredQuadBox()
+    var = uw.discretisation.MeshVariable(
+        varname="cached_var", mesh=mesh, num_components=1, vtype=uw.VarType.SCALAR
+    )
+
+    fn.clear_evaluation_cache()
+
+    # The compiled expression is re-used but the values must not be
+    for value in (1.0, 2.0):
+        with mesh.access(var):
+            var.data[:] = value
+
+        result = fn.evaluate(2 * var.sym[0] + mesh.r[0], coords)
+        assert np.allclose(2 * value + x, result, rtol=1e-05, atol=1e-08)
+
+    assert len(uw.function._function._evaluation_fn_cache) == 1
+
+    del mesh
+
+
+def test_evaluation_cache_released_with_mesh():
+    import gc
+
+    mesh = uw.meshing.StructuredQuadBox()
+    var = uw.discretisation.MeshVariable(
+        varname="released_var", mesh=mesh, num_components=1, vtype=uw.VarType.SCALAR
+    )
+
+    fn.evaluate(var.sym[0] + mesh.r[0], coords)
+
+    mesh_id = id(mesh)
+    cache = uw.function._function._evaluation_fn_cache
+    assert any(key[0] == mesh_id for key in cache)
+
+    # The cached expressions must not keep the mesh alive
+    del var, mesh
+    gc.collect()
+
+    assert not any(key[0] == mesh_id for key in cache)
+
+
+def test_interpolation_plan():
+    mesh = uw.meshing.StructuredQuadBox()
+    var = uw.discretisation.MeshVariable(
+        varname="plan_var", mesh=mesh, num_components=1, vtype=uw.VarType.SCALAR
+    )
+
+    plan = fn.InterpolationPlan(mesh, coords)
+    assert plan.is_valid
+
+    # The point location is re-used but the values must not be
+    for value in (1.0, 2.0):
+        with mesh.access(var):
+            var.data[:] = value + var.coords[:, 0]
+
+        result = fn.evaluate(var.sym[0], interpolation_plan=plan)
+        assert np.allclose(value + coords[:, 0], result, rtol=1e-05, atol=1e-08)
+
+    # Only the requested variables are interpolated
+    vec = uw.discretisation.MeshVariable(
+        varname="plan_vec", mesh=mesh, num_components=2, vtype=uw.VarType.VECTOR
+    )
+
+    with mesh.access(vec):
+        vec.data[:, 0] = 1.0
+
+    # `var` is already interpolated at these points, `vec` is not
+    result = fn.evaluate(var.sym[0], interpolation_plan=plan)
+    result = fn.evaluate(var.sym[0] + vec.sym[0], interpolation_plan=plan)
+    assert np.allclose(3.0 + coords[:, 0], result, rtol=1e-05, atol=1e-08)
+
+    values, start_index = plan.interpolate_all([vec])
+    assert values.shape == (coords.shape[0], 2)
+    assert start_index[vec] == 0 and not var in start_index
+
+    # The plan holds its own copy of the points
+    points = coords.copy()
+    points_plan = fn.InterpolationPlan(mesh, points)
+    fn.evaluate(var.sym[0], points, interpolation_plan=points_plan)
+
+    points[:, 0] += 0.05
+    with pytest.raises(RuntimeError):
+        fn.evaluate(var.sym[0], points, interpolation_plan=points_plan)
+
+    # Deforming the mesh invalidates the plan (it is rebuilt when used)
+    mesh.deform_mesh(mesh.data * 1.0)
+    assert not plan.is_valid
+
+    result = fn.evaluate(var.sym[0], interpolation_plan=plan)
+    assert plan.is_valid
+
+    del mesh
+
+
+def test_evaluate_components():
+    mesh = uw.meshing.StructuredQuadBox()
+    vec = uw.discretisation.MeshVariable(
+        varname="components_vec", mesh=mesh, num_components=2, vtype=uw.VarType.VECTOR
+    )
+
+    with mesh.access(vec):
+        vec.data[:, 0] = vec.coords[:, 0]
+        vec.data[:, 1] = 2 * vec.coords[:, 1]
+
+    result = fn.evaluate_components(vec.sym, coords)
+    assert result.shape == (coords.shape[0], 2)
+    assert np.allclose(coords[:, 0], result[:, 0], rtol=1e-05, atol=1e-08)
+    assert np.allclose(2 * coords[:, 1], result[:, 1], rtol=1e-05, atol=1e-08)
+
+    result = fn.evaluate_components(vec.sym, coords, evalf=True)
+    assert result.shape == (coords.shape[0], 2)
+
+    # Mixed constant / variable components
+    result = fn.evaluate_components(sympy.Matrix([[vec.sym[0], 0]]), coords)
+    assert result.shape == (coords.shape[0], 2)
+    assert np.allclose(coords[:, 0], result[:, 0], rtol=1e-05, atol=1e-08)
+    assert np.allclose(0.0, result[:, 1])
+
+    result = fn.evaluate_components(sympy.Matrix([[1, 2]]), coords)
+    assert np.allclose((1.0, 2.0), result)
+
+    del mesh
+
+
 # that test needs to be able to take degree as a parameter...
 def test_polynomial_mesh_var_degree():
     mesh = uw.meshing.StructuredQuadBox()
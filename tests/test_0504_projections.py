@@ -78,6 +78,32 @@ def test_vector_projection():
     return
 
 
+def test_vector_projection_reuse_discretisation():
+    vector_projection = uw.systems.Vector_Projection(mesh, v_soln)
+    vector_projection.uw_function = v_values.sym
+    vector_projection.smoothing = 1.0e-3
+
+    vector_projection.add_natural_bc(1.0e3 * v_soln.sym, "Top")
+    vector_projection.add_dirichlet_bc((0.0, None), "Right")
+
+    vector_projection.solve()
+
+    dm = vector_projection.dm
+    snes = vector_projection.snes
+    num_natural_bcs = len(vector_projection.natural_bcs)
+
+    # New functions only: the DM / DS and the SNES are re-used
+    vector_projection.uw_function = 2 * v_values.sym
+    vector_projection.solve()
+
+    assert vector_projection.dm is dm
+    assert vector_projection.snes is snes
+    assert len(vector_projection.natural_bcs) == num_natural_bcs
+    assert vector_projection.snes.getConvergedReason() > 0
+
+    return
+
+
 def test_gradient_recovery():
     fn = sympy.cos(4.0 * sympy.pi * x)
 
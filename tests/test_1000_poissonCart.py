@@ -42,3 +42,54 @@ def test_poisson_boxmesh(mesh):
 
     del poisson
     del mesh
+
+
+def test_poisson_reuse_discretisation():
+    import numpy as np
+
+    mesh = uw.meshing.StructuredQuadBox(elementRes=(5,) * 2)
+
+    u = uw.discretisation.MeshVariable(
+        r"mathbf{u_r}", mesh, 1, vtype=uw.VarType.SCALAR, degree=2
+    )
+
+    poisson = uw.systems.Poisson(mesh, u_Field=u)
+    poisson.constitutive_model = uw.constitutive_models.DiffusionModel
+    poisson.constitutive_model.Parameters.diffusivity = 1
+    poisson.f = 0.0
+    poisson.add_dirichlet_bc(1.0, "Bottom")
+    poisson.add_dirichlet_bc(0.0, "Top")
+    poisson.solve()
+
+    dm = poisson.dm
+    snes = poisson.snes
+
+    # New functions only: the DM / DS and the SNES are re-used
+    poisson.f = 1.0
+    poisson.solve()
+
+    assert poisson.dm is dm
+    assert poisson.snes is snes
+    assert poisson.snes.getConvergedReason() > 0
+
+    with mesh.access():
+        u_reused = u.data.copy()
+
+    # ... and give the same answer as a complete rebuild
+    poisson.solve(_force_setup=True)
+
+    assert poisson.dm is not dm
+
+    with mesh.access():
+        assert np.allclose(u.data, u_reused)
+
+    # A new boundary condition set requires a new discretisation
+    dm = poisson.dm
+    poisson.add_dirichlet_bc(0.0, "Left")
+    poisson.solve()
+
+    assert poisson.dm is not dm
+    assert poisson.snes.getConvergedReason() > 0
+
+    del poisson
+    del mesh
@@ -184,3 +184,49 @@ def test_stokes_boxmesh_bc_failure():
     del stokes
 
     return
+
+
+def test_stokes_reuse_discretisation_natural_bcs():
+    mesh = structured_quad_box
+    x, y = mesh.X
+
+    u = uw.discretisation.MeshVariable(
+        r"mathbf{u_r}", mesh, mesh.dim, vtype=uw.VarType.VECTOR, degree=2
+    )
+    p = uw.discretisation.MeshVariable(
+        r"mathbf{p_r}", mesh, 1, vtype=uw.VarType.SCALAR, degree=1
+    )
+
+    stokes = uw.systems.Stokes(mesh, velocityField=u, pressureField=p)
+    stokes.constitutive_model = uw.constitutive_models.ViscousFlowModel
+    stokes.constitutive_model.Parameters.shear_viscosity_0 = 1
+    stokes.tolerance = 1.0e-3
+
+    stokes.bodyforce = sympy.Matrix([0, x])
+
+    # Free slip on the top by penalty
+    Gamma = mesh.Gamma
+    stokes.add_natural_bc(1.0e4 * Gamma.dot(u.sym) * Gamma, "Top")
+
+    stokes.add_dirichlet_bc((0.0, 0.0), "Bottom")
+    stokes.add_dirichlet_bc((0.0, None), "Left")
+    stokes.add_dirichlet_bc((0.0, None), "Right")
+
+    stokes.solve()
+
+    dm = stokes.dm
+    snes = stokes.snes
+    num_natural_bcs = len(stokes.natural_bcs)
+
+    # New functions only: the DM / DS and the SNES are re-used
+    stokes.bodyforce = sympy.Matrix([0, 2 * x])
+    stokes.solve()
+
+    assert stokes.dm is dm
+    assert stokes.snes is snes
+    assert len(stokes.natural_bcs) == num_natural_bcs
+    assert stokes.snes.getConvergedReason() > 0
+
+    del stokes
+
+    return